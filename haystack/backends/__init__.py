@@ -1,8 +1,17 @@
+import collections
 import copy
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
-from time import time
+from inspect import iscoroutinefunction
+from itertools import islice
+from time import sleep, time
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import caches
 from django.db.models import Q
 from django.db.models.base import ModelBase
 from django.utils import tree
@@ -19,37 +28,119 @@ VALID_GAPS = ["year", "month", "day", "hour", "minute", "second"]
 SPELLING_SUGGESTION_HAS_NOT_RUN = object()
 
 
+def record_query(obj, query_string, args, kwargs, start, stop=None):
+    """
+    Pseudo-logs a search query run by the backend ``obj`` from ``start`` to
+    ``stop`` (defaulting to now), when ``DEBUG`` is on.
+
+    The queries are kept on the calling thread's ``connections``, so backends
+    which search from other threads should record them once they're back.
+    """
+    if stop is None:
+        stop = time()
+
+    if settings.DEBUG:
+        from haystack import connections
+
+        connections[obj.connection_alias].queries.append(
+            {
+                "query_string": query_string,
+                "additional_args": args,
+                "additional_kwargs": kwargs,
+                "time": "%.3f" % (stop - start),
+                "start": start,
+                "stop": stop,
+            }
+        )
+
+
 def log_query(func):
     """
     A decorator for pseudo-logging search queries. Used in the ``SearchBackend``
-    to wrap the ``search`` method.
+    to wrap the ``search`` method (or an asynchronous ``asearch``).
     """
 
+    if iscoroutinefunction(func):
+
+        async def async_wrapper(obj, query_string, *args, **kwargs):
+            start = time()
+
+            try:
+                return await func(obj, query_string, *args, **kwargs)
+            finally:
+                record_query(obj, query_string, args, kwargs, start)
+
+        return async_wrapper
+
     def wrapper(obj, query_string, *args, **kwargs):
         start = time()
 
         try:
             return func(obj, query_string, *args, **kwargs)
         finally:
-            stop = time()
-
-            if settings.DEBUG:
-                from haystack import connections
-
-                connections[obj.connection_alias].queries.append(
-                    {
-                        "query_string": query_string,
-                        "additional_args": args,
-                        "additional_kwargs": kwargs,
-                        "time": "%.3f" % (stop - start),
-                        "start": start,
-                        "stop": stop,
-                    }
-                )
+            record_query(obj, query_string, args, kwargs, start)
 
     return wrapper
 
 
+def invalidates_cache(func):
+    """
+    A decorator for the ``SearchBackend`` methods which write to the index.
+    Once the write is done, the connection moves on to a new generation of
+    cached results. Writes within a ``bulk_session`` wait for the end of it.
+    """
+
+    def wrapper(obj, *args, **kwargs):
+        try:
+            return func(obj, *args, **kwargs)
+        finally:
+            if not obj.bulk_sessions:
+                obj.bump_generation()
+
+    return wrapper
+
+
+# Keyword arguments to ``search`` that don't change the number of matches.
+COUNT_IGNORED_KWARGS = (
+    "start_offset",
+    "end_offset",
+    "sort_by",
+    "fields",
+    "highlight",
+    "facets",
+    "date_facets",
+    "query_facets",
+    "stats",
+    "spelling_query",
+    "result_class",
+)
+
+
+def _cache_key_part(value):
+    """
+    Turns the keyword arguments to ``search`` into a string for the result
+    cache key, sorting sets & dictionaries so equal queries get equal keys.
+    """
+    if isinstance(value, dict):
+        return "{%s}" % ", ".join(
+            sorted(
+                "%s: %s" % (_cache_key_part(key), _cache_key_part(item))
+                for key, item in value.items()
+            )
+        )
+
+    if isinstance(value, (set, frozenset)):
+        return "{%s}" % ", ".join(sorted(_cache_key_part(item) for item in value))
+
+    if isinstance(value, (list, tuple)):
+        return "[%s]" % ", ".join(_cache_key_part(item) for item in value)
+
+    if isinstance(value, type):
+        return "%s.%s" % (value.__module__, value.__qualname__)
+
+    return repr(value)
+
+
 class EmptyResults:
     hits = 0
     docs = []
@@ -73,6 +164,9 @@ class BaseSearchBackend:
     RESERVED_WORDS = []
     RESERVED_CHARACTERS = []
 
+    # How many ``bulk_session`` blocks are currently open.
+    bulk_sessions = 0
+
     def __init__(self, connection_alias, **connection_options):
         self.connection_alias = connection_alias
         self.timeout = connection_options.get("TIMEOUT", 10)
@@ -80,6 +174,10 @@ class BaseSearchBackend:
         self.batch_size = connection_options.get("BATCH_SIZE", 1000)
         self.silently_fail = connection_options.get("SILENTLY_FAIL", True)
         self.distance_available = connection_options.get("DISTANCE_AVAILABLE", False)
+        self.result_cache = connection_options.get("RESULT_CACHE")
+        self.result_cache_timeout = connection_options.get("RESULT_CACHE_TIMEOUT", 0)
+        self.result_cache_hits = 0
+        self.result_cache_misses = 0
 
     def update(self, index, iterable, commit=True):
         """
@@ -91,6 +189,145 @@ class BaseSearchBackend:
         """
         raise NotImplementedError
 
+    def prepare_documents(self, index, iterable):
+        """
+        Prepares a collection of objects for ``update_documents``.
+
+        Together with ``update_documents`` this splits ``update`` into its
+        CPU-bound and I/O-bound halves, so that callers can prepare one batch
+        while the previous one is still being sent.
+
+        Backends which don't split their ``update`` get the objects back
+        untouched and ``update_documents`` passes them on to ``update``.
+        """
+        return list(iterable)
+
+    def update_documents(self, index, documents, commit=True):
+        """
+        Sends the documents returned by ``prepare_documents`` to the backend.
+        """
+        self.update(index, documents, commit=commit)
+
+    def parallel_update(
+        self, index, iterable, threads=4, chunk_size=None, commit=True, max_retries=3
+    ):
+        """
+        Updates the backend like ``update``, but sends the documents in chunks
+        of ``chunk_size`` (defaulting to the ``BATCH_SIZE``) from ``threads``
+        threads at once.
+
+        Objects are prepared a chunk at a time as the senders catch up, so no
+        more than ``threads * 2`` chunks are held in memory. Each chunk is
+        tried up to ``max_retries`` times, backing off exponentially. Only the
+        last chunk is sent with ``commit``, once all the others are in.
+
+        Backends whose connections can't be shared between threads should
+        override this.
+        """
+        chunk_size = chunk_size or self.batch_size
+        iterator = iter(iterable)
+        in_flight = collections.deque()
+        last_chunk = None
+
+        def send(documents, commit):
+            for attempt in range(1, max_retries + 1):
+                try:
+                    self.update_documents(index, documents, commit=commit)
+                    return
+                except Exception:
+                    if attempt >= max_retries:
+                        raise
+
+                    logging.getLogger("haystack").warning(
+                        "Failed to send %d documents (try %d/%d), retrying",
+                        len(documents),
+                        attempt,
+                        max_retries,
+                        exc_info=True,
+                    )
+                    sleep(2**attempt)
+
+        executor = ThreadPoolExecutor(max_workers=threads)
+
+        try:
+            while True:
+                objs = list(islice(iterator, chunk_size))
+
+                if not objs:
+                    break
+
+                documents = self.prepare_documents(index, objs)
+
+                if not documents:
+                    continue
+
+                if last_chunk is not None:
+                    in_flight.append(executor.submit(send, last_chunk, False))
+
+                last_chunk = documents
+
+                # Wait for the oldest chunk when the senders fall behind.
+                while len(in_flight) >= threads * 2:
+                    in_flight.popleft().result()
+
+            while in_flight:
+                in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+            executor.shutdown()
+
+        if last_chunk is not None:
+            send(last_chunk, commit)
+
+    @contextmanager
+    def bulk_session(self, commit=True):
+        """
+        Groups a large number of writes, so the backend doesn't have to make
+        them visible (i.e. refresh or commit) after every single batch.
+
+        Within the block, ``commit`` is ignored by ``update``, ``remove`` &
+        friends. On the way out, the backend is committed once (unless
+        ``commit=False``), even if an error stopped the writes part way.
+        Nested blocks are folded into the outermost one.
+        """
+        self.bulk_sessions += 1
+
+        if self.bulk_sessions == 1:
+            self.begin_bulk_session()
+
+        try:
+            yield self
+        finally:
+            self.bulk_sessions -= 1
+
+            if self.bulk_sessions == 0:
+                try:
+                    self.end_bulk_session(commit=commit)
+                finally:
+                    self.bump_generation()
+
+    def begin_bulk_session(self):
+        """
+        Prepares the backend for a ``bulk_session``. Does nothing by default.
+        """
+        pass
+
+    def end_bulk_session(self, commit=True):
+        """
+        Restores the backend after a ``bulk_session`` & commits the writes
+        made during it. Does nothing by default.
+        """
+        pass
+
+    def should_commit(self, commit):
+        """
+        Returns whether a write asked to ``commit`` should do so right away,
+        rather than leaving it to the end of the ``bulk_session``.
+        """
+        return commit and not self.bulk_sessions
+
     def remove(self, obj_or_string):
         """
         Removes a document/object from the backend. Can be either a model
@@ -102,6 +339,20 @@ class BaseSearchBackend:
         """
         raise NotImplementedError
 
+    def remove_many(self, objs_or_strings, commit=True):
+        """
+        Removes a collection of documents/objects from the backend. Each can be
+        either a model instance or an identifier, as with ``remove``.
+
+        Backends should override this to delete everything in a single
+        request. The default calls ``remove`` for each item, only committing
+        after the last one.
+        """
+        objs_or_strings = list(objs_or_strings)
+
+        for i, obj_or_string in enumerate(objs_or_strings, 1):
+            self.remove(obj_or_string, commit=commit and i == len(objs_or_strings))
+
     def clear(self, models=None, commit=True):
         """
         Clears the backend of all documents/objects for a collection of models.
@@ -111,6 +362,67 @@ class BaseSearchBackend:
         """
         raise NotImplementedError
 
+    def scan_ids(self, model, batch_size=None):
+        """
+        Yields lists of ``(django_id, id)`` tuples, one list per batch, for
+        every document of ``model`` in the index.
+
+        Backends should override this to walk the index with a cursor (a
+        scroll, ``cursorMark`` or a reader) so that memory use stays constant
+        however large the index is.
+
+        The default implementation pages through a ``SearchQuerySet``. It reads
+        all of the ids before yielding the first batch, because callers may
+        remove documents between batches and that would shift the offsets.
+        """
+        from haystack.query import SearchQuerySet
+
+        batch_size = batch_size or self.batch_size
+        sqs = SearchQuerySet(using=self.connection_alias).models(model)
+        sqs = sqs.values_list("pk", "id")
+        total = sqs.count()
+        ids = []
+
+        for start in range(0, total, batch_size):
+            ids.extend(
+                (force_str(pk), doc_id)
+                for pk, doc_id in sqs[start : start + batch_size]
+            )
+
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
+
+    def stream(self, query_string, batch_size=None, **kwargs):
+        """
+        Yields lists of results, one per batch of ``batch_size`` (defaulting
+        to the ``BATCH_SIZE``), for every match of the query. Takes the same
+        keyword arguments as ``search``, bar the offsets.
+
+        Backends should override this to walk the matches with a cursor (a
+        scroll, ``cursorMark`` or a reader), so deep batches come back as
+        quickly as the first ones.
+
+        The default implementation pages through ``search`` with offsets.
+        """
+        batch_size = batch_size or self.batch_size
+        start = 0
+
+        while True:
+            results = self.search(
+                query_string,
+                start_offset=start,
+                end_offset=start + batch_size,
+                **kwargs,
+            )
+
+            if results.get("results"):
+                yield results["results"]
+
+            start += batch_size
+
+            if start >= results.get("hits", 0):
+                return
+
     @log_query
     def search(self, query_string, **kwargs):
         """
@@ -128,6 +440,248 @@ class BaseSearchBackend:
         """
         raise NotImplementedError
 
+    async def asearch(self, query_string, **kwargs):
+        """
+        The asynchronous version of ``search``, for use under ASGI.
+
+        By default, this runs ``search`` in a thread (via ``sync_to_async``).
+        Backends with an asynchronous client should override it, so searches
+        don't tie up a thread each.
+        """
+        return await sync_to_async(self.search)(query_string, **kwargs)
+
+    def build_count_kwargs(self, kwargs):
+        """
+        Returns a copy of the keyword arguments for ``search`` without those
+        that can't change how many documents match (offsets, sorting,
+        highlighting, facets, stats & spelling).
+        """
+        return {
+            key: value
+            for key, value in kwargs.items()
+            if key not in COUNT_IGNORED_KWARGS
+        }
+
+    def count(self, query_string, **kwargs):
+        """
+        Returns the number of documents matching the query, without fetching
+        any of them. Takes the same keyword arguments as ``search``.
+
+        Backends should override this to ask for the count alone, so no hits
+        are loaded or turned into ``SearchResult`` objects.
+
+        The default implementation runs ``search`` for a single result.
+        """
+        kwargs = self.build_count_kwargs(kwargs)
+        return self.search(query_string, end_offset=1, **kwargs).get("hits", 0)
+
+    async def acount(self, query_string, **kwargs):
+        """
+        The asynchronous version of ``count``. By default, this runs ``count``
+        in a thread (via ``sync_to_async``).
+        """
+        return await sync_to_async(self.count)(query_string, **kwargs)
+
+    def multi_search(self, queries):
+        """
+        Runs several searches, each a ``(query_string, kwargs)`` pair as
+        ``search`` takes them, returning their results in the same order.
+
+        By default, they're simply run one after another. Backends that can
+        send them in a single request (or concurrently) should override this.
+        """
+        return [self.search(query_string, **kwargs) for query_string, kwargs in queries]
+
+    def get_result_cache(self):
+        """
+        Returns the Django cache search results are kept in, or ``None`` if
+        the connection has no ``RESULT_CACHE``.
+        """
+        if self.result_cache is None:
+            return None
+
+        return caches[self.result_cache]
+
+    def get_generation_key(self):
+        return "haystack:%s:generation" % self.connection_alias
+
+    def get_generation(self):
+        """
+        Returns the current generation of cached results for the connection.
+        """
+        cache = self.get_result_cache()
+        key = self.get_generation_key()
+        generation = cache.get(key)
+
+        if generation is None:
+            # Starting from the time means a generation that fell out of the
+            # cache can't come back around & revive stale results.
+            cache.add(key, int(time() * 1000), timeout=None)
+            generation = cache.get(key)
+
+        return generation
+
+    def bump_generation(self):
+        """
+        Moves the connection on to a new generation, so none of the results
+        cached so far get used again.
+        """
+        cache = self.get_result_cache()
+
+        if cache is None:
+            return
+
+        key = self.get_generation_key()
+
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, int(time() * 1000), timeout=None)
+
+    def get_result_cache_key(self, query_string, kwargs, method="search"):
+        """
+        Returns the key the results of ``<method>(query_string, **kwargs)`` are
+        cached under in the current generation.
+        """
+        digest = hashlib.md5(
+            ("%s|%s|%s" % (method, query_string, _cache_key_part(kwargs))).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        return "haystack:%s:%s:%s" % (
+            self.connection_alias,
+            self.get_generation(),
+            digest,
+        )
+
+    def should_cache(self, cache_timeout):
+        """
+        Returns the timeout to cache results for, or ``0`` if they shouldn't
+        be cached. A ``cache_timeout`` of ``None`` falls back to the
+        connection's ``RESULT_CACHE_TIMEOUT``.
+        """
+        if self.result_cache is None:
+            return 0
+
+        if cache_timeout is None:
+            return self.result_cache_timeout
+
+        return cache_timeout
+
+    def cached_search(self, query_string, cache_timeout=None, **kwargs):
+        """
+        Runs ``search``, going to the ``RESULT_CACHE`` first & keeping what the
+        backend returned there for ``cache_timeout`` seconds.
+        """
+        return self._cached_call("search", query_string, cache_timeout, kwargs)
+
+    async def acached_search(self, query_string, cache_timeout=None, **kwargs):
+        """
+        The asynchronous version of ``cached_search``, using ``asearch``.
+        """
+        return await self._acached_call("search", query_string, cache_timeout, kwargs)
+
+    def cached_count(self, query_string, cache_timeout=None, **kwargs):
+        """
+        Runs ``count``, going through the ``RESULT_CACHE`` the same way as
+        ``cached_search``.
+        """
+        return self._cached_call("count", query_string, cache_timeout, kwargs)
+
+    async def acached_count(self, query_string, cache_timeout=None, **kwargs):
+        """
+        The asynchronous version of ``cached_count``, using ``acount``.
+        """
+        return await self._acached_call("count", query_string, cache_timeout, kwargs)
+
+    def cached_multi_search(self, queries, cache_timeouts=None):
+        """
+        Runs ``multi_search``, going through the ``RESULT_CACHE`` the same way
+        as ``cached_search`` for each of the searches. ``cache_timeouts`` has
+        the timeout of each search, in the same order. Only those that weren't
+        cached are sent to the backend.
+        """
+        if cache_timeouts is None:
+            cache_timeouts = [None] * len(queries)
+
+        cache = self.get_result_cache()
+        all_results = [None] * len(queries)
+        to_cache = {}
+
+        for position, ((query_string, kwargs), cache_timeout) in enumerate(
+            zip(queries, cache_timeouts)
+        ):
+            cache_timeout = self.should_cache(cache_timeout)
+
+            if cache_timeout:
+                key = self.get_result_cache_key(query_string, kwargs)
+                to_cache[key] = (position, cache_timeout)
+
+        if to_cache:
+            for key, results in cache.get_many(list(to_cache)).items():
+                self.result_cache_hits += 1
+                all_results[to_cache.pop(key)[0]] = results
+
+            self.result_cache_misses += len(to_cache)
+
+        to_run = [
+            position for position, results in enumerate(all_results) if results is None
+        ]
+
+        if not to_run:
+            return all_results
+
+        for position, results in zip(
+            to_run, self.multi_search([queries[position] for position in to_run])
+        ):
+            all_results[position] = results
+
+        for key, (position, cache_timeout) in to_cache.items():
+            cache.set(key, all_results[position], cache_timeout)
+
+        return all_results
+
+    def _cached_call(self, method, query_string, cache_timeout, kwargs):
+        cache_timeout = self.should_cache(cache_timeout)
+
+        if not cache_timeout:
+            return getattr(self, method)(query_string, **kwargs)
+
+        cache = self.get_result_cache()
+        key = self.get_result_cache_key(query_string, kwargs, method)
+        results = cache.get(key)
+
+        if results is not None:
+            self.result_cache_hits += 1
+            return results
+
+        self.result_cache_misses += 1
+        results = getattr(self, method)(query_string, **kwargs)
+        cache.set(key, results, cache_timeout)
+        return results
+
+    async def _acached_call(self, method, query_string, cache_timeout, kwargs):
+        cache_timeout = self.should_cache(cache_timeout)
+        async_method = getattr(self, "a%s" % method)
+
+        if not cache_timeout:
+            return await async_method(query_string, **kwargs)
+
+        cache = self.get_result_cache()
+        key = await sync_to_async(self.get_result_cache_key)(
+            query_string, kwargs, method
+        )
+        results = await cache.aget(key)
+
+        if results is not None:
+            self.result_cache_hits += 1
+            return results
+
+        self.result_cache_misses += 1
+        results = await async_method(query_string, **kwargs)
+        await cache.aset(key, results, cache_timeout)
+        return results
+
     def build_search_kwargs(
         self,
         query_string,
@@ -504,6 +1058,9 @@ class BaseSearchQuery:
         self.spelling_query = None
         self.result_class = SearchResult
         self.stats = {}
+        #: How long to cache results for. ``None`` uses the connection's
+        #: ``RESULT_CACHE_TIMEOUT`` & ``0`` turns caching off.
+        self.result_cache_timeout = None
         from haystack import connections
 
         self._using = using
@@ -582,20 +1139,46 @@ class BaseSearchQuery:
 
         return kwargs
 
-    def run(self, spelling_query=None, **kwargs):
-        """Builds and executes the query. Returns a list of search results."""
+    def build_search(self, spelling_query=None, **kwargs):
+        """
+        Returns the query string & keyword arguments ``run`` passes to the
+        backend's ``search``.
+        """
         final_query = self.build_query()
         search_kwargs = self.build_params(spelling_query=spelling_query)
 
         if kwargs:
             search_kwargs.update(kwargs)
 
-        results = self.backend.search(final_query, **search_kwargs)
+        return final_query, search_kwargs
+
+    def store_results(self, results):
+        """Keeps what the backend's ``search`` returned."""
         self._results = results.get("results", [])
         self._hit_count = results.get("hits", 0)
         self._facet_counts = self.post_process_facets(results)
         self._spelling_suggestion = results.get("spelling_suggestion", None)
 
+    def run(self, spelling_query=None, **kwargs):
+        """Builds and executes the query. Returns a list of search results."""
+        final_query, search_kwargs = self.build_search(spelling_query, **kwargs)
+        self.store_results(
+            self.backend.cached_search(
+                final_query, self.result_cache_timeout, **search_kwargs
+            )
+        )
+
+    async def arun(self, spelling_query=None, **kwargs):
+        """
+        The asynchronous version of ``run``, using the backend's ``asearch``.
+        """
+        final_query, search_kwargs = self.build_search(spelling_query, **kwargs)
+        self.store_results(
+            await self.backend.acached_search(
+                final_query, self.result_cache_timeout, **search_kwargs
+            )
+        )
+
     def run_mlt(self, **kwargs):
         """
         Executes the More Like This. Returns a list of search results similar
@@ -629,24 +1212,47 @@ class BaseSearchQuery:
         if kwargs:
             search_kwargs.update(kwargs)
 
-        results = self.backend.search(self._raw_query, **search_kwargs)
+        results = self.backend.cached_search(
+            self._raw_query, self.result_cache_timeout, **search_kwargs
+        )
         self._results = results.get("results", [])
         self._hit_count = results.get("hits", 0)
         self._facet_counts = results.get("facets", {})
         self._spelling_suggestion = results.get("spelling_suggestion", None)
 
+    def run_count(self):
+        """
+        Asks the backend for the number of matches alone, leaving the results
+        to be fetched when they're needed.
+        """
+        final_query, search_kwargs = self.build_search()
+        self._hit_count = self.backend.cached_count(
+            final_query, self.result_cache_timeout, **search_kwargs
+        )
+
+    async def arun_count(self):
+        """
+        The asynchronous version of ``run_count``, using the backend's
+        ``acount``.
+        """
+        final_query, search_kwargs = self.build_search()
+        self._hit_count = await self.backend.acached_count(
+            final_query, self.result_cache_timeout, **search_kwargs
+        )
+
     def get_count(self):
         """
         Returns the number of results the backend found for the query.
 
-        If the query has not been run, this will execute the query and store
-        the results.
+        If the query has not been run, this will ask the backend for the count
+        alone (or run MLT & raw queries for a single result).
         """
         if self._hit_count is None:
-            # Limit the slice to 1 so we get a count without consuming
-            # everything.
-            if not self.end_offset:
-                self.end_offset = 1
+            if self._more_like_this or self._raw_query:
+                # Limit the slice to 1 so we get a count without consuming
+                # everything.
+                if not self.end_offset:
+                    self.end_offset = 1
 
             if self._more_like_this:
                 # Special case for MLT.
@@ -655,7 +1261,20 @@ class BaseSearchQuery:
                 # Special case for raw queries.
                 self.run_raw()
             else:
-                self.run()
+                self.run_count()
+
+        return self._hit_count
+
+    async def aget_count(self):
+        """The asynchronous version of ``get_count``."""
+        if self._hit_count is None:
+            if self._more_like_this or self._raw_query:
+                if not self.end_offset:
+                    self.end_offset = 1
+
+                await self._arun_any()
+            else:
+                await self.arun_count()
 
         return self._hit_count
 
@@ -678,6 +1297,22 @@ class BaseSearchQuery:
 
         return self._results
 
+    async def aget_results(self, **kwargs):
+        """The asynchronous version of ``get_results``."""
+        if self._results is None:
+            await self._arun_any(**kwargs)
+
+        return self._results
+
+    async def _arun_any(self, **kwargs):
+        if self._more_like_this:
+            # MLT & raw queries are rare enough to be left in a thread.
+            await sync_to_async(self.run_mlt)(**kwargs)
+        elif self._raw_query:
+            await sync_to_async(self.run_raw)(**kwargs)
+        else:
+            await self.arun(**kwargs)
+
     def get_facet_counts(self):
         """
         Returns the facet counts received from the backend.
@@ -690,6 +1325,13 @@ class BaseSearchQuery:
 
         return self._facet_counts
 
+    async def aget_facet_counts(self):
+        """The asynchronous version of ``get_facet_counts``."""
+        if self._facet_counts is None:
+            await self.arun()
+
+        return self._facet_counts
+
     def get_stats(self):
         """
         Returns the stats received from the backend.
@@ -1066,6 +1708,7 @@ class BaseSearchQuery:
         clone._raw_query = self._raw_query
         clone._raw_query_params = self._raw_query_params
         clone.spelling_query = self.spelling_query
+        clone.result_cache_timeout = self.result_cache_timeout
         clone._more_like_this = self._more_like_this
         clone._mlt_instance = self._mlt_instance
 
@@ -4,7 +4,7 @@ import warnings
 from django.conf import settings
 
 import haystack
-from haystack.backends import BaseEngine
+from haystack.backends import BaseEngine, invalidates_cache
 from haystack.backends.elasticsearch_backend import (
     ElasticsearchSearchBackend,
     ElasticsearchSearchQuery,
@@ -30,6 +30,7 @@ class Elasticsearch5SearchBackend(ElasticsearchSearchBackend):
         super().__init__(connection_alias, **connection_options)
         self.content_field_name = None
 
+    @invalidates_cache
     def clear(self, models=None, commit=True):
         """
         Clears the backend of all documents/objects for a collection of models.
@@ -42,7 +43,7 @@ class Elasticsearch5SearchBackend(ElasticsearchSearchBackend):
 
         try:
             if models is None:
-                self.conn.indices.delete(index=self.index_name, ignore=404)
+                self.delete_index()
                 self.setup_complete = False
                 self.existing_mapping = {}
                 self.content_field_name = None
@@ -4,7 +4,7 @@ import warnings
 from django.conf import settings
 
 import haystack
-from haystack.backends import BaseEngine
+from haystack.backends import BaseEngine, invalidates_cache
 from haystack.backends.elasticsearch_backend import (
     ElasticsearchSearchBackend,
     ElasticsearchSearchQuery,
@@ -26,6 +26,9 @@ except ImportError:
 
 
 class Elasticsearch7SearchBackend(ElasticsearchSearchBackend):
+    # The ``remove_index`` alias action is available since Elasticsearch 6.4.
+    REMOVE_INDEX_ACTION_AVAILABLE = True
+
     # Settings to add an n-gram & edge n-gram analyzer.
     DEFAULT_SETTINGS = {
         "settings": {
@@ -100,6 +103,7 @@ class Elasticsearch7SearchBackend(ElasticsearchSearchBackend):
         # ES7 does not support a doc_type option
         return {"properties": field_mapping}
 
+    @invalidates_cache
     def clear(self, models=None, commit=True):
         """
         Clears the backend of all documents/objects for a collection of models.
@@ -112,7 +116,7 @@ class Elasticsearch7SearchBackend(ElasticsearchSearchBackend):
 
         try:
             if models is None:
-                self.conn.indices.delete(index=self.index_name, ignore=404)
+                self.delete_index()
                 self.setup_complete = False
                 self.existing_mapping = {}
                 self.content_field_name = None
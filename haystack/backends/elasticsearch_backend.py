@@ -1,13 +1,22 @@
 import ast
+import asyncio
 import re
 import warnings
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
 import haystack
-from haystack.backends import BaseEngine, BaseSearchBackend, BaseSearchQuery, log_query
+from haystack.backends import (
+    BaseEngine,
+    BaseSearchBackend,
+    BaseSearchQuery,
+    invalidates_cache,
+    log_query,
+)
 from haystack.constants import (
     ALL_FIELD,
     DEFAULT_OPERATOR,
@@ -39,6 +48,7 @@ try:
     except ImportError:
         # let's try this, for elasticsearch <= 1.7.0
         from elasticsearch.helpers import bulk_index as bulk
+    from elasticsearch.helpers import scan
     from elasticsearch.exceptions import NotFoundError
 except ImportError:
     raise MissingDependency(
@@ -51,6 +61,9 @@ DATETIME_REGEX = re.compile(
     r"(?P<hour>\d{2}):(?P<minute>\d{2}):(?P<second>\d{2})(\.\d+)?$"
 )
 
+# What a bulk session sets on the index, when it's allowed to.
+BULK_SESSION_INDEX_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
 
 class ElasticsearchSearchBackend(BaseSearchBackend):
     # Word reserved by Elasticsearch for special use.
@@ -80,6 +93,9 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
         "/",
     )
 
+    # Whether ``update_aliases`` can delete an index in the same request.
+    REMOVE_INDEX_ACTION_AVAILABLE = False
+
     # Settings to add an n-gram & edge n-gram analyzer.
     DEFAULT_SETTINGS = {
         "settings": {
@@ -141,7 +157,20 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
             timeout=self.timeout,
             **connection_options.get("KWARGS", {}),
         )
+        # The client for ``asearch``, made on first use (along with the event
+        # loop it belongs to).
+        self.url = connection_options["URL"]
+        self.conn_kwargs = connection_options.get("KWARGS", {})
+        self.async_conn = None
+        self.async_conn_loop = None
         self.index_name = connection_options["INDEX_NAME"]
+        # Whether bulk sessions may turn off refreshes & replicas. Always on
+        # for the index ``swap_index`` builds, as nothing searches it yet.
+        self.bulk_index_settings = connection_options.get("BULK_INDEX_SETTINGS", False)
+        self.bulk_session_settings = None
+        self.bulk_session_index = None
+        # Points at the live index once ``swap_index`` has been used.
+        self.alias_name = self.index_name
         self.log = logging.getLogger("haystack")
         self.setup_complete = False
         self.existing_mapping = {}
@@ -197,6 +226,45 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
         return index.full_prepare(obj)
 
     def update(self, index, iterable, commit=True):
+        self.update_documents(
+            index, self.prepare_documents(index, iterable), commit=commit
+        )
+
+    def prepare_documents(self, index, iterable):
+        prepped_docs = []
+
+        objs = list(iterable)
+
+        with index.prerender_templates(objs):
+            for obj in objs:
+                try:
+                    prepped_data = self._prepare_object(index, obj)
+                    final_data = {}
+
+                    # Convert the data to make sure it's happy.
+                    for key, value in prepped_data.items():
+                        final_data[key] = self._from_python(value)
+                    final_data["_id"] = final_data[ID]
+
+                    prepped_docs.append(final_data)
+                except SkipDocument:
+                    self.log.debug("Indexing for object `%s` skipped", obj)
+                except elasticsearch.TransportError:
+                    if not self.silently_fail:
+                        raise
+
+                    # We'll log the object identifier but won't include the actual object
+                    # to avoid the possibility of that generating encoding errors while
+                    # processing the log message:
+                    self.log.exception(
+                        "Preparing object for update",
+                        extra={"data": {"index": index, "object": get_identifier(obj)}},
+                    )
+
+        return prepped_docs
+
+    @invalidates_cache
+    def update_documents(self, index, documents, commit=True):
         if not self.setup_complete:
             try:
                 self.setup()
@@ -207,43 +275,86 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
                 self.log.exception("Failed to add documents to Elasticsearch")
                 return
 
-        prepped_docs = []
+        bulk(
+            self.conn,
+            documents,
+            index=self.index_name,
+            **self._get_doc_type_option(),
+        )
 
-        for obj in iterable:
-            try:
-                prepped_data = self._prepare_object(index, obj)
-                final_data = {}
+        if self.should_commit(commit):
+            self.conn.indices.refresh(index=self.index_name)
 
-                # Convert the data to make sure it's happy.
-                for key, value in prepped_data.items():
-                    final_data[key] = self._from_python(value)
-                final_data["_id"] = final_data[ID]
+    def begin_bulk_session(self):
+        # Elasticsearch would otherwise refresh every second & copy every
+        # write to the replicas as it comes in. Dropping the replicas of a
+        # live index throws them away though, so that's only done when asked.
+        self.bulk_session_settings = None
+        self.bulk_session_index = None
 
-                prepped_docs.append(final_data)
-            except SkipDocument:
-                self.log.debug("Indexing for object `%s` skipped", obj)
+        if not self.bulk_index_settings:
+            return
+
+        try:
+            if not self.setup_complete:
+                self.setup()
+
+            index_settings = self.conn.indices.get_settings(index=self.index_name)
+            # Once ``swap_index`` has been used, ``INDEX_NAME`` is an alias &
+            # the settings come back under the index it points at.
+            index_name, index_settings = next(iter(index_settings.items()))
+            current = index_settings["settings"]["index"]
+            # A value matching the bulk one was left by another session (or a
+            # killed one), so the default gets put back instead.
+            self.bulk_session_settings = {
+                key: (None if str(current.get(key)) == str(value) else current.get(key))
+                for key, value in BULK_SESSION_INDEX_SETTINGS.items()
+            }
+            self.bulk_session_index = index_name
+            self.conn.indices.put_settings(
+                index=index_name,
+                body={"index": BULK_SESSION_INDEX_SETTINGS},
+            )
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to start a bulk session in Elasticsearch")
+
+    def end_bulk_session(self, commit=True):
+        try:
+            if self.bulk_session_settings is not None:
+                # ``None`` puts back the default for settings that weren't set.
+                self.conn.indices.put_settings(
+                    index=self.bulk_session_index,
+                    body={"index": self.bulk_session_settings},
+                )
+                self.bulk_session_settings = None
+                self.bulk_session_index = None
+
+            if commit:
+                self.conn.indices.refresh(index=self.index_name)
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to end a bulk session in Elasticsearch")
+
+    def parallel_update(self, index, iterable, **kwargs):
+        # Set up the index before the sender threads all try to.
+        if not self.setup_complete:
+            try:
+                self.setup()
             except elasticsearch.TransportError:
                 if not self.silently_fail:
                     raise
 
-                # We'll log the object identifier but won't include the actual object
-                # to avoid the possibility of that generating encoding errors while
-                # processing the log message:
-                self.log.exception(
-                    "Preparing object for update",
-                    extra={"data": {"index": index, "object": get_identifier(obj)}},
-                )
-
-        bulk(
-            self.conn,
-            prepped_docs,
-            index=self.index_name,
-            **self._get_doc_type_option(),
-        )
+                self.log.exception("Failed to add documents to Elasticsearch")
+                return
 
-        if commit:
-            self.conn.indices.refresh(index=self.index_name)
+        super().parallel_update(index, iterable, **kwargs)
 
+    @invalidates_cache
     def remove(self, obj_or_string, commit=True):
         doc_id = get_identifier(obj_or_string)
 
@@ -268,7 +379,7 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
                 **self._get_doc_type_option(),
             )
 
-            if commit:
+            if self.should_commit(commit):
                 self.conn.indices.refresh(index=self.index_name)
         except elasticsearch.TransportError:
             if not self.silently_fail:
@@ -279,6 +390,142 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
                 doc_id,
             )
 
+    @invalidates_cache
+    def remove_many(self, objs_or_strings, commit=True):
+        doc_ids = [get_identifier(obj_or_string) for obj_or_string in objs_or_strings]
+
+        if not doc_ids:
+            return
+
+        if not self.setup_complete:
+            try:
+                self.setup()
+            except elasticsearch.TransportError:
+                if not self.silently_fail:
+                    raise
+
+                self.log.exception(
+                    "Failed to remove %d documents from Elasticsearch", len(doc_ids)
+                )
+                return
+
+        try:
+            _, errors = bulk(
+                self.conn,
+                [{"_op_type": "delete", "_id": doc_id} for doc_id in doc_ids],
+                index=self.index_name,
+                raise_on_error=False,
+                **self._get_doc_type_option(),
+            )
+
+            if self.should_commit(commit):
+                self.conn.indices.refresh(index=self.index_name)
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to remove %d documents from Elasticsearch", len(doc_ids)
+            )
+            return
+
+        # Like ``remove``, documents which are already gone aren't an error.
+        for error in errors:
+            if error.get("delete", {}).get("status") != 404:
+                self.log.error(
+                    "Failed to remove document from Elasticsearch: %s", error
+                )
+
+    def get_alias_indices(self):
+        """
+        Returns the names of the indices the ``INDEX_NAME`` alias points at,
+        or an empty list if it isn't an alias.
+        """
+        try:
+            return sorted(self.conn.indices.get_alias(name=self.alias_name))
+        except NotFoundError:
+            return []
+
+    def delete_index(self):
+        """
+        Deletes the index, or all the indices behind it if it's an alias.
+        """
+        index_names = [self.index_name]
+
+        if self.index_name == self.alias_name:
+            index_names = self.get_alias_indices() or index_names
+
+        for index_name in index_names:
+            self.conn.indices.delete(index=index_name, ignore=404)
+
+    @contextmanager
+    def swap_index(self):
+        """
+        Builds a new index in the background & swaps it in for the live one.
+
+        Everything written within the block goes to a new, timestamped index
+        (set up for bulk indexing), while searches elsewhere keep hitting the
+        old one. On success, the ``INDEX_NAME`` alias is atomically pointed at
+        the new index & the old one is deleted. On failure, the new index is
+        deleted instead. Errors aren't silenced within the block, so a partial
+        index never gets swapped in.
+        """
+        new_index_name = "%s_%s" % (
+            self.alias_name,
+            datetime.now().strftime("%Y%m%d%H%M%S%f"),
+        )
+        silently_fail = self.silently_fail
+        bulk_index_settings = self.bulk_index_settings
+        self.silently_fail = False
+        self.bulk_index_settings = True
+        self.index_name = new_index_name
+        self.setup_complete = False
+        self.existing_mapping = {}
+
+        try:
+            self.setup()
+
+            with self.bulk_session():
+                yield new_index_name
+
+            self.point_alias(new_index_name)
+        except BaseException:
+            self.conn.indices.delete(index=new_index_name, ignore=404)
+            raise
+        finally:
+            self.silently_fail = silently_fail
+            self.bulk_index_settings = bulk_index_settings
+            self.index_name = self.alias_name
+            self.setup_complete = False
+            self.existing_mapping = {}
+
+    @invalidates_cache
+    def point_alias(self, index_name):
+        """
+        Atomically points the ``INDEX_NAME`` alias at ``index_name`` alone &
+        deletes the indices it pointed at before.
+        """
+        old_index_names = self.get_alias_indices()
+        actions = [
+            {"remove": {"index": old_index_name, "alias": self.alias_name}}
+            for old_index_name in old_index_names
+        ]
+        actions.append({"add": {"index": index_name, "alias": self.alias_name}})
+
+        if not old_index_names and self.conn.indices.exists(index=self.alias_name):
+            # The first swap replaces a plain index, which has to go before an
+            # alias can take its name.
+            if self.REMOVE_INDEX_ACTION_AVAILABLE:
+                actions.insert(0, {"remove_index": {"index": self.alias_name}})
+            else:
+                self.conn.indices.delete(index=self.alias_name)
+
+        self.conn.indices.update_aliases(body={"actions": actions})
+
+        for old_index_name in old_index_names:
+            self.conn.indices.delete(index=old_index_name, ignore=404)
+
+    @invalidates_cache
     def clear(self, models=None, commit=True):
         # We actually don't want to do this here, as mappings could be
         # very different.
@@ -290,7 +537,7 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
 
         try:
             if models is None:
-                self.conn.indices.delete(index=self.index_name, ignore=404)
+                self.delete_index()
                 self.setup_complete = False
                 self.existing_mapping = {}
             else:
@@ -321,6 +568,42 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
             else:
                 self.log.exception("Failed to clear Elasticsearch index")
 
+    def scan_ids(self, model, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        query = {
+            "query": {
+                "query_string": {"query": "%s:%s" % (DJANGO_CT, get_model_ct(model))}
+            },
+            "_source": [DJANGO_ID],
+        }
+        batch = []
+
+        try:
+            for hit in scan(
+                self.conn,
+                query=query,
+                index=self.index_name,
+                size=batch_size,
+                **self._get_doc_type_option(),
+            ):
+                batch.append((hit["_source"][DJANGO_ID], hit["_id"]))
+
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to scan Elasticsearch index for model '%s'",
+                get_model_ct(model),
+            )
+            return
+
+        if batch:
+            yield batch
+
     def build_search_kwargs(
         self,
         query_string,
@@ -548,14 +831,11 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
 
         return kwargs
 
-    @log_query
-    def search(self, query_string, **kwargs):
-        if len(query_string) == 0:
-            return {"results": [], "hits": 0}
-
-        if not self.setup_complete:
-            self.setup()
-
+    def build_search_request(self, query_string, **kwargs):
+        """
+        Returns the body ``search`` sends to Elasticsearch & the options to
+        process what comes back with.
+        """
         search_kwargs = self.build_search_kwargs(query_string, **kwargs)
         search_kwargs["from"] = kwargs.get("start_offset", 0)
 
@@ -571,6 +851,84 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
         if end_offset is not None and end_offset > start_offset:
             search_kwargs["size"] = end_offset - start_offset
 
+        return search_kwargs, {
+            "highlight": kwargs.get("highlight"),
+            "result_class": kwargs.get("result_class", SearchResult),
+            "distance_point": kwargs.get("distance_point"),
+            "geo_sort": geo_sort,
+        }
+
+    def build_count_request(self, query_string, **kwargs):
+        """
+        Returns the body ``count`` sends to Elasticsearch's ``_count`` API.
+        """
+        search_kwargs = self.build_search_kwargs(
+            query_string, **self.build_count_kwargs(kwargs)
+        )
+        # ``_count`` takes nothing but the query.
+        return {"query": search_kwargs["query"]}
+
+    def stream(self, query_string, batch_size=None, **kwargs):
+        if len(query_string) == 0:
+            return
+
+        if not self.setup_complete:
+            self.setup()
+
+        batch_size = batch_size or self.batch_size
+        search_kwargs, process_kwargs = self.build_search_request(
+            query_string, **kwargs
+        )
+
+        # A scroll is paged by Elasticsearch itself & facets or suggestions
+        # wouldn't change from one batch to the next.
+        for key in ("from", "size", "facets", "aggs", "suggest"):
+            search_kwargs.pop(key, None)
+
+        batch = []
+
+        try:
+            for hit in scan(
+                self.conn,
+                query=search_kwargs,
+                index=self.index_name,
+                size=batch_size,
+                preserve_order="sort" in search_kwargs,
+                **self._get_doc_type_option(),
+            ):
+                batch.append(hit)
+
+                if len(batch) >= batch_size:
+                    yield self._process_results(
+                        {"hits": {"hits": batch}}, **process_kwargs
+                    )["results"]
+                    batch = []
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to stream Elasticsearch using '%s'", query_string
+            )
+            return
+
+        if batch:
+            yield self._process_results({"hits": {"hits": batch}}, **process_kwargs)[
+                "results"
+            ]
+
+    @log_query
+    def search(self, query_string, **kwargs):
+        if len(query_string) == 0:
+            return {"results": [], "hits": 0}
+
+        if not self.setup_complete:
+            self.setup()
+
+        search_kwargs, process_kwargs = self.build_search_request(
+            query_string, **kwargs
+        )
+
         try:
             raw_results = self.conn.search(
                 body=search_kwargs,
@@ -588,14 +946,204 @@ class ElasticsearchSearchBackend(BaseSearchBackend):
             )
             raw_results = {}
 
-        return self._process_results(
-            raw_results,
-            highlight=kwargs.get("highlight"),
-            result_class=kwargs.get("result_class", SearchResult),
-            distance_point=kwargs.get("distance_point"),
-            geo_sort=geo_sort,
+        return self._process_results(raw_results, **process_kwargs)
+
+    @log_query
+    def count(self, query_string, **kwargs):
+        if len(query_string) == 0:
+            return 0
+
+        if not self.setup_complete:
+            self.setup()
+
+        try:
+            raw_results = self.conn.count(
+                body=self.build_count_request(query_string, **kwargs),
+                index=self.index_name,
+                **self._get_doc_type_option(),
+            )
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to count Elasticsearch using '%s'",
+                query_string,
+            )
+            raw_results = {}
+
+        return raw_results.get("count", 0)
+
+    def multi_search(self, queries):
+        if not self.setup_complete:
+            self.setup()
+
+        all_results = [None] * len(queries)
+        body = []
+        requests = []
+
+        for position, (query_string, kwargs) in enumerate(queries):
+            if len(query_string) == 0:
+                all_results[position] = {"results": [], "hits": 0}
+                continue
+
+            search_kwargs, process_kwargs = self.build_search_request(
+                query_string, **kwargs
+            )
+            # An empty header searches the index given to ``msearch``.
+            body.extend([{}, search_kwargs])
+            requests.append((position, query_string, process_kwargs))
+
+        if not requests:
+            return all_results
+
+        try:
+            responses = self.conn.msearch(
+                body=body, index=self.index_name, **self._get_doc_type_option()
+            )["responses"]
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to query Elasticsearch using %d searches", len(requests)
+            )
+            responses = [{}] * len(requests)
+
+        for (position, query_string, process_kwargs), raw_results in zip(
+            requests, responses
+        ):
+            # Each search in the batch can fail on its own.
+            if "error" in raw_results:
+                if not self.silently_fail:
+                    raise elasticsearch.TransportError(
+                        raw_results.get("status", "N/A"), raw_results["error"]
+                    )
+
+                self.log.error(
+                    "Failed to query Elasticsearch using '%s': %s",
+                    query_string,
+                    raw_results["error"],
+                )
+                raw_results = {}
+
+            all_results[position] = self._process_results(raw_results, **process_kwargs)
+
+        return all_results
+
+    async def get_async_conn(self):
+        """
+        Returns an ``AsyncElasticsearch`` client for the running event loop, or
+        ``None`` if the installed ``elasticsearch`` doesn't provide one (it
+        needs 7.8+ & ``aiohttp``).
+        """
+        async_client = getattr(elasticsearch, "AsyncElasticsearch", None)
+
+        if async_client is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+
+        # The client's HTTP session can only be used from the loop it was
+        # made in, so the one made for an earlier loop is closed.
+        if self.async_conn is not None and self.async_conn_loop is not loop:
+            await self.close_async_conn()
+
+        if self.async_conn is None:
+            self.async_conn = async_client(
+                self.url, timeout=self.timeout, **self.conn_kwargs
+            )
+            self.async_conn_loop = loop
+
+        return self.async_conn
+
+    async def close_async_conn(self):
+        """
+        Closes the ``AsyncElasticsearch`` client (& its HTTP session), if one
+        has been made.
+        """
+        async_conn, self.async_conn = self.async_conn, None
+        self.async_conn_loop = None
+
+        if async_conn is None:
+            return
+
+        try:
+            await async_conn.close()
+        except Exception:
+            # The sockets of a closed loop can't be shut down cleanly, which
+            # leaves nothing more to do.
+            self.log.debug("Failed to close the async Elasticsearch client")
+
+    async def asearch(self, query_string, **kwargs):
+        if await self.get_async_conn() is None:
+            return await super().asearch(query_string, **kwargs)
+
+        return await self._async_search(query_string, **kwargs)
+
+    @log_query
+    async def _async_search(self, query_string, **kwargs):
+        if len(query_string) == 0:
+            return {"results": [], "hits": 0}
+
+        if not self.setup_complete:
+            await sync_to_async(self.setup)()
+
+        search_kwargs, process_kwargs = self.build_search_request(
+            query_string, **kwargs
         )
 
+        try:
+            raw_results = await self.async_conn.search(
+                body=search_kwargs,
+                index=self.index_name,
+                _source=True,
+                **self._get_doc_type_option(),
+            )
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to query Elasticsearch using '%s'",
+                query_string,
+            )
+            raw_results = {}
+
+        return self._process_results(raw_results, **process_kwargs)
+
+    async def acount(self, query_string, **kwargs):
+        if await self.get_async_conn() is None:
+            return await super().acount(query_string, **kwargs)
+
+        return await self._async_count(query_string, **kwargs)
+
+    @log_query
+    async def _async_count(self, query_string, **kwargs):
+        if len(query_string) == 0:
+            return 0
+
+        if not self.setup_complete:
+            await sync_to_async(self.setup)()
+
+        try:
+            raw_results = await self.async_conn.count(
+                body=self.build_count_request(query_string, **kwargs),
+                index=self.index_name,
+                **self._get_doc_type_option(),
+            )
+        except elasticsearch.TransportError:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to count Elasticsearch using '%s'",
+                query_string,
+            )
+            raw_results = {}
+
+        return raw_results.get("count", 0)
+
     def more_like_this(
         self,
         model_instance,
@@ -1086,20 +1634,6 @@ class ElasticsearchSearchQuery(BaseSearchQuery):
 
         return search_kwargs
 
-    def run(self, spelling_query=None, **kwargs):
-        """Builds and executes the query. Returns a list of search results."""
-        final_query = self.build_query()
-        search_kwargs = self.build_params(spelling_query, **kwargs)
-
-        if kwargs:
-            search_kwargs.update(kwargs)
-
-        results = self.backend.search(final_query, **search_kwargs)
-        self._results = results.get("results", [])
-        self._hit_count = results.get("hits", 0)
-        self._facet_counts = self.post_process_facets(results)
-        self._spelling_suggestion = results.get("spelling_suggestion", None)
-
     def run_mlt(self, **kwargs):
         """Builds and executes the query. Returns a list of search results."""
         if self._more_like_this is False or self._mlt_instance is None:
@@ -1,4 +1,6 @@
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from time import time
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -9,7 +11,9 @@ from haystack.backends import (
     BaseSearchBackend,
     BaseSearchQuery,
     EmptyResults,
+    invalidates_cache,
     log_query,
+    record_query,
 )
 from haystack.constants import DJANGO_CT, DJANGO_ID, ID
 from haystack.exceptions import MissingDependency, MoreLikeThisError, SkipDocument
@@ -77,39 +81,56 @@ class SolrSearchBackend(BaseSearchBackend):
         self.log = logging.getLogger("haystack")
 
     def update(self, index, iterable, commit=True):
+        self.update_documents(
+            index, self.prepare_documents(index, iterable), commit=commit
+        )
+
+    def prepare_documents(self, index, iterable):
         docs = []
 
-        for obj in iterable:
-            try:
-                docs.append(index.full_prepare(obj))
-            except SkipDocument:
-                self.log.debug("Indexing for object `%s` skipped", obj)
-            except UnicodeDecodeError:
-                if not self.silently_fail:
-                    raise
+        objs = list(iterable)
+
+        with index.prerender_templates(objs):
+            for obj in objs:
+                try:
+                    docs.append(index.full_prepare(obj))
+                except SkipDocument:
+                    self.log.debug("Indexing for object `%s` skipped", obj)
+                except UnicodeDecodeError:
+                    if not self.silently_fail:
+                        raise
+
+                    # We'll log the object identifier but won't include the actual object
+                    # to avoid the possibility of that generating encoding errors while
+                    # processing the log message:
+                    self.log.exception(
+                        "UnicodeDecodeError while preparing object for update",
+                        extra={"data": {"index": index, "object": get_identifier(obj)}},
+                    )
 
-                # We'll log the object identifier but won't include the actual object
-                # to avoid the possibility of that generating encoding errors while
-                # processing the log message:
-                self.log.exception(
-                    "UnicodeDecodeError while preparing object for update",
-                    extra={"data": {"index": index, "object": get_identifier(obj)}},
-                )
+        return docs
 
-        if len(docs) > 0:
+    @invalidates_cache
+    def update_documents(self, index, documents, commit=True):
+        if len(documents) > 0:
             try:
-                self.conn.add(docs, commit=commit, boost=index.get_field_weights())
+                self.conn.add(
+                    documents,
+                    commit=self.should_commit(commit),
+                    boost=index.get_field_weights(),
+                )
             except (IOError, SolrError):
                 if not self.silently_fail:
                     raise
 
                 self.log.exception("Failed to add documents to Solr")
 
+    @invalidates_cache
     def remove(self, obj_or_string, commit=True):
         solr_id = get_identifier(obj_or_string)
 
         try:
-            kwargs = {"commit": commit, "id": solr_id}
+            kwargs = {"commit": self.should_commit(commit), "id": solr_id}
             self.conn.delete(**kwargs)
         except (IOError, SolrError):
             if not self.silently_fail:
@@ -120,6 +141,34 @@ class SolrSearchBackend(BaseSearchBackend):
                 solr_id,
             )
 
+    @invalidates_cache
+    def remove_many(self, objs_or_strings, commit=True):
+        solr_ids = [get_identifier(obj_or_string) for obj_or_string in objs_or_strings]
+
+        if not solr_ids:
+            return
+
+        try:
+            self.conn.delete(id=solr_ids, commit=self.should_commit(commit))
+        except (IOError, SolrError):
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to remove %d documents from Solr", len(solr_ids))
+
+    def end_bulk_session(self, commit=True):
+        if not commit:
+            return
+
+        try:
+            self.conn.commit()
+        except (IOError, SolrError):
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to commit the bulk session to Solr")
+
+    @invalidates_cache
     def clear(self, models=None, commit=True):
         if models is not None:
             assert isinstance(models, (list, tuple))
@@ -151,8 +200,45 @@ class SolrSearchBackend(BaseSearchBackend):
             else:
                 self.log.exception("Failed to clear Solr index")
 
+    def scan_ids(self, model, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        cursor_mark = "*"
+
+        while True:
+            try:
+                raw_results = self.conn.search(
+                    "*:*",
+                    fq="%s:%s" % (DJANGO_CT, get_model_ct(model)),
+                    fl="%s,%s" % (ID, DJANGO_ID),
+                    sort="%s asc" % ID,
+                    rows=batch_size,
+                    cursorMark=cursor_mark,
+                )
+            except (IOError, SolrError):
+                if not self.silently_fail:
+                    raise
+
+                self.log.exception(
+                    "Failed to scan Solr index for model '%s'", get_model_ct(model)
+                )
+                return
+
+            batch = [(doc[DJANGO_ID], doc[ID]) for doc in raw_results.docs]
+            if batch:
+                yield batch
+
+            # Solr hands back the same cursor mark once everything has been
+            # read.
+            if raw_results.nextCursorMark in (None, cursor_mark):
+                return
+
+            cursor_mark = raw_results.nextCursorMark
+
     @log_query
     def search(self, query_string, **kwargs):
+        return self._search(query_string, **kwargs)
+
+    def _search(self, query_string, **kwargs):
         if len(query_string) == 0:
             return {"results": [], "hits": 0}
 
@@ -174,6 +260,105 @@ class SolrSearchBackend(BaseSearchBackend):
             distance_point=kwargs.get("distance_point"),
         )
 
+    def stream(self, query_string, batch_size=None, **kwargs):
+        if len(query_string) == 0:
+            return
+
+        batch_size = batch_size or self.batch_size
+        search_kwargs = self.build_search_kwargs(query_string, **kwargs)
+
+        # The cursor does the paging & facets, stats or suggestions wouldn't
+        # change from one batch to the next.
+        for key in list(search_kwargs):
+            if key.split(".")[0] in ("start", "facet", "f", "stats", "spellcheck"):
+                del search_kwargs[key]
+
+        # Cursors need the unique key to break ties.
+        sort = search_kwargs.get("sort")
+        search_kwargs["sort"] = "%s, %s asc" % (sort, ID) if sort else "%s asc" % ID
+        search_kwargs["rows"] = batch_size
+        cursor_mark = "*"
+
+        while True:
+            try:
+                raw_results = self.conn.search(
+                    query_string, cursorMark=cursor_mark, **search_kwargs
+                )
+            except (IOError, SolrError):
+                if not self.silently_fail:
+                    raise
+
+                self.log.exception("Failed to stream Solr using '%s'", query_string)
+                return
+
+            results = self._process_results(
+                raw_results,
+                highlight=kwargs.get("highlight"),
+                result_class=kwargs.get("result_class", SearchResult),
+                distance_point=kwargs.get("distance_point"),
+            )["results"]
+
+            if results:
+                yield results
+
+            # Solr hands back the same cursor mark once everything has been
+            # read.
+            if raw_results.nextCursorMark in (None, cursor_mark):
+                return
+
+            cursor_mark = raw_results.nextCursorMark
+
+    @log_query
+    def count(self, query_string, **kwargs):
+        if len(query_string) == 0:
+            return 0
+
+        search_kwargs = self.build_search_kwargs(
+            query_string, **self.build_count_kwargs(kwargs)
+        )
+
+        # Spelling suggestions are switched on by the connection, not the query.
+        for key in list(search_kwargs):
+            if key.split(".")[0] == "spellcheck":
+                del search_kwargs[key]
+
+        search_kwargs["rows"] = 0
+        search_kwargs["fl"] = ID
+
+        try:
+            raw_results = self.conn.search(query_string, **search_kwargs)
+        except (IOError, SolrError):
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to count Solr using '%s'", query_string)
+            return 0
+
+        return raw_results.hits
+
+    def multi_search(self, queries, threads=4):
+        # Solr has no multi-search request, so send the searches concurrently
+        # instead. ``log_query`` would record them on the worker threads'
+        # connections, so they're recorded here once the workers are done.
+        timings = [None] * len(queries)
+
+        def run(position):
+            query_string, kwargs = queries[position]
+            start = time()
+
+            try:
+                return self._search(query_string, **kwargs)
+            finally:
+                timings[position] = (start, time())
+
+        try:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                return list(executor.map(run, range(len(queries))))
+        finally:
+            for (query_string, kwargs), timing in zip(queries, timings):
+                if timing is not None:
+                    record_query(self, query_string, (), kwargs, *timing)
+
     def build_search_kwargs(
         self,
         query_string,
@@ -932,21 +1117,9 @@ class SolrSearchQuery(BaseSearchQuery):
 
         return search_kwargs
 
-    def run(self, spelling_query=None, **kwargs):
-        """Builds and executes the query. Returns a list of search results."""
-        final_query = self.build_query()
-        search_kwargs = self.build_params(spelling_query, **kwargs)
-
-        if kwargs:
-            search_kwargs.update(kwargs)
-
-        results = self.backend.search(final_query, **search_kwargs)
-
-        self._results = results.get("results", [])
-        self._hit_count = results.get("hits", 0)
-        self._facet_counts = self.post_process_facets(results)
+    def store_results(self, results):
+        super().store_results(results)
         self._stats = results.get("stats", {})
-        self._spelling_suggestion = results.get("spelling_suggestion", None)
 
     def run_mlt(self, **kwargs):
         """Builds and executes the query. Returns a list of search results."""
@@ -15,6 +15,7 @@ from haystack.backends import (
     BaseSearchBackend,
     BaseSearchQuery,
     EmptyResults,
+    invalidates_cache,
     log_query,
 )
 from haystack.constants import (
@@ -112,6 +113,26 @@ class WhooshSearchBackend(BaseSearchBackend):
         if connection_options.get("STORAGE", "file") != "file":
             self.use_file_storage = False
 
+        # Serves searches from an index built elsewhere, sharing the mmapped
+        # segment files between processes & refusing to write to them.
+        self.read_only = connection_options.get("READ_ONLY", False)
+
+        # How ``bulk_session`` writes: the number of processes (& whether each
+        # writes its own segment), the memory each gets & what to merge when
+        # committing.
+        self.bulk_procs = connection_options.get("BULK_PROCS", 1)
+        self.bulk_multisegment = connection_options.get("BULK_MULTISEGMENT", False)
+        self.bulk_limitmb = connection_options.get("BULK_LIMITMB", 128)
+        self.bulk_merge = connection_options.get("BULK_MERGE", True)
+        self.bulk_optimize = connection_options.get("BULK_OPTIMIZE", False)
+        self.bulk_writer = None
+
+        # A searcher kept open between queries, along with the documents
+        # matched by each narrow query as of its generation of the index.
+        self.searcher = None
+        self.narrow_cache = {}
+        self.narrow_cache_size = connection_options.get("NARROW_CACHE_SIZE", 100)
+
         if self.use_file_storage and not self.path:
             raise ImproperlyConfigured(
                 "You must specify a 'PATH' in your settings for connection '%s'."
@@ -128,8 +149,12 @@ class WhooshSearchBackend(BaseSearchBackend):
 
         new_index = False
 
+        # A read-only index has to have been built already & only needs to be
+        # readable, so there's nothing to check or create.
+        check_path = self.use_file_storage and not self.read_only
+
         # Make sure the index is there.
-        if self.use_file_storage and not os.path.exists(self.path):
+        if check_path and not os.path.exists(self.path):
             try:
                 os.makedirs(self.path)
             except Exception:
@@ -139,14 +164,16 @@ class WhooshSearchBackend(BaseSearchBackend):
                 )
             new_index = True
 
-        if self.use_file_storage and not os.access(self.path, os.W_OK):
+        if check_path and not os.access(self.path, os.W_OK):
             raise IOError(
                 "The path to your Whoosh index '%s' is not writable for the current user/group."
                 % self.path
             )
 
         if self.use_file_storage:
-            self.storage = FileStorage(self.path)
+            self.storage = FileStorage(
+                self.path, supports_mmap=True, readonly=self.read_only
+            )
         else:
             global LOCALS
 
@@ -167,8 +194,15 @@ class WhooshSearchBackend(BaseSearchBackend):
             try:
                 self.index = self.storage.open_index(schema=self.schema)
             except index.EmptyIndexError:
+                if self.read_only:
+                    raise IOError(
+                        "There's no Whoosh index at '%s' to open read-only." % self.path
+                    )
+
                 self.index = self.storage.create_index(self.schema)
 
+        # Anything cached belongs to the index (or schema) we just replaced.
+        self.close_searcher()
         self.setup_complete = True
 
     def build_schema(self, fields):
@@ -252,57 +286,146 @@ class WhooshSearchBackend(BaseSearchBackend):
 
         return (content_field_name, Schema(**schema_fields))
 
+    def check_writable(self):
+        """
+        Refuses to go any further if the connection is ``READ_ONLY``.
+        """
+        if self.read_only:
+            raise SearchBackendError(
+                "The Whoosh index for connection '%s' is read-only."
+                % self.connection_alias
+            )
+
     def update(self, index, iterable, commit=True):
+        self.check_writable()
+        self.update_documents(
+            index, self.prepare_documents(index, iterable), commit=commit
+        )
+
+    def prepare_documents(self, index, iterable):
+        docs = []
+
+        objs = list(iterable)
+
+        with index.prerender_templates(objs):
+            for obj in objs:
+                try:
+                    doc = index.full_prepare(obj)
+                except SkipDocument:
+                    self.log.debug("Indexing for object `%s` skipped", obj)
+                else:
+                    # Really make sure it's unicode, because Whoosh won't have it any
+                    # other way.
+                    for key in doc:
+                        doc[key] = self._from_python(doc[key])
+
+                    # Document boosts aren't supported in Whoosh 2.5.0+.
+                    if "boost" in doc:
+                        del doc["boost"]
+
+                    docs.append(doc)
+
+        return docs
+
+    @invalidates_cache
+    def update_documents(self, index, documents, commit=True):
+        self.check_writable()
+
         if not self.setup_complete:
             self.setup()
 
-        self.index = self.index.refresh()
-        writer = AsyncWriter(self.index)
+        writer = self.get_bulk_writer()
 
-        for obj in iterable:
-            try:
-                doc = index.full_prepare(obj)
-            except SkipDocument:
-                self.log.debug("Indexing for object `%s` skipped", obj)
-            else:
-                # Really make sure it's unicode, because Whoosh won't have it any
-                # other way.
-                for key in doc:
-                    doc[key] = self._from_python(doc[key])
+        if writer is None:
+            self.index = self.index.refresh()
+            writer = AsyncWriter(self.index)
 
-                # Document boosts aren't supported in Whoosh 2.5.0+.
-                if "boost" in doc:
-                    del doc["boost"]
+        for doc in documents:
+            try:
+                writer.update_document(**doc)
+            except Exception:
+                if not self.silently_fail:
+                    raise
 
-                try:
-                    writer.update_document(**doc)
-                except Exception:
-                    if not self.silently_fail:
-                        raise
-
-                    # We'll log the object identifier but won't include the actual object
-                    # to avoid the possibility of that generating encoding errors while
-                    # processing the log message:
-                    self.log.exception(
-                        "Preparing object for update",
-                        extra={"data": {"index": index, "object": get_identifier(obj)}},
-                    )
+                # We'll log the document identifier but won't include the actual
+                # document to avoid the possibility of that generating encoding
+                # errors while processing the log message:
+                self.log.exception(
+                    "Preparing object for update",
+                    extra={"data": {"index": index, "object": doc.get(ID)}},
+                )
 
-        if len(iterable) > 0:
+        if writer is not self.bulk_writer and len(documents) > 0:
             # For now, commit no matter what, as we run into locking issues otherwise.
             writer.commit()
             if writer.ident is not None:
                 writer.join()
 
+    def get_bulk_writer(self):
+        """
+        Returns the writer shared by everything in the ``bulk_session``, or
+        ``None`` outside of one.
+
+        It's only opened by the first write, as it holds the index lock until
+        the session ends & other processes (like ``update_index --workers``)
+        may be doing the writing.
+        """
+        if not self.bulk_sessions:
+            return None
+
+        if self.bulk_writer is None:
+            self.index = self.index.refresh()
+            writer_kwargs = {"limitmb": self.bulk_limitmb}
+
+            # Worker processes can't get at an in-memory index.
+            if self.bulk_procs > 1 and self.use_file_storage:
+                writer_kwargs["procs"] = self.bulk_procs
+                writer_kwargs["multisegment"] = self.bulk_multisegment
+
+            self.bulk_writer = self.index.writer(**writer_kwargs)
+
+        return self.bulk_writer
+
+    def end_bulk_session(self, commit=True):
+        writer, self.bulk_writer = self.bulk_writer, None
+
+        if writer is None:
+            return
+
+        # As with ``update``, commit no matter what. Whoosh would otherwise
+        # throw away everything written during the session.
+        try:
+            writer.commit(merge=self.bulk_merge, optimize=self.bulk_optimize)
+        except Exception:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception("Failed to commit the bulk session to Whoosh")
+
+        self.index = self.index.refresh()
+
+    def parallel_update(self, index, iterable, commit=True, **kwargs):
+        # Whoosh only allows one writer at a time, so there's nothing to
+        # parallelize.
+        self.update(index, iterable, commit=commit)
+
+    @invalidates_cache
     def remove(self, obj_or_string, commit=True):
+        self.check_writable()
+
         if not self.setup_complete:
             self.setup()
 
-        self.index = self.index.refresh()
         whoosh_id = get_identifier(obj_or_string)
 
         try:
-            self.index.delete_by_query(q=self.parser.parse('%s:"%s"' % (ID, whoosh_id)))
+            if self.bulk_sessions:
+                self.get_bulk_writer().delete_by_term(ID, whoosh_id)
+            else:
+                self.index = self.index.refresh()
+                self.index.delete_by_query(
+                    q=self.parser.parse('%s:"%s"' % (ID, whoosh_id))
+                )
         except Exception:
             if not self.silently_fail:
                 raise
@@ -312,7 +435,44 @@ class WhooshSearchBackend(BaseSearchBackend):
                 whoosh_id,
             )
 
+    @invalidates_cache
+    def remove_many(self, objs_or_strings, commit=True):
+        self.check_writable()
+
+        whoosh_ids = [
+            get_identifier(obj_or_string) for obj_or_string in objs_or_strings
+        ]
+
+        if not whoosh_ids:
+            return
+
+        if not self.setup_complete:
+            self.setup()
+
+        writer = self.get_bulk_writer()
+
+        if writer is None:
+            self.index = self.index.refresh()
+            writer = AsyncWriter(self.index)
+
+        try:
+            for whoosh_id in whoosh_ids:
+                writer.delete_by_term(ID, whoosh_id)
+
+            if writer is not self.bulk_writer:
+                writer.commit()
+        except Exception:
+            if not self.silently_fail:
+                raise
+
+            self.log.exception(
+                "Failed to remove %d documents from Whoosh", len(whoosh_ids)
+            )
+
+    @invalidates_cache
     def clear(self, models=None, commit=True):
+        self.check_writable()
+
         if not self.setup_complete:
             self.setup()
 
@@ -330,7 +490,7 @@ class WhooshSearchBackend(BaseSearchBackend):
                 for model in models:
                     models_to_delete.append("%s:%s" % (DJANGO_CT, get_model_ct(model)))
 
-                self.index.delete_by_query(
+                (self.get_bulk_writer() or self.index).delete_by_query(
                     q=self.parser.parse(" OR ".join(models_to_delete))
                 )
         except Exception:
@@ -346,6 +506,19 @@ class WhooshSearchBackend(BaseSearchBackend):
                 self.log.exception("Failed to clear Whoosh index")
 
     def delete_index(self):
+        self.check_writable()
+
+        # The searcher's reader still has the segment files open.
+        self.close_searcher()
+
+        # A bulk session's writer holds the index lock & what it has written
+        # so far would be wiped out anyway. The session carries on with a new
+        # writer.
+        writer, self.bulk_writer = self.bulk_writer, None
+
+        if writer is not None:
+            writer.cancel()
+
         # Per the Whoosh mailing list, if wiping out everything from the index,
         # it's much more efficient to simply delete the index files.
         if self.use_file_storage and os.path.exists(self.path):
@@ -357,6 +530,8 @@ class WhooshSearchBackend(BaseSearchBackend):
         self.setup()
 
     def optimize(self):
+        self.check_writable()
+
         if not self.setup_complete:
             self.setup()
 
@@ -387,42 +562,86 @@ class WhooshSearchBackend(BaseSearchBackend):
         page_num += 1
         return page_num, page_length
 
-    @log_query
-    def search(
-        self,
-        query_string,
-        sort_by=None,
-        start_offset=0,
-        end_offset=None,
-        fields="",
-        highlight=False,
-        facets=None,
-        date_facets=None,
-        query_facets=None,
-        narrow_queries=None,
-        spelling_query=None,
-        within=None,
-        dwithin=None,
-        distance_point=None,
-        models=None,
-        limit_to_registered_models=None,
-        result_class=None,
-        **kwargs,
-    ):
+    def scan_ids(self, model, batch_size=None):
         if not self.setup_complete:
             self.setup()
 
-        # A zero length query should return no results.
-        if len(query_string) == 0:
-            return {"results": [], "hits": 0}
+        batch_size = batch_size or self.batch_size
+        self.index = self.index.refresh()
+        batch = []
 
-        query_string = force_str(query_string)
+        with self.index.searcher() as searcher:
+            for fields in searcher.documents(**{DJANGO_CT: get_model_ct(model)}):
+                batch.append((fields[DJANGO_ID], fields[ID]))
 
-        # A one-character query (non-wildcard) gets nabbed by a stopwords
-        # filter and should yield zero results.
-        if len(query_string) <= 1 and query_string != "*":
-            return {"results": [], "hits": 0}
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def get_searcher(self):
+        """
+        Returns a searcher that's reused between queries & only refreshed once
+        the index has moved on to a new generation.
+        """
+        if self.searcher is None:
+            self.index = self.index.refresh()
+            self.searcher = self.index.searcher()
+        elif not self.searcher.up_to_date():
+            self.searcher = self.searcher.refresh()
+            self.narrow_cache = {}
+
+        return self.searcher
+
+    def close_searcher(self):
+        """
+        Closes the searcher ``get_searcher`` keeps (& the reader it has open),
+        dropping the narrows matched with it.
+        """
+        if self.searcher is not None:
+            self.searcher.close()
+            self.searcher = None
+
+        self.narrow_cache = {}
+
+    def narrow(self, searcher, narrow_queries):
+        """
+        Returns the set of document numbers matched by all of the
+        ``narrow_queries``.
+
+        The matches for each query are cached by the query string & the
+        generation of the index, since the same narrows (like the one limiting
+        results to the registered models) come up on almost every search.
+        """
+        generation = searcher.reader().generation()
+        narrowed_docs = None
+
+        for nq in narrow_queries:
+            key = (generation, force_str(nq))
+            docs = self.narrow_cache.get(key)
+
+            if docs is None:
+                docs = set(searcher.docs_for_query(self.parser.parse(force_str(nq))))
+
+                if len(self.narrow_cache) >= self.narrow_cache_size:
+                    del self.narrow_cache[next(iter(self.narrow_cache))]
+
+                self.narrow_cache[key] = docs
 
+            if narrowed_docs is None:
+                narrowed_docs = docs
+            else:
+                narrowed_docs = narrowed_docs & docs
+
+        return narrowed_docs
+
+    def build_sort(self, sort_by):
+        """
+        Returns the fields to sort by & whether to reverse the order, as
+        Whoosh takes them.
+        """
         reverse = False
 
         if sort_by is not None:
@@ -456,6 +675,84 @@ class WhooshSearchBackend(BaseSearchBackend):
 
             sort_by = sort_by_list
 
+        return sort_by, reverse
+
+    def build_narrow(
+        self,
+        searcher,
+        narrow_queries=None,
+        models=None,
+        limit_to_registered_models=None,
+    ):
+        """
+        Returns the document numbers the results are narrowed to (by the
+        ``narrow_queries`` & the models), or ``None`` if they aren't.
+        """
+        if limit_to_registered_models is None:
+            limit_to_registered_models = getattr(
+                settings, "HAYSTACK_LIMIT_TO_REGISTERED_MODELS", True
+            )
+
+        if models and len(models):
+            model_choices = sorted(get_model_ct(model) for model in models)
+        elif limit_to_registered_models:
+            # Using narrow queries, limit the results to only models handled
+            # with the current routers.
+            model_choices = self.build_models_list()
+        else:
+            model_choices = []
+
+        if len(model_choices) > 0:
+            if narrow_queries is None:
+                narrow_queries = set()
+
+            narrow_queries.add(
+                " OR ".join(["%s:%s" % (DJANGO_CT, rm) for rm in model_choices])
+            )
+
+        if narrow_queries is not None:
+            return self.narrow(searcher, narrow_queries)
+
+        return None
+
+    @log_query
+    def search(
+        self,
+        query_string,
+        sort_by=None,
+        start_offset=0,
+        end_offset=None,
+        fields="",
+        highlight=False,
+        facets=None,
+        date_facets=None,
+        query_facets=None,
+        narrow_queries=None,
+        spelling_query=None,
+        within=None,
+        dwithin=None,
+        distance_point=None,
+        models=None,
+        limit_to_registered_models=None,
+        result_class=None,
+        **kwargs,
+    ):
+        if not self.setup_complete:
+            self.setup()
+
+        # A zero length query should return no results.
+        if len(query_string) == 0:
+            return {"results": [], "hits": 0}
+
+        query_string = force_str(query_string)
+
+        # A one-character query (non-wildcard) gets nabbed by a stopwords
+        # filter and should yield zero results.
+        if len(query_string) <= 1 and query_string != "*":
+            return {"results": [], "hits": 0}
+
+        sort_by, reverse = self.build_sort(sort_by)
+
         group_by = []
         facet_types = {}
         if facets is not None:
@@ -487,54 +784,15 @@ class WhooshSearchBackend(BaseSearchBackend):
                 "Whoosh does not handle query faceting.", Warning, stacklevel=2
             )
 
-        narrowed_results = None
-        self.index = self.index.refresh()
-
-        if limit_to_registered_models is None:
-            limit_to_registered_models = getattr(
-                settings, "HAYSTACK_LIMIT_TO_REGISTERED_MODELS", True
-            )
-
-        if models and len(models):
-            model_choices = sorted(get_model_ct(model) for model in models)
-        elif limit_to_registered_models:
-            # Using narrow queries, limit the results to only models handled
-            # with the current routers.
-            model_choices = self.build_models_list()
-        else:
-            model_choices = []
-
-        if len(model_choices) > 0:
-            if narrow_queries is None:
-                narrow_queries = set()
-
-            narrow_queries.add(
-                " OR ".join(["%s:%s" % (DJANGO_CT, rm) for rm in model_choices])
-            )
-
-        narrow_searcher = None
-
-        if narrow_queries is not None:
-            # Potentially expensive? I don't see another way to do it in Whoosh...
-            narrow_searcher = self.index.searcher()
-
-            for nq in narrow_queries:
-                recent_narrowed_results = narrow_searcher.search(
-                    self.parser.parse(force_str(nq)), limit=None
-                )
-
-                if len(recent_narrowed_results) <= 0:
-                    return {"results": [], "hits": 0}
-
-                if narrowed_results is not None:
-                    narrowed_results.filter(recent_narrowed_results)
-                else:
-                    narrowed_results = recent_narrowed_results
+        searcher = self.get_searcher()
+        narrowed_results = self.build_narrow(
+            searcher, narrow_queries, models, limit_to_registered_models
+        )
 
-        self.index = self.index.refresh()
+        if narrowed_results is not None and not narrowed_results:
+            return {"results": [], "hits": 0}
 
-        if self.index.doc_count():
-            searcher = self.index.searcher()
+        if searcher.doc_count():
             parsed_query = self.parser.parse(query_string)
 
             # In the event of an invalid/stopworded query, recover gracefully.
@@ -575,10 +833,6 @@ class WhooshSearchBackend(BaseSearchBackend):
                 result_class=result_class,
                 facet_types=facet_types,
             )
-            searcher.close()
-
-            if hasattr(narrow_searcher, "close"):
-                narrow_searcher.close()
 
             return results
         else:
@@ -598,6 +852,114 @@ class WhooshSearchBackend(BaseSearchBackend):
                 "spelling_suggestion": spelling_suggestion,
             }
 
+    def stream(
+        self,
+        query_string,
+        batch_size=None,
+        sort_by=None,
+        highlight=False,
+        narrow_queries=None,
+        models=None,
+        limit_to_registered_models=None,
+        result_class=None,
+        **kwargs,
+    ):
+        if not self.setup_complete:
+            self.setup()
+
+        query_string = force_str(query_string)
+
+        if len(query_string) == 0 or (len(query_string) <= 1 and query_string != "*"):
+            return
+
+        batch_size = batch_size or self.batch_size
+        sort_by, reverse = self.build_sort(sort_by)
+        searcher = self.get_searcher()
+        narrowed_results = self.build_narrow(
+            searcher, narrow_queries, models, limit_to_registered_models
+        )
+
+        if narrowed_results is not None and not narrowed_results:
+            return
+
+        if not searcher.doc_count():
+            return
+
+        parsed_query = self.parser.parse(query_string)
+
+        if parsed_query is None:
+            return
+
+        # A single search ranks every match, keeping only their document
+        # numbers & scores. Their stored fields are read a batch at a time.
+        raw_results = searcher.search(
+            parsed_query,
+            limit=None,
+            sortedby=sort_by,
+            reverse=reverse,
+            filter=narrowed_results,
+        )
+
+        for offset in range(0, len(raw_results), batch_size):
+            raw_page = ResultsPage(raw_results, offset // batch_size + 1, batch_size)
+            yield self._process_results(
+                raw_page,
+                highlight=highlight,
+                query_string=query_string,
+                result_class=result_class,
+            )["results"]
+
+    @log_query
+    def count(
+        self,
+        query_string,
+        narrow_queries=None,
+        models=None,
+        limit_to_registered_models=None,
+        **kwargs,
+    ):
+        if not self.setup_complete:
+            self.setup()
+
+        query_string = force_str(query_string)
+
+        if len(query_string) == 0 or (len(query_string) <= 1 and query_string != "*"):
+            return 0
+
+        searcher = self.get_searcher()
+        narrowed_results = self.build_narrow(
+            searcher, narrow_queries, models, limit_to_registered_models
+        )
+
+        if narrowed_results is not None and not narrowed_results:
+            return 0
+
+        if query_string == "*" and narrowed_results is None:
+            # Everything matches, which the reader already knows.
+            return searcher.doc_count()
+
+        if not searcher.doc_count():
+            return 0
+
+        parsed_query = self.parser.parse(query_string)
+
+        if parsed_query is None:
+            return 0
+
+        # The collector counts every match while only ranking the first, & no
+        # stored fields get read.
+        try:
+            raw_results = searcher.search(
+                parsed_query, limit=1, filter=narrowed_results
+            )
+        except ValueError:
+            if not self.silently_fail:
+                raise
+
+            return 0
+
+        return len(raw_results)
+
     def more_like_this(
         self,
         model_instance,
@@ -615,7 +977,7 @@ class WhooshSearchBackend(BaseSearchBackend):
         field_name = self.content_field_name
         narrow_queries = set()
         narrowed_results = None
-        self.index = self.index.refresh()
+        searcher = self.get_searcher()
 
         if limit_to_registered_models is None:
             limit_to_registered_models = getattr(
@@ -642,43 +1004,25 @@ class WhooshSearchBackend(BaseSearchBackend):
         if additional_query_string and additional_query_string != "*":
             narrow_queries.add(additional_query_string)
 
-        narrow_searcher = None
-
-        if narrow_queries is not None:
-            # Potentially expensive? I don't see another way to do it in Whoosh...
-            narrow_searcher = self.index.searcher()
-
-            for nq in narrow_queries:
-                recent_narrowed_results = narrow_searcher.search(
-                    self.parser.parse(force_str(nq)), limit=None
-                )
+        if narrow_queries:
+            narrowed_results = self.narrow(searcher, narrow_queries)
 
-                if len(recent_narrowed_results) <= 0:
-                    return {"results": [], "hits": 0}
-
-                if narrowed_results:
-                    narrowed_results.filter(recent_narrowed_results)
-                else:
-                    narrowed_results = recent_narrowed_results
+            if not narrowed_results:
+                return {"results": [], "hits": 0}
 
         page_num, page_length = self.calculate_page(start_offset, end_offset)
-
-        self.index = self.index.refresh()
         raw_results = EmptyResults()
 
-        searcher = None
-        if self.index.doc_count():
+        if searcher.doc_count():
             query = "%s:%s" % (ID, get_identifier(model_instance))
-            searcher = self.index.searcher()
             parsed_query = self.parser.parse(query)
             results = searcher.search(parsed_query)
 
-            if len(results):
-                raw_results = results[0].more_like_this(field_name, top=end_offset)
-
             # Handle the case where the results have been narrowed.
-            if narrowed_results is not None and hasattr(raw_results, "filter"):
-                raw_results.filter(narrowed_results)
+            if len(results):
+                raw_results = results[0].more_like_this(
+                    field_name, top=end_offset, filter=narrowed_results
+                )
 
         try:
             raw_page = ResultsPage(raw_results, page_num, page_length)
@@ -695,12 +1039,6 @@ class WhooshSearchBackend(BaseSearchBackend):
 
         results = self._process_results(raw_page, result_class=result_class)
 
-        if searcher:
-            searcher.close()
-
-        if hasattr(narrow_searcher, "close"):
-            narrow_searcher.close()
-
         return results
 
     def _process_results(
@@ -829,7 +1167,7 @@ class WhooshSearchBackend(BaseSearchBackend):
 
     def create_spelling_suggestion(self, query_string):
         spelling_suggestion = None
-        reader = self.index.reader()
+        reader = self.get_searcher().reader()
         corrector = reader.corrector(self.content_field_name)
         cleaned_query = force_str(query_string)
 
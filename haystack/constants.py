@@ -46,6 +46,11 @@ REPR_OUTPUT_SIZE = 20
 # Number of SearchResults to load at a time.
 ITERATOR_LOAD_PER_QUERY = getattr(settings, "HAYSTACK_ITERATOR_LOAD_PER_QUERY", 10)
 
+# The most SearchResults to load at a time, as the number grows while iterating.
+ITERATOR_MAX_LOAD_PER_QUERY = getattr(
+    settings, "HAYSTACK_ITERATOR_MAX_LOAD_PER_QUERY", 1000
+)
+
 
 # A marker class in the hierarchy to indicate that it handles search data.
 class Indexable:
@@ -1,17 +1,42 @@
 import datetime
 import re
+import threading
 from inspect import ismethod
 
-from django.template import loader
+from django.conf import settings
+from django.template import Context, loader
+from django.template.backends.django import Template as DjangoTemplate
 
 from haystack.exceptions import SearchFieldError
-from haystack.utils import get_model_ct_tuple
+from haystack.utils import get_identifier, get_model_ct_tuple
 
 
 class NOT_PROVIDED:
     pass
 
 
+class RenderedTemplates(threading.local):
+    """
+    The templates ``SearchIndex.prerender_templates`` rendered ahead of time,
+    keyed on the field & the identifier of the object. Fields are shared by
+    every thread, so each thread gets its own.
+    """
+
+    def __init__(self):
+        self.rendered = {}
+
+    @staticmethod
+    def get_key(field, obj):
+        # Unsaved objects can't be told apart, so they're never prerendered.
+        if getattr(obj, "pk", None) is None:
+            return None
+
+        return (field, get_identifier(obj))
+
+
+rendered_templates = RenderedTemplates()
+
+
 # Note that dates in the full ISO 8601 format will be accepted as long as the hour/minute/second components
 # are zeroed for compatibility with search backends which lack a date time distinct from datetime:
 DATE_REGEX = re.compile(
@@ -62,6 +87,8 @@ class SearchField:
         self.boost = weight or boost
         self.analyzer = analyzer
         self.is_multivalued = False
+        self._model_attr_lookups = (None, None)
+        self._template_cache = {}
 
         # We supply the facet_class for making it easy to create a faceted
         # field based off of this field.
@@ -162,7 +189,15 @@ class SearchField:
 
     def split_model_attr_lookups(self):
         """Returns list of nested attributes for looking through the relation."""
-        return self.model_attr.split("__")
+        model_attr, lookups = self._model_attr_lookups
+
+        # ``model_attr`` can be changed after the fact, so the split is only
+        # reused while it's still the same.
+        if lookups is None or model_attr != self.model_attr:
+            lookups = self.model_attr.split("__")
+            self._model_attr_lookups = (self.model_attr, lookups)
+
+        return lookups
 
     @classmethod
     def get_iterable_objects(cls, current_objects):
@@ -193,6 +228,54 @@ class SearchField:
         returns the result of rendering that template. ``object`` will be in
         its context.
         """
+        # Rendered ahead of time by ``SearchIndex.prerender_templates``.
+        key = rendered_templates.get_key(self, obj)
+
+        if key is not None:
+            rendered = rendered_templates.rendered.get(key)
+
+            if rendered is not None:
+                return rendered
+
+        return self.get_template(obj).render({"object": obj})
+
+    def prepare_template_batch(self, objs):
+        """
+        Flattens a collection of objects for indexing, returning the rendered
+        templates in the same order.
+
+        Django templates are all rendered with the same context, which only
+        has ``object`` swapped out between objects.
+        """
+        rendered = []
+        contexts = {}
+
+        for obj in objs:
+            template = self.get_template(obj)
+
+            if not isinstance(template, DjangoTemplate):
+                rendered.append(template.render({"object": obj}))
+                continue
+
+            context = contexts.get(template.backend)
+
+            if context is None:
+                context = contexts[template.backend] = Context(
+                    autoescape=template.backend.engine.autoescape
+                )
+
+            with context.push(object=obj):
+                rendered.append(template.template.render(context))
+
+        return rendered
+
+    def get_template(self, obj):
+        """
+        Returns the template to render for ``obj``.
+
+        Templates are only looked up once per list of template names, unless
+        ``DEBUG`` is on (so changes to them show up).
+        """
         if self.instance_name is None and self.template_name is None:
             raise SearchFieldError(
                 "This field requires either its instance_name variable to be populated or an explicit template_name in order to load the correct template."
@@ -210,8 +293,18 @@ class SearchField:
                 % (app_label, model_name, self.instance_name)
             ]
 
-        t = loader.select_template(template_names)
-        return t.render({"object": obj})
+        if settings.DEBUG:
+            return loader.select_template(template_names)
+
+        cache_key = tuple(template_names)
+        template = self._template_cache.get(cache_key)
+
+        if template is None:
+            template = self._template_cache[cache_key] = loader.select_template(
+                template_names
+            )
+
+        return template
 
     def convert(self, value):
         """
@@ -1,7 +1,9 @@
 import copy
 import threading
 import warnings
+from contextlib import contextmanager
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.encoding import force_str
 
@@ -27,10 +29,34 @@ from haystack.fields import (  # NOQA — exposed as a public export
     SearchField,
     SearchFieldError,
 )
+from haystack.fields import rendered_templates
 from haystack.manager import SearchIndexManager
 from haystack.utils import get_facet_field_name, get_identifier, get_model_ct
 
 
+def get_relation(model, attr):
+    """
+    Returns the relation that ``attr`` follows on instances of ``model``, or
+    ``None`` if it isn't one.
+
+    Reverse relations are matched on the accessor name (i.e. ``book_set``),
+    since that's what ``model_attr`` looks up.
+    """
+    for field in model._meta.get_fields():
+        if not field.is_relation:
+            continue
+
+        if field.auto_created and not field.concrete:
+            name = field.get_accessor_name()
+        else:
+            name = field.name
+
+        if name == attr:
+            return field
+
+    return None
+
+
 class DeclarativeMetaclass(type):
     def __new__(cls, name, bases, attrs):
         attrs["fields"] = {}
@@ -116,6 +142,7 @@ class SearchIndex(threading.local, metaclass=DeclarativeMetaclass):
 
     def __init__(self):
         self.prepared_data = None
+        self._prepare_plan = None
         content_fields = []
 
         self.field_map = {}
@@ -206,61 +233,226 @@ class SearchIndex(threading.local, metaclass=DeclarativeMetaclass):
                 % self
             )
 
-        # `.select_related()` seems like a good idea here but can fail on
+        # Following relations is opt-in, as `.select_related()` can fail on
         # nullable `ForeignKey` as well as what seems like other cases.
+        if getattr(settings, "HAYSTACK_OPTIMIZE_QUERYSETS", False):
+            select_related, prefetch_related, _ = self.get_related_lookups()
+
+            if select_related:
+                index_qs = index_qs.select_related(*select_related)
+
+            if prefetch_related:
+                index_qs = index_qs.prefetch_related(*prefetch_related)
+
         return index_qs.filter(**extra_lookup_kwargs).order_by(model._meta.pk.name)
 
+    def get_related_lookups(self):
+        """
+        Works out which relations the fields' ``model_attr`` lookups follow,
+        so they can be loaded alongside the objects being indexed.
+
+        Returns a tuple of the ``select_related`` lookups, the
+        ``prefetch_related`` lookups & a dictionary of the field names that
+        couldn't be worked out, along with the reason why.
+        """
+        select_related = []
+        prefetch_related = []
+        unoptimized = {}
+
+        for field_name, field in self.fields.items():
+            if hasattr(self, "prepare_%s" % field_name):
+                unoptimized[field_name] = "prepared by 'prepare_%s'" % field_name
+                continue
+
+            if field.use_template:
+                unoptimized[field_name] = "rendered from a template"
+                continue
+
+            if field.model_attr is None:
+                continue
+
+            model = self.get_model()
+            path = []
+            single_valued = True
+            attrs = field.split_model_attr_lookups()
+
+            for position, attr in enumerate(attrs):
+                relation = get_relation(model, attr)
+
+                if relation is None:
+                    # The last attribute is usually a plain column, but
+                    # anything else (a property, a method...) hides what it
+                    # loads from us.
+                    if position < len(attrs) - 1:
+                        unoptimized[field_name] = "'%s' isn't a relation on '%s'" % (
+                            attr,
+                            model._meta.label,
+                        )
+                    break
+
+                # A to-many relation at the end of the lookup isn't followed
+                # any further, so there's nothing to load for it.
+                if position == len(attrs) - 1 and (
+                    relation.many_to_many or relation.one_to_many
+                ):
+                    break
+
+                path.append(attr)
+
+                if relation.related_model is None or not (
+                    relation.many_to_one or relation.one_to_one
+                ):
+                    # Generic foreign keys & to-many relations can only be
+                    # prefetched.
+                    single_valued = False
+
+                model = relation.related_model
+
+                if model is None:
+                    break
+
+            if not path:
+                continue
+
+            lookup = "__".join(path)
+
+            if single_valued:
+                select_related.append(lookup)
+            else:
+                prefetch_related.append(lookup)
+
+        return (
+            sorted(set(select_related)),
+            sorted(set(prefetch_related)),
+            unoptimized,
+        )
+
+    def _get_prepare_plan(self):
+        """
+        Works out, once per index, what ``prepare`` & ``full_prepare`` need to
+        do for each field, so indexing an object doesn't have to look up the
+        ``prepare_FOO`` methods & facet sources all over again.
+        """
+        plan = getattr(self, "_prepare_plan", None)
+
+        if plan is None:
+            field_steps = []
+            cleanup_steps = []
+
+            for field_name, field in self.fields.items():
+                field_steps.append(
+                    (
+                        field.index_fieldname,
+                        field.prepare,
+                        getattr(self, "prepare_%s" % field_name, None),
+                    )
+                )
+
+                facet_for = getattr(field, "facet_for", None)
+                source_fieldname = None
+
+                if facet_for:
+                    source_fieldname = self.fields[facet_for].index_fieldname
+
+                cleanup_steps.append(
+                    (
+                        field_name,
+                        field.index_fieldname,
+                        source_fieldname,
+                        field.null is True,
+                        field.field_type == "string" and facet_for in self.fields,
+                    )
+                )
+
+            plan = self._prepare_plan = (
+                get_model_ct(self.get_model()),
+                field_steps,
+                cleanup_steps,
+            )
+
+        return plan
+
     def prepare(self, obj):
         """
         Fetches and adds/alters data before indexing.
         """
-        self.prepared_data = {
+        model_ct, field_steps, _ = self._get_prepare_plan()
+        self.prepared_data = prepared_data = {
             ID: get_identifier(obj),
-            DJANGO_CT: get_model_ct(self.get_model()),
+            DJANGO_CT: model_ct,
             DJANGO_ID: force_str(obj.pk),
         }
 
-        for field_name, field in self.fields.items():
+        for index_fieldname, prepare_field, prepare_method in field_steps:
             # Use the possibly overridden name, which will default to the
             # variable name of the field.
-            self.prepared_data[field.index_fieldname] = field.prepare(obj)
+            prepared_data[index_fieldname] = prepare_field(obj)
 
-            if hasattr(self, "prepare_%s" % field_name):
-                value = getattr(self, "prepare_%s" % field_name)(obj)
-                self.prepared_data[field.index_fieldname] = value
+            if prepare_method is not None:
+                prepared_data[index_fieldname] = prepare_method(obj)
 
         return self.prepared_data
 
     def full_prepare(self, obj, with_string_facet=True):
-        self.prepared_data = self.prepare(obj)
-
-        for field_name, field in self.fields.items():
-            # Duplicate data for faceted fields.
-            if (
-                not with_string_facet
-                and field.field_type == "string"
-                and getattr(field, "facet_for", None) in self.fields
-            ):
+        self.prepared_data = prepared_data = self.prepare(obj)
+        _, _, cleanup_steps = self._get_prepare_plan()
+
+        for (
+            field_name,
+            index_fieldname,
+            source_fieldname,
+            null,
+            is_string_facet,
+        ) in cleanup_steps:
+            if not with_string_facet and is_string_facet:
                 continue
-            if getattr(field, "facet_for", None):
-                source_field_name = self.fields[field.facet_for].index_fieldname
 
+            # Duplicate data for faceted fields.
+            if source_fieldname is not None:
                 # If there's data there, leave it alone. Otherwise, populate it
                 # with whatever the related field has.
                 if (
-                    self.prepared_data[field_name] is None
-                    and source_field_name in self.prepared_data
+                    prepared_data[field_name] is None
+                    and source_fieldname in prepared_data
                 ):
-                    self.prepared_data[field.index_fieldname] = self.prepared_data[
-                        source_field_name
-                    ]
+                    prepared_data[index_fieldname] = prepared_data[source_fieldname]
 
             # Remove any fields that lack a value and are ``null=True``.
-            if field.null is True:
-                if self.prepared_data[field.index_fieldname] is None:
-                    del self.prepared_data[field.index_fieldname]
+            if null and prepared_data[index_fieldname] is None:
+                del prepared_data[index_fieldname]
 
-        return self.prepared_data
+        return prepared_data
+
+    @contextmanager
+    def prerender_templates(self, objs):
+        """
+        Renders the templates of the ``use_template`` fields for a whole batch
+        of objects up front, which ``full_prepare`` then picks up.
+        """
+        fields = [field for field in self.fields.values() if field.use_template]
+        rendered_for_thread = rendered_templates.rendered
+        keys = []
+
+        try:
+            for field in fields:
+                try:
+                    batch = field.prepare_template_batch(objs)
+                except Exception:
+                    # Leave it to ``full_prepare``, so the error is raised for
+                    # the object that caused it & backends can handle it there.
+                    continue
+
+                for obj, rendered in zip(objs, batch):
+                    key = rendered_templates.get_key(field, obj)
+
+                    if key is not None:
+                        rendered_for_thread[key] = rendered
+                        keys.append(key)
+
+            yield
+        finally:
+            for key in keys:
+                rendered_for_thread.pop(key, None)
 
     def get_content_field(self):
         """Returns the field that supplies the primary document to be indexed."""
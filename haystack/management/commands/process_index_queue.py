@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand
+
+from haystack import connections
+from haystack.queues import get_queue
+from haystack.signals import index_changes
+from haystack.utils import log as logging
+from haystack.utils.app_loading import haystack_get_model
+
+DEFAULT_BATCH_SIZE = 1000
+
+LOG = logging.getLogger("haystack")
+
+
+class Command(BaseCommand):
+    help = "Applies the changes recorded by the QueuedSignalProcessor to the search index."  # noqa A003
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            dest="batchsize",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of queued changes to process at once.",
+        )
+
+    def handle(self, **options):
+        self.verbosity = int(options.get("verbosity", 1))
+        self.batchsize = options.get("batchsize") or DEFAULT_BATCH_SIZE
+        queue = get_queue()
+        processed = 0
+
+        while True:
+            items = queue.peek(self.batchsize)
+
+            if not items:
+                break
+
+            # Only the latest change to each object matters.
+            changes = {}
+
+            for _, (action, model_ct, pk, identifier, using) in items:
+                try:
+                    model = haystack_get_model(*model_ct.split("."))
+                except LookupError:
+                    model = None
+
+                if model is None:
+                    # The model has been removed or renamed since. The change
+                    # is still dropped from the queue, so it isn't retried.
+                    LOG.warning(
+                        "Skipping the queued %s of '%s': no model '%s'.",
+                        action,
+                        identifier,
+                        model_ct,
+                    )
+                    continue
+
+                pk = model._meta.pk.to_python(pk)
+                changes[(using, model, pk)] = (action, identifier)
+
+            index_changes(
+                connections,
+                [
+                    (using, model, pk, action, identifier)
+                    for (using, model, pk), (action, identifier) in changes.items()
+                ],
+            )
+
+            queue.delete(item_id for item_id, _ in items)
+            processed += len(items)
+
+            if self.verbosity >= 2:
+                self.stdout.write(
+                    "  indexed %d changes to %d objects." % (len(items), len(changes))
+                )
+
+        if self.verbosity >= 1:
+            self.stdout.write("Processed %d queued changes." % processed)
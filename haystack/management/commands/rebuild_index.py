@@ -1,5 +1,9 @@
+from contextlib import ExitStack
+
 from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from haystack import connections
 
 from .update_index import DEFAULT_MAX_RETRIES
 
@@ -53,13 +57,65 @@ class Command(BaseCommand):
             default=DEFAULT_MAX_RETRIES,
             help="Maximum number of attempts to write to the backend when an error occurs.",
         )
+        parser.add_argument(
+            "-p",
+            "--pipeline",
+            action="store_true",
+            default=False,
+            help="Overlap fetching, preparing and sending batches in separate threads.",
+        )
+        parser.add_argument(
+            "--prepare-workers",
+            dest="prepare_workers",
+            type=int,
+            default=0,
+            help="Prepare documents in this many processes, fed with the "
+            "objects fetched by this one. Implies --pipeline.",
+        )
+        parser.add_argument(
+            "--swap",
+            action="store_true",
+            default=False,
+            help="Build a new index next to the live one & swap it in once "
+            "complete, instead of clearing the live index first.",
+        )
 
     def handle(self, **options):
         clear_options = options.copy()
         update_options = options.copy()
-        for key in ("batchsize", "workers", "max_retries"):
+        for key in (
+            "batchsize",
+            "workers",
+            "max_retries",
+            "pipeline",
+            "prepare_workers",
+            "swap",
+        ):
             del clear_options[key]
-        for key in ("interactive",):
+        for key in ("interactive", "swap"):
             del update_options[key]
-        call_command("clear_index", **clear_options)
-        call_command("update_index", **update_options)
+
+        if options.get("swap"):
+            self.swap(update_options)
+        else:
+            call_command("clear_index", **clear_options)
+            call_command("update_index", **update_options)
+
+    def swap(self, update_options):
+        if update_options.get("workers"):
+            raise CommandError("The swap and workers options are mutually exclusive")
+
+        using = update_options.get("using") or connections.connections_info.keys()
+        backends = [connections[alias].get_backend() for alias in using]
+
+        for alias, backend in zip(using, backends):
+            if not hasattr(backend, "swap_index"):
+                raise CommandError(
+                    "The '%s' connection doesn't support swapping indexes." % alias
+                )
+
+        with ExitStack() as stack:
+            for backend in backends:
+                stack.enter_context(backend.swap_index())
+
+            call_command("update_index", **update_options)
@@ -1,44 +1,39 @@
+import bisect
+import collections
+import json
 import logging
 import multiprocessing
 import os
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import timedelta
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.db import close_old_connections, reset_queries
-from django.utils.encoding import force_str, smart_bytes
+from django.utils.encoding import force_str
 from django.utils.timezone import now
 
 from haystack import connections as haystack_connections
 from haystack.exceptions import NotHandled
-from haystack.query import SearchQuerySet
 from haystack.utils.app_loading import haystack_get_models, haystack_load_apps
 
 DEFAULT_BATCH_SIZE = None
 DEFAULT_AGE = None
 DEFAULT_MAX_RETRIES = 5
+DEFAULT_PIPELINE_DEPTH = 2
+DEFAULT_JOURNAL = "update_index.journal"
 
 LOG = multiprocessing.log_to_stderr(level=logging.WARNING)
 
 
-def update_worker(args):
-    if len(args) != 10:
-        LOG.error("update_worker received incorrect arguments: %r", args)
-        raise ValueError("update_worker received incorrect arguments")
-
-    (
-        model,
-        start,
-        end,
-        total,
-        using,
-        start_date,
-        end_date,
-        verbosity,
-        commit,
-        max_retries,
-    ) = args
-
+def reset_db_connections():
+    """
+    Drops the database connections inherited from the parent process.
+    """
     # FIXME: confirm that this is still relevant with modern versions of Django:
     # We need to reset the connections, otherwise the different processes
     # will try to share the connection, which causes things to blow up.
@@ -57,6 +52,47 @@ def update_worker(args):
             except KeyError:
                 pass
 
+
+def prepare_worker_init():
+    import django
+
+    # Needed when the workers are spawned rather than forked.
+    django.setup()
+    reset_db_connections()
+
+
+def prepare_worker(using, model, objs):
+    """
+    Turns a batch of objects fetched by the parent process into documents,
+    using the backend & index of ``using`` for ``model``.
+    """
+    backend = haystack_connections[using].get_backend()
+    index = haystack_connections[using].get_unified_index().get_index(model)
+    return backend.prepare_documents(index, objs)
+
+
+def update_worker(args):
+    if len(args) != 12:
+        LOG.error("update_worker received incorrect arguments: %r", args)
+        raise ValueError("update_worker received incorrect arguments")
+
+    (
+        model,
+        start,
+        end,
+        total,
+        using,
+        start_date,
+        end_date,
+        verbosity,
+        commit,
+        max_retries,
+        pk_low,
+        pk_high,
+    ) = args
+
+    reset_db_connections()
+
     # Request that the connection clear out any transient sessions, file handles, etc.
     haystack_connections[using].reset_sessions()
 
@@ -65,10 +101,197 @@ def update_worker(args):
     backend = haystack_connections[using].get_backend()
 
     qs = index.build_queryset(using=using, start_date=start_date, end_date=end_date)
-    do_update(backend, index, qs, start, end, total, verbosity, commit, max_retries)
+    do_update(
+        backend,
+        index,
+        qs,
+        start,
+        end,
+        total,
+        verbosity,
+        commit,
+        max_retries,
+        pk_range=(pk_low, pk_high),
+    )
     return args
 
 
+def get_pk_ranges(qs, batch_size):
+    """
+    Walks the primary keys of ``qs`` in order and returns a list of
+    ``(start, end, pk_low, pk_high)`` tuples, one per batch.
+
+    Only the primary key column is read, so this is a single index scan.
+    Each batch can then be fetched with a ``pk`` range filter instead of an
+    ``OFFSET``, which most databases have to count through row by row.
+    """
+    pk_ranges = []
+    start = 0
+    pk_low = pk_high = None
+    batch_count = 0
+
+    pks = qs.order_by("pk").prefetch_related(None).values_list("pk", flat=True)
+
+    for pk in pks.iterator(chunk_size=batch_size):
+        if batch_count == 0:
+            pk_low = pk
+
+        pk_high = pk
+        batch_count += 1
+
+        if batch_count == batch_size:
+            pk_ranges.append((start, start + batch_count, pk_low, pk_high))
+            start += batch_count
+            batch_count = 0
+
+    if batch_count:
+        pk_ranges.append((start, start + batch_count, pk_low, pk_high))
+
+    return pk_ranges
+
+
+class UpdateJournal:
+    """
+    A JSON lines file of the primary key ranges already indexed for each
+    ``(model, using)`` pair, which lets ``update_index --resume`` skip them
+    after an interrupted run.
+
+    Ranges are only skipped when they were recorded under the same ``window``
+    (the date options of the run, as given), since a different window
+    selects different objects within them.
+    """
+
+    def __init__(self, path, window=None):
+        self.path = path
+        self.window = window
+        self.lock = threading.Lock()
+
+    def _key(self, model, using):
+        return model._meta.label_lower, using, self.window
+
+    def _entry_key(self, entry):
+        # Entries written before the window was recorded had none.
+        return entry["model"], entry["using"], entry.get("window")
+
+    def _read(self):
+        try:
+            with open(self.path) as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # The last line may have been cut short by the crash we are
+                # recovering from.
+                continue
+
+        return entries
+
+    def completed(self, model, using):
+        """
+        Returns the sorted ``(pk_low, pk_high)`` ranges recorded for ``model``.
+        """
+        key = self._key(model, using)
+        to_python = model._meta.pk.to_python
+
+        return sorted(
+            (to_python(entry["pk_low"]), to_python(entry["pk_high"]))
+            for entry in self._read()
+            if self._entry_key(entry) == key
+        )
+
+    def record(self, model, using, pk_low, pk_high):
+        label, using, window = self._key(model, using)
+        line = json.dumps(
+            {
+                "model": label,
+                "using": using,
+                "window": window,
+                "pk_low": pk_low,
+                "pk_high": pk_high,
+            },
+            default=str,
+        )
+
+        with self.lock, open(self.path, "a") as journal:
+            journal.write(line + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def clear(self, model, using):
+        """
+        Forgets ``model`` once all of its batches have been indexed.
+        """
+        key = self._key(model, using)
+
+        with self.lock:
+            entries = [entry for entry in self._read() if self._entry_key(entry) != key]
+
+            if not entries:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+
+            tmp_path = "%s.tmp" % self.path
+            with open(tmp_path, "w") as journal:
+                for entry in entries:
+                    journal.write(json.dumps(entry) + "\n")
+            os.replace(tmp_path, self.path)
+
+
+def skip_completed(pk_ranges, completed):
+    """
+    Drops the entries of ``pk_ranges`` which fall entirely within one of the
+    sorted ``completed`` ranges.
+    """
+    lows = [pk_low for pk_low, pk_high in completed]
+    remaining = []
+
+    for pk_range in pk_ranges:
+        pk_low, pk_high = pk_range[2], pk_range[3]
+        i = bisect.bisect_right(lows, pk_low) - 1
+
+        if i < 0 or completed[i][1] < pk_high:
+            remaining.append(pk_range)
+
+    return remaining
+
+
+def get_stale_ids(qs, ids):
+    """
+    Takes a batch of ``(django_id, id)`` tuples from ``backend.scan_ids`` and
+    returns the ids of the documents whose objects are no longer in ``qs``.
+
+    Database and search engine don't agree on how primary keys sort (``10``
+    comes before ``9`` as a string), so rather than merging two sorted streams
+    each batch is checked with a single ``pk__in`` lookup on the primary key
+    index. Memory use stays bounded by the batch size.
+    """
+    pk_field = qs.model._meta.pk
+    stale_ids = []
+    pks = {}
+
+    for django_id, doc_id in ids:
+        try:
+            pks[doc_id] = pk_field.to_python(django_id)
+        except ValidationError:
+            # Can't be the primary key of anything in the database.
+            stale_ids.append(doc_id)
+
+    existing_pks = set(
+        qs.filter(pk__in=set(pks.values()))
+        .prefetch_related(None)
+        .values_list("pk", flat=True)
+    )
+    stale_ids.extend(doc_id for doc_id, pk in pks.items() if pk not in existing_pks)
+
+    return stale_ids
+
+
 def do_update(
     backend,
     index,
@@ -80,16 +303,22 @@ def do_update(
     commit=True,
     max_retries=DEFAULT_MAX_RETRIES,
     last_max_pk=None,
+    pk_range=None,
 ):
     # Get a clone of the QuerySet so that the cache doesn't bloat up
     # in memory. Useful when reindexing large amounts of data.
     # the query must be ordered by PK in order to get the max PK in each batch
     small_cache_qs = qs.all().order_by("pk")
 
+    # Workers are handed an inclusive range of PKs up front (see
+    # ``get_pk_ranges``) so every batch is an index range scan.
     # If we got the max seen PK from last batch, use it to restrict the qs
     # to values above; this optimises the query for Postgres as not to
     # devolve into multi-second run time at large offsets.
-    if last_max_pk is not None:
+    if pk_range is not None:
+        pk_low, pk_high = pk_range
+        current_qs = small_cache_qs.filter(pk__gte=pk_low, pk__lte=pk_high)
+    elif last_max_pk is not None:
         current_qs = small_cache_qs.filter(pk__gt=last_max_pk)[: end - start]
     else:
         current_qs = small_cache_qs[start:end]
@@ -111,11 +340,31 @@ def do_update(
                 % (start + 1, end, total, os.getpid())
             )
 
+    # FIXME: Get the right backend.
+    send_with_retries(
+        lambda: backend.update(index, current_qs, commit=commit),
+        start,
+        end,
+        verbosity=verbosity,
+        max_retries=max_retries,
+    )
+
+    # Clear out the DB connections queries because it bloats up RAM.
+    reset_queries()
+    return max_pk
+
+
+def send_with_retries(send, start, end, verbosity=1, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Calls ``send`` to write the batch ``start`` - ``end`` to the backend,
+    retrying with an exponential backoff up to ``max_retries`` times.
+    """
+    is_parent_process = hasattr(os, "getppid") and os.getpid() == os.getppid()
+
     retries = 0
     while retries < max_retries:
         try:
-            # FIXME: Get the right backend.
-            backend.update(index, current_qs, commit=commit)
+            send()
             if verbosity >= 2 and retries:
                 print(
                     "Completed indexing {} - {}, tried {}/{} times".format(
@@ -151,9 +400,133 @@ def do_update(
             # If going to try again, sleep a bit before
             time.sleep(2**retries)
 
-    # Clear out the DB connections queries because it bloats up RAM.
-    reset_queries()
-    return max_pk
+
+def do_pipelined_update(
+    backend,
+    index,
+    qs,
+    total,
+    batch_size,
+    verbosity=1,
+    commit=True,
+    max_retries=DEFAULT_MAX_RETRIES,
+    depth=DEFAULT_PIPELINE_DEPTH,
+    pk_ranges=None,
+    on_batch_done=None,
+    prepare_workers=0,
+):
+    """
+    Indexes ``qs`` with the fetching, preparation and sending of consecutive
+    batches overlapping instead of running one after the other.
+
+    The calling thread fetches batches from the database, one thread turns
+    them into documents with ``backend.prepare_documents`` and another sends
+    those with ``backend.update_documents``. No more than ``depth`` batches
+    are in flight at once, which bounds memory use.
+
+    With ``prepare_workers``, the documents are prepared by a pool of that
+    many processes instead, which the fetched objects are pickled over to.
+    Only the calling thread queries the database, so the workers add no load
+    to it as long as preparing an object doesn't run queries of its own.
+
+    If ``pk_ranges`` (as returned by ``get_pk_ranges``) is given, only those
+    batches are indexed. ``on_batch_done`` is called with the ``pk_low`` and
+    ``pk_high`` of every batch once it has been sent.
+    """
+    from django.db import connections
+
+    small_cache_qs = qs.all().order_by("pk")
+    in_flight = collections.deque()
+
+    def fetch():
+        if pk_ranges is not None:
+            for start, end, pk_low, pk_high in pk_ranges:
+                current_qs = small_cache_qs.filter(pk__gte=pk_low, pk__lte=pk_high)
+                yield start, end, pk_low, pk_high, list(current_qs)
+            return
+
+        last_max_pk = None
+        for start in range(0, total, batch_size):
+            end = min(start + batch_size, total)
+
+            if last_max_pk is None:
+                current_qs = list(small_cache_qs[: end - start])
+            else:
+                current_qs = list(
+                    small_cache_qs.filter(pk__gt=last_max_pk)[: end - start]
+                )
+
+            if not current_qs:
+                return
+
+            last_max_pk = current_qs[-1].pk
+            yield start, end, current_qs[0].pk, last_max_pk, current_qs
+
+    def send(prepared, start, end, pk_low, pk_high):
+        documents = prepared.result()
+        send_with_retries(
+            lambda: backend.update_documents(index, documents, commit=commit),
+            start,
+            end,
+            verbosity=verbosity,
+            max_retries=max_retries,
+        )
+
+        if on_batch_done is not None:
+            on_batch_done(pk_low, pk_high)
+
+    if prepare_workers > 0:
+        # Keep every worker busy while the oldest batch is being sent.
+        depth = max(depth, prepare_workers + 1)
+        preparer = ProcessPoolExecutor(
+            max_workers=prepare_workers, initializer=prepare_worker_init
+        )
+
+        def prepare(current_qs):
+            return preparer.submit(
+                prepare_worker, backend.connection_alias, index.get_model(), current_qs
+            )
+
+    else:
+        preparer = ThreadPoolExecutor(max_workers=1)
+
+        def prepare(current_qs):
+            return preparer.submit(backend.prepare_documents, index, current_qs)
+
+    sender = ThreadPoolExecutor(max_workers=1)
+
+    try:
+        for start, end, pk_low, pk_high, current_qs in fetch():
+            if not current_qs:
+                continue
+
+            if verbosity >= 2:
+                print("  indexed %s - %d of %d." % (start + 1, end, total))
+
+            prepared = prepare(current_qs)
+            in_flight.append(sender.submit(send, prepared, start, end, pk_low, pk_high))
+
+            # Clear out the DB connections queries because it bloats up RAM.
+            reset_queries()
+
+            # Wait for the oldest batch once the pipeline is full so that a
+            # slow backend applies back pressure to the database reads.
+            while len(in_flight) >= depth:
+                in_flight.popleft().result()
+
+        while in_flight:
+            in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+        # Preparing documents may have hit the database from the preparer
+        # thread, which then holds connections of its own.
+        if prepare_workers == 0:
+            preparer.submit(connections.close_all)
+
+        preparer.shutdown()
+        sender.shutdown()
 
 
 class Command(BaseCommand):
@@ -237,6 +610,33 @@ class Command(BaseCommand):
             default=DEFAULT_MAX_RETRIES,
             help="Maximum number of attempts to write to the backend when an error occurs.",
         )
+        parser.add_argument(
+            "-p",
+            "--pipeline",
+            action="store_true",
+            default=False,
+            help="Overlap fetching, preparing and sending batches in separate threads.",
+        )
+        parser.add_argument(
+            "--prepare-workers",
+            dest="prepare_workers",
+            type=int,
+            default=0,
+            help="Prepare documents in this many processes, fed with the "
+            "objects fetched by this one. Implies --pipeline.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            default=False,
+            help="Record indexed batches in a journal and skip those already "
+            "recorded by an earlier, interrupted run.",
+        )
+        parser.add_argument(
+            "--journal",
+            default=DEFAULT_JOURNAL,
+            help="Journal file used by --resume. Defaults to '%s'." % DEFAULT_JOURNAL,
+        )
 
     def handle(self, **options):
         self.verbosity = int(options.get("verbosity", 1))
@@ -247,6 +647,9 @@ class Command(BaseCommand):
         self.workers = options.get("workers", 0)
         self.commit = options.get("commit", True)
         self.max_retries = options.get("max_retries", DEFAULT_MAX_RETRIES)
+        self.prepare_workers = options.get("prepare_workers", 0)
+        self.pipeline = options.get("pipeline", False) or self.prepare_workers > 0
+        self.journal = None
 
         self.backends = options.get("using")
         if not self.backends:
@@ -262,6 +665,12 @@ class Command(BaseCommand):
         elif self.verbosity > 1:
             LOG.setLevel(logging.INFO)
 
+        if self.pipeline and self.workers:
+            raise CommandError(
+                "The pipeline (or prepare workers) and workers options are "
+                "mutually exclusive"
+            )
+
         if (minutes and age) or (minutes and start_date) or (age and start_date):
             raise CommandError(
                 "Minutes / age / start date options are mutually exclusive"
@@ -289,6 +698,23 @@ class Command(BaseCommand):
             except ValueError:
                 pass
 
+        if options.get("resume", False):
+            # ``--age`` & ``--minutes`` are kept as given rather than as the
+            # dates they resolve to, so resuming with the same option matches.
+            window = ",".join(
+                "%s=%s" % (name, value)
+                for name, value in (
+                    ("age", age),
+                    ("minutes", minutes),
+                    ("start", start_date),
+                    ("end", end_date),
+                )
+                if value is not None
+            )
+            self.journal = UpdateJournal(
+                options.get("journal") or DEFAULT_JOURNAL, window=window or None
+            )
+
         labels = options.get("app_label") or haystack_load_apps()
         for label in labels:
             for using in self.backends:
@@ -302,56 +728,131 @@ class Command(BaseCommand):
         backend = haystack_connections[using].get_backend()
         unified_index = haystack_connections[using].get_unified_index()
 
+        indexed_models = []
         for model in haystack_get_models(label):
             try:
-                index = unified_index.get_index(model)
+                indexed_models.append((model, unified_index.get_index(model)))
             except NotHandled:
                 if self.verbosity >= 2:
                     self.stdout.write("Skipping '%s' - no index." % model)
-                continue
 
-            if self.workers > 0:
-                # workers resetting connections leads to references to models / connections getting
-                # stale and having their connection disconnected from under them. Resetting before
-                # the loop continues and it accesses the ORM makes it better.
-                close_old_connections()
+        if not indexed_models:
+            return
 
-            qs = index.build_queryset(
-                using=using, start_date=self.start_date, end_date=self.end_date
-            )
+        # Let the backend hold off on refreshing/committing until the end.
+        # A batch has to be committed before the journal records it though,
+        # or a killed run would skip batches that were never written.
+        if self.journal is not None:
+            bulk_session = nullcontext()
+        else:
+            bulk_session = backend.bulk_session(commit=self.commit)
+
+        with bulk_session:
+            for model, index in indexed_models:
+                if self.workers > 0:
+                    # workers resetting connections leads to references to models / connections getting
+                    # stale and having their connection disconnected from under them. Resetting before
+                    # the loop continues and it accesses the ORM makes it better.
+                    close_old_connections()
+
+                qs = index.build_queryset(
+                    using=using, start_date=self.start_date, end_date=self.end_date
+                )
 
-            total = qs.count()
+                total = qs.count()
 
-            if self.verbosity >= 1:
-                self.stdout.write(
-                    "Indexing %d %s"
-                    % (total, force_str(model._meta.verbose_name_plural))
-                )
+                if self.verbosity >= 1:
+                    self.stdout.write(
+                        "Indexing %d %s"
+                        % (total, force_str(model._meta.verbose_name_plural))
+                    )
 
-            batch_size = self.batchsize or backend.batch_size
+                if self.verbosity >= 2 and getattr(
+                    settings, "HAYSTACK_OPTIMIZE_QUERYSETS", False
+                ):
+                    _, _, unoptimized = index.get_related_lookups()
 
-            if self.workers > 0:
-                ghetto_queue = []
+                    for field_name, reason in sorted(unoptimized.items()):
+                        self.stdout.write(
+                            "  couldn't optimize the '%s' field: %s."
+                            % (field_name, reason)
+                        )
 
-            max_pk = None
-            for start in range(0, total, batch_size):
-                end = min(start + batch_size, total)
+                batch_size = self.batchsize or backend.batch_size
 
-                if self.workers == 0:
-                    max_pk = do_update(
+                pk_ranges = None
+                record = None
+                if self.journal is not None:
+                    # Resuming needs stable batch boundaries, so every mode works
+                    # from the primary key ranges and skips the recorded ones.
+                    pk_ranges = get_pk_ranges(qs, batch_size)
+                    completed = self.journal.completed(model, using)
+                    remaining = skip_completed(pk_ranges, completed)
+
+                    if self.verbosity >= 1 and len(remaining) < len(pk_ranges):
+                        self.stdout.write(
+                            "  resuming, %d of %d batches already indexed."
+                            % (len(pk_ranges) - len(remaining), len(pk_ranges))
+                        )
+
+                    pk_ranges = remaining
+
+                    def record(pk_low, pk_high, model=model):
+                        self.journal.record(model, using, pk_low, pk_high)
+
+                if self.pipeline:
+                    do_pipelined_update(
                         backend,
                         index,
                         qs,
-                        start,
-                        end,
                         total,
+                        batch_size,
                         verbosity=self.verbosity,
                         commit=self.commit,
                         max_retries=self.max_retries,
-                        last_max_pk=max_pk,
+                        pk_ranges=pk_ranges,
+                        on_batch_done=record,
+                        prepare_workers=self.prepare_workers,
                     )
+                elif self.workers == 0 and pk_ranges is not None:
+                    for start, end, pk_low, pk_high in pk_ranges:
+                        do_update(
+                            backend,
+                            index,
+                            qs,
+                            start,
+                            end,
+                            total,
+                            verbosity=self.verbosity,
+                            commit=self.commit,
+                            max_retries=self.max_retries,
+                            pk_range=(pk_low, pk_high),
+                        )
+                        record(pk_low, pk_high)
+                elif self.workers == 0:
+                    max_pk = None
+                    for start in range(0, total, batch_size):
+                        end = min(start + batch_size, total)
+
+                        max_pk = do_update(
+                            backend,
+                            index,
+                            qs,
+                            start,
+                            end,
+                            total,
+                            verbosity=self.verbosity,
+                            commit=self.commit,
+                            max_retries=self.max_retries,
+                            last_max_pk=max_pk,
+                        )
                 else:
-                    ghetto_queue.append(
+                    # Workers can't chain ``last_max_pk`` from one batch to the
+                    # next, so work out the PK boundaries of every batch first.
+                    if pk_ranges is None:
+                        pk_ranges = get_pk_ranges(qs, batch_size)
+
+                    ghetto_queue = [
                         (
                             model,
                             start,
@@ -363,75 +864,61 @@ class Command(BaseCommand):
                             self.verbosity,
                             self.commit,
                             self.max_retries,
+                            pk_low,
+                            pk_high,
                         )
-                    )
+                        for start, end, pk_low, pk_high in pk_ranges
+                    ]
+
+                    pool = multiprocessing.Pool(self.workers)
+
+                    # Collect the results as they come in so that the journal
+                    # keeps what was done even if a later batch fails.
+                    successful_tasks = []
+                    for task in pool.imap_unordered(update_worker, ghetto_queue):
+                        successful_tasks.append(task)
+                        if record is not None:
+                            record(task[10], task[11])
+
+                    if len(ghetto_queue) != len(successful_tasks):
+                        self.stderr.write(
+                            "Queued %d tasks but only %d completed"
+                            % (len(ghetto_queue), len(successful_tasks))
+                        )
+                        for i in ghetto_queue:
+                            if i not in successful_tasks:
+                                self.stderr.write("Incomplete task: %s" % repr(i))
 
-            if self.workers > 0:
-                pool = multiprocessing.Pool(self.workers)
+                    pool.close()
+                    pool.join()
 
-                successful_tasks = pool.map(update_worker, ghetto_queue)
+                if self.journal is not None:
+                    self.journal.clear(model, using)
 
-                if len(ghetto_queue) != len(successful_tasks):
-                    self.stderr.write(
-                        "Queued %d tasks but only %d completed"
-                        % (len(ghetto_queue), len(successful_tasks))
-                    )
-                    for i in ghetto_queue:
-                        if i not in successful_tasks:
-                            self.stderr.write("Incomplete task: %s" % repr(i))
-
-                pool.close()
-                pool.join()
-
-            if self.remove:
-                if self.start_date or self.end_date or total <= 0:
-                    # They're using a reduced set, which may not incorporate
-                    # all pks. Rebuild the list with everything.
-                    qs = index.index_queryset(using=using).values_list("pk", flat=True)
-                    database_pks = {smart_bytes(pk) for pk in qs}
-                else:
-                    database_pks = {
-                        smart_bytes(pk) for pk in qs.values_list("pk", flat=True)
-                    }
-
-                # Since records may still be in the search index but not the local database
-                # we'll use that to create batches for processing.
-                # See https://github.com/django-haystack/django-haystack/issues/1186
-                index_total = (
-                    SearchQuerySet(using=backend.connection_alias).models(model).count()
-                )
+                if self.remove:
+                    if self.start_date or self.end_date or total <= 0:
+                        # They're using a reduced set, which may not incorporate
+                        # all pks. Check against everything.
+                        qs = index.index_queryset(using=using)
 
-                # Retrieve PKs from the index. Note that this cannot be a numeric range query because although
-                # pks are normally numeric they can be non-numeric UUIDs or other custom values. To reduce
-                # load on the search engine, we only retrieve the pk field, which will be checked against the
-                # full list obtained from the database, and the id field, which will be used to delete the
-                # record should it be found to be stale.
-                index_pks = SearchQuerySet(using=backend.connection_alias).models(model)
-                index_pks = index_pks.values_list("pk", "id")
-
-                # We'll collect all of the record IDs which are no longer present in the database and delete
-                # them after walking the entire index. This uses more memory than the incremental approach but
-                # avoids needing the pagination logic below to account for both commit modes:
-                stale_records = set()
-
-                for start in range(0, index_total, batch_size):
-                    upper_bound = start + batch_size
-
-                    # If the database pk is no longer present, queue the index key for removal:
-                    for pk, rec_id in index_pks[start:upper_bound]:
-                        if smart_bytes(pk) not in database_pks:
-                            stale_records.add(rec_id)
-
-                if stale_records:
-                    if self.verbosity >= 1:
-                        self.stdout.write(
-                            "  removing %d stale records." % len(stale_records)
-                        )
+                    # Since records may still be in the search index but not the local database
+                    # we walk the index rather than the database.
+                    # See https://github.com/django-haystack/django-haystack/issues/1186
+                    for ids in backend.scan_ids(model, batch_size=batch_size):
+                        stale_records = get_stale_ids(qs, ids)
+
+                        if not stale_records:
+                            continue
+
+                        if self.verbosity >= 1:
+                            self.stdout.write(
+                                "  removing %d stale records." % len(stale_records)
+                            )
 
-                    for rec_id in stale_records:
-                        # Since the PK was not in the database list, we'll delete the record from the search
-                        # index:
                         if self.verbosity >= 2:
-                            self.stdout.write("  removing %s." % rec_id)
+                            for rec_id in stale_records:
+                                self.stdout.write("  removing %s." % rec_id)
 
-                        backend.remove(rec_id, commit=self.commit)
+                        # Since the PKs were not in the database, we'll delete the records from the
+                        # search index:
+                        backend.remove_many(stale_records, commit=self.commit)
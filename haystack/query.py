@@ -1,15 +1,148 @@
 import operator
 import warnings
+from bisect import bisect_left, bisect_right
 from functools import reduce
 
+from asgiref.sync import sync_to_async
+
 from haystack import connection_router, connections
 from haystack.backends import SQ
-from haystack.constants import DEFAULT_OPERATOR, ITERATOR_LOAD_PER_QUERY
+from haystack.constants import (
+    DEFAULT_OPERATOR,
+    ITERATOR_LOAD_PER_QUERY,
+    ITERATOR_MAX_LOAD_PER_QUERY,
+)
 from haystack.exceptions import NotHandled
 from haystack.inputs import AutoQuery, Raw
 from haystack.utils import log as logging
 
 
+def grow_chunk_size(chunk_size):
+    """
+    Doubles the number of results to load per query, up to
+    ``ITERATOR_MAX_LOAD_PER_QUERY``, so going through many results takes few
+    round trips while looking at a handful stays cheap.
+    """
+    return max(chunk_size, min(chunk_size * 2, ITERATOR_MAX_LOAD_PER_QUERY))
+
+
+class SparseResultCache:
+    """
+    The results a ``SearchQuerySet`` has loaded, by position.
+
+    Only the loaded results are kept, along with the sorted, non-overlapping
+    ranges of positions they fill. A deep page of a large result set doesn't
+    cost memory for everything before it & checking whether a range is filled
+    is a binary search, rather than a scan for placeholders.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.starts = []
+        self.ends = []
+        # How many positions there are, once the first results are in.
+        self.length = None
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        for start, end in zip(self.starts, self.ends):
+            for position in range(start, end):
+                yield self.results[position]
+
+    def filled_to(self, position):
+        """
+        Returns where the run of filled positions starting at ``position``
+        ends, or ``position`` itself if it isn't filled.
+        """
+        i = bisect_right(self.starts, position) - 1
+
+        if i >= 0 and self.ends[i] > position:
+            return self.ends[i]
+
+        return position
+
+    def is_filled(self, start, end):
+        """
+        Returns whether every position from ``start`` up to ``end`` (as far as
+        the length goes) is filled.
+        """
+        start = start or 0
+
+        if self.length is not None:
+            end = self.length if end is None else min(end, self.length)
+
+        if end is None:
+            return False
+
+        return start >= end or self.filled_to(start) >= end
+
+    def is_full(self):
+        return bool(self.length) and self.filled_to(0) >= self.length
+
+    def fill(self, start, results):
+        """Puts ``results`` in the positions from ``start`` on."""
+        if not results:
+            return
+
+        end = start + len(results)
+
+        for position, result in enumerate(results, start):
+            self.results[position] = result
+
+        if self.length is None or end > self.length:
+            self.length = end
+
+        # Merge with any ranges the new one overlaps or touches.
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+
+    def truncate(self, length):
+        """Drops everything from ``length`` on, as there's nothing there."""
+        if self.length is None or length >= self.length:
+            return
+
+        i = bisect_right(self.ends, length)
+
+        for start, end in zip(self.starts[i:], self.ends[i:]):
+            for position in range(max(start, length), end):
+                del self.results[position]
+
+        if i < len(self.starts) and self.starts[i] < length:
+            self.ends[i] = length
+            i += 1
+
+        del self.starts[i:]
+        del self.ends[i:]
+        self.length = length
+
+    def drop_last(self):
+        """Drops the last position, for a result which turned out to be gone."""
+        if self.length:
+            self.truncate(self.length - 1)
+
+    def get(self, position):
+        if self.length is None or position >= self.length:
+            raise IndexError("The result index is out of range.")
+
+        return self.results.get(position)
+
+    def slice(self, start, end):  # noqa A003
+        if self.length is None:
+            return []
+
+        end = self.length if end is None else min(end, self.length)
+        return [self.results.get(position) for position in range(start or 0, end)]
+
+
 class SearchQuerySet:
     """
     Provides a way to specify search parameters and lazily load results.
@@ -29,7 +162,7 @@ class SearchQuerySet:
         if query is not None:
             self.query = query
 
-        self._result_cache = []
+        self._result_cache = SparseResultCache()
         self._result_count = None
         self._cache_full = False
         self._load_all = False
@@ -95,6 +228,9 @@ class SearchQuerySet:
 
         return self._manual_iter()
 
+    def __aiter__(self):
+        return self._amanual_iter()
+
     def __and__(self, other):
         if isinstance(other, EmptySearchQuerySet):
             return other._clone()
@@ -110,18 +246,14 @@ class SearchQuerySet:
         return combined
 
     def _cache_is_full(self):
-        if not self.query.has_run():
+        # A count on its own is enough to know there's nothing to fetch.
+        if self._result_count is None and not self.query.has_run():
             return False
 
         if len(self) <= 0:
             return True
 
-        try:
-            self._result_cache.index(None)
-            return False
-        except ValueError:
-            # No ``None``s found in the results. Check the length of the cache.
-            return len(self._result_cache) > 0
+        return self._result_cache.is_full()
 
     def _manual_iter(self):
         # If we're here, our cache isn't fully populated.
@@ -129,29 +261,47 @@ class SearchQuerySet:
         # Also, this can't be part of the __iter__ method due to Python's rules
         # about generator functions.
         current_position = 0
-        current_cache_max = 0
+        chunk_size = ITERATOR_LOAD_PER_QUERY
 
         while True:
-            if len(self._result_cache) > 0:
-                try:
-                    current_cache_max = self._result_cache.index(None)
-                except ValueError:
-                    current_cache_max = len(self._result_cache)
+            current_cache_max = self._result_cache.filled_to(current_position)
 
             while current_position < current_cache_max:
-                yield self._result_cache[current_position]
+                yield self._result_cache.get(current_position)
                 current_position += 1
 
             if self._cache_is_full():
                 return
 
             # We've run out of results and haven't hit our limit.
-            # Fill more of the cache.
-            if not self._fill_cache(
-                current_position, current_position + ITERATOR_LOAD_PER_QUERY
+            # Fill more of the cache, more at a time the further we go.
+            if not self._fill_cache(current_position, current_position + chunk_size):
+                return
+
+            chunk_size = grow_chunk_size(chunk_size)
+
+    async def _amanual_iter(self):
+        # The asynchronous version of ``_manual_iter``, for ``async for``.
+        current_position = 0
+        chunk_size = ITERATOR_LOAD_PER_QUERY
+
+        while True:
+            current_cache_max = self._result_cache.filled_to(current_position)
+
+            while current_position < current_cache_max:
+                yield self._result_cache.get(current_position)
+                current_position += 1
+
+            if self._cache_is_full():
+                return
+
+            if not await self._afill_cache(
+                current_position, current_position + chunk_size
             ):
                 return
 
+            chunk_size = grow_chunk_size(chunk_size)
+
     def post_process_results(self, results):
         to_cache = []
 
@@ -187,14 +337,14 @@ class SearchQuerySet:
                         # fail silently.
                         self._ignored_result_count += 1
 
-                        # avoid an unfilled None at the end of the result cache
-                        self._result_cache.pop()
+                        # There's one less position to fill at the end.
+                        self._result_cache.drop_last()
                         continue
                 else:
                     # No objects were returned -- possible due to SQS nesting such as
                     # XYZ.objects.filter(id__gt=10) where the amount ignored are
                     # exactly equal to the ITERATOR_LOAD_PER_QUERY
-                    del self._result_cache[:1]
+                    self._result_cache.drop_last()
                     self._ignored_result_count += 1
                     continue
 
@@ -213,7 +363,7 @@ class SearchQuerySet:
             # Revert to old behaviour
             return model._default_manager.in_bulk(pks)
 
-    def _fill_cache(self, start, end, **kwargs):
+    def _limit_query(self, start, end):
         # Tell the query where to start from and how many we'd like.
         self.query._reset()
 
@@ -227,52 +377,110 @@ class SearchQuerySet:
             query_end += self._ignored_result_count
 
         self.query.set_limits(query_start, query_end)
+        return start
+
+    def _query_kwargs(self):
+        # Any extra arguments for the query's ``get_results``.
+        return {}
+
+    def _fill_cache(self, start, end, **kwargs):
+        start = self._limit_query(start, end)
         results = self.query.get_results(**kwargs)
+        return self._cache_results(start, end, results)
+
+    def _cache_results(self, start, end, results):
+        steps = self._cache_steps(start, end, results)
+
+        try:
+            request = next(steps)
+
+            while True:
+                if request is None:
+                    request = steps.send(self.query.get_results())
+                else:
+                    request = steps.send(self.post_process_results(request))
+        except StopIteration as stop:
+            return stop.value
+
+    async def _acache_results(self, start, end, results):
+        # The asynchronous version of ``_cache_results``.
+        steps = self._cache_steps(start, end, results)
+
+        try:
+            request = next(steps)
+
+            while True:
+                if request is None:
+                    request = steps.send(await self.query.aget_results())
+                else:
+                    request = steps.send(await self._apost_process_results(request))
+        except StopIteration as stop:
+            return stop.value
 
+    def _cache_steps(self, start, end, results):
+        """
+        Fills the result cache from ``results``, refilling as needed.
+
+        Shared by ``_cache_results`` & ``_acache_results``, which do the
+        fetching: this yields the raw results to be post-processed (& is sent
+        what should be cached) or ``None`` when the next chunk has to be
+        fetched for the limits set on the query (& is sent those results).
+        Returns whether anything was cached.
+        """
         if results is None or len(results) == 0:
             # trim missing stuff from the result cache
-            self._result_cache = self._result_cache[:start]
+            self._result_cache.truncate(start)
             return False
 
-        # Setup the full cache now that we know how many results there are.
-        # We need the ``None``s as placeholders to know what parts of the
-        # cache we have/haven't filled.
-        # Using ``None`` like this takes up very little memory. In testing,
-        # an array of 100,000 ``None``s consumed less than .5 Mb, which ought
-        # to be an acceptable loss for consistent and more efficient caching.
-        if len(self._result_cache) == 0:
-            self._result_cache = [None] * self.query.get_count()
+        # Only the results are kept, so knowing how many there are is enough
+        # to tell which parts of the cache we have/haven't filled.
+        if not self._result_cache.length:
+            self._result_cache.length = self.query.get_count()
 
         fill_start, fill_end = start, end
         if fill_end is None:
             fill_end = self.query.get_count()
         cache_start = fill_start
+        chunk_size = ITERATOR_LOAD_PER_QUERY
 
         while True:
-            to_cache = self.post_process_results(results)
+            to_cache = yield results
+            self._result_cache.fill(cache_start, to_cache)
 
-            # Assign by slice.
-            self._result_cache[cache_start : cache_start + len(to_cache)] = to_cache
-
-            if None in self._result_cache[start:end]:
+            if not self._result_cache.is_filled(start, end):
                 fill_start = fill_end
-                fill_end += ITERATOR_LOAD_PER_QUERY
+                fill_end += chunk_size
+                chunk_size = grow_chunk_size(chunk_size)
                 cache_start += len(to_cache)
 
                 # Tell the query where to start from and how many we'd like.
                 self.query._reset()
                 self.query.set_limits(fill_start, fill_end)
-                results = self.query.get_results()
+                results = yield None
 
                 if results is None or len(results) == 0:
                     # No more results. Trim missing stuff from the result cache
-                    self._result_cache = self._result_cache[:cache_start]
+                    self._result_cache.truncate(cache_start)
                     break
             else:
                 break
 
         return True
 
+    async def _apost_process_results(self, results):
+        if self._load_all:
+            # Loading the objects queries the database, which has to be done
+            # from a thread.
+            return await sync_to_async(self.post_process_results)(results)
+
+        return self.post_process_results(results)
+
+    async def _afill_cache(self, start, end, **kwargs):
+        # The asynchronous version of ``_fill_cache``.
+        start = self._limit_query(start, end)
+        results = await self.query.aget_results(**kwargs)
+        return await self._acache_results(start, end, results)
+
     def __getitem__(self, k):
         """
         Retrieves an item or slice from the set of results.
@@ -301,8 +509,8 @@ class SearchQuerySet:
             bound = k + 1
 
         # We need check to see if we need to populate more of the cache.
-        if len(self._result_cache) <= 0 or (
-            None in self._result_cache[start:bound] and not self._cache_is_full()
+        if not self._result_cache.length or (
+            not self._result_cache.is_filled(start, bound) and not self._cache_is_full()
         ):
             try:
                 self._fill_cache(start, bound)
@@ -312,8 +520,8 @@ class SearchQuerySet:
 
         # Cache should be full enough for our needs.
         if is_slice:
-            return self._result_cache[start:bound]
-        return self._result_cache[start]
+            return self._result_cache.slice(start, bound)
+        return self._result_cache.get(start)
 
     # Methods that return a SearchQuerySet.
     def all(self):  # noqa A003
@@ -517,12 +725,109 @@ class SearchQuerySet:
         clone._using = connection_name
         return clone
 
+    def cache(self, timeout=300):
+        """
+        Keeps the results in the connection's ``RESULT_CACHE`` for ``timeout``
+        seconds, so the same search doesn't go to the backend again until the
+        index is written to.
+
+        A ``timeout`` of ``0`` turns caching off, even when the connection
+        caches everything (via ``RESULT_CACHE_TIMEOUT``). Without a
+        ``RESULT_CACHE``, this has no effect.
+        """
+        clone = self._clone()
+        clone.query.result_cache_timeout = timeout
+        return clone
+
     # Methods that do not return a SearchQuerySet.
 
     def count(self):
         """Returns the total number of matching results."""
         return len(self)
 
+    async def acount(self):
+        """The asynchronous version of ``count``."""
+        if self._result_count is None:
+            self._result_count = await self.query.aget_count() or 0
+
+        return self._result_count - self._ignored_result_count
+
+    async def aget_results(self, start=0, end=None):
+        """
+        Returns the results from ``start`` up to ``end``, the same as slicing
+        the ``SearchQuerySet`` (``sqs[start:end]``) but without blocking.
+        """
+        if not self._result_cache.length or (
+            not self._result_cache.is_filled(start, end) and not self._cache_is_full()
+        ):
+            await self._afill_cache(start, end)
+
+        return self._result_cache.slice(start, end)
+
+    def iterator(self, chunk_size=None):
+        """
+        Yields the results without keeping them in the result cache, so even
+        a very large number of them (e.g. for an export) can be gone through
+        in constant memory.
+
+        The results are loaded ``chunk_size`` at a time. If it isn't given,
+        the chunks start at ``ITERATOR_LOAD_PER_QUERY`` & double as the
+        iteration goes on, up to ``ITERATOR_MAX_LOAD_PER_QUERY``.
+        """
+        clone = self._clone()
+        current_chunk_size = chunk_size or ITERATOR_LOAD_PER_QUERY
+        start = 0
+
+        while True:
+            clone._limit_query(start, start + current_chunk_size)
+            results = clone.query.get_results(**clone._query_kwargs())
+
+            if not results:
+                return
+
+            to_yield = clone.post_process_results(results)
+            yield from to_yield
+            start += len(to_yield)
+
+            if start + clone._ignored_result_count >= clone.query.get_count():
+                return
+
+            if chunk_size is None:
+                current_chunk_size = grow_chunk_size(current_chunk_size)
+
+    def stream(self, batch_size=None):
+        """
+        Yields every result without keeping them in the result cache, like
+        ``iterator``, but walks the matches with the backend's cursor (a
+        scroll, ``cursorMark`` or a Whoosh reader) instead of offsets. Results
+        deep into a large set come back as quickly as the first ones.
+
+        More Like This queries fall back to ``iterator``.
+        """
+        clone = self._clone()
+
+        if clone.query._more_like_this:
+            yield from clone.iterator(batch_size)
+            return
+
+        if clone.query._raw_query:
+            query_string = clone.query._raw_query
+            search_kwargs = clone.query.build_params()
+            search_kwargs.update(clone.query._raw_query_params)
+            search_kwargs.update(clone._query_kwargs())
+        else:
+            query_string, search_kwargs = clone.query.build_search(
+                **clone._query_kwargs()
+            )
+
+        search_kwargs.pop("start_offset", None)
+        search_kwargs.pop("end_offset", None)
+
+        for results in clone.query.backend.stream(
+            query_string, batch_size=batch_size, **search_kwargs
+        ):
+            yield from clone.post_process_results(results)
+
     def best_match(self):
         """Returns the best/top search result that matches the query."""
         return self[0]
@@ -553,6 +858,14 @@ class SearchQuerySet:
             clone = self._clone()
             return clone.query.get_facet_counts()
 
+    async def afacet_counts(self):
+        """The asynchronous version of ``facet_counts``."""
+        if self.query.has_run():
+            return self.query.get_facet_counts()
+        else:
+            clone = self._clone()
+            return await clone.query.aget_facet_counts()
+
     def stats_results(self):
         """
         Returns the stats results found by the query.
@@ -648,15 +961,24 @@ class EmptySearchQuerySet(SearchQuerySet):
 
     def _clone(self, klass=None):
         clone = super()._clone(klass=klass)
-        clone._result_cache = []
+        clone._result_cache = SparseResultCache()
         return clone
 
+    async def acount(self):
+        return 0
+
     def _fill_cache(self, start, end):
         return False
 
+    async def _afill_cache(self, start, end):
+        return False
+
     def facet_counts(self):
         return {}
 
+    async def afacet_counts(self):
+        return {}
+
 
 class ValuesListSearchQuerySet(SearchQuerySet):
     """
@@ -680,11 +1002,16 @@ class ValuesListSearchQuerySet(SearchQuerySet):
         clone._flat = self._flat
         return clone
 
-    def _fill_cache(self, start, end):
+    def _query_kwargs(self):
         query_fields = set(self._internal_fields)
         query_fields.update(self._fields)
-        kwargs = {"fields": query_fields}
-        return super()._fill_cache(start, end, **kwargs)
+        return {"fields": query_fields}
+
+    def _fill_cache(self, start, end):
+        return super()._fill_cache(start, end, **self._query_kwargs())
+
+    async def _afill_cache(self, start, end):
+        return await super()._afill_cache(start, end, **self._query_kwargs())
 
     def post_process_results(self, results):
         to_cache = []
@@ -707,12 +1034,6 @@ class ValuesSearchQuerySet(ValuesListSearchQuerySet):
     ``ValuesQuerySet``.
     """
 
-    def _fill_cache(self, start, end):
-        query_fields = set(self._internal_fields)
-        query_fields.update(self._fields)
-        kwargs = {"fields": query_fields}
-        return super(ValuesListSearchQuerySet, self)._fill_cache(start, end, **kwargs)
-
     def post_process_results(self, results):
         to_cache = []
 
@@ -730,7 +1051,7 @@ class RelatedSearchQuerySet(SearchQuerySet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._load_all_querysets = {}
-        self._result_cache = []
+        self._result_cache = SparseResultCache()
 
     def _load_model_objects(self, model, pks):
         if model in self._load_all_querysets:
@@ -766,3 +1087,38 @@ class RelatedSearchQuerySet(SearchQuerySet):
         clone = super()._clone(klass=klass)
         clone._load_all_querysets = self._load_all_querysets
         return clone
+
+
+def multi_search(querysets, start=0, end=ITERATOR_LOAD_PER_QUERY):
+    """
+    Runs several ``SearchQuerySet``s at once, filling in the count, facets &
+    results from ``start`` to ``end`` of each, so using them afterwards
+    doesn't need another query.
+
+    The searches for each connection are handed to its backend's
+    ``multi_search`` together, which Elasticsearch sends as a single request.
+    More like this & raw queries are run one at a time.
+    """
+    batches = {}
+
+    for sqs in querysets:
+        if isinstance(sqs, EmptySearchQuerySet):
+            continue
+
+        if sqs.query._more_like_this or sqs.query._raw_query:
+            sqs._fill_cache(start, end)
+            continue
+
+        sqs._limit_query(start, end)
+        batches.setdefault(sqs.query._using, []).append(sqs)
+
+    for using, batch in batches.items():
+        backend = connections[using].get_backend()
+        all_results = backend.cached_multi_search(
+            [sqs.query.build_search(**sqs._query_kwargs()) for sqs in batch],
+            [sqs.query.result_cache_timeout for sqs in batch],
+        )
+
+        for sqs, results in zip(batch, all_results):
+            sqs.query.store_results(results)
+            sqs._cache_results(start, end, sqs.query.get_results())
@@ -0,0 +1,147 @@
+import sqlite3
+from contextlib import closing
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from haystack.utils import loading
+
+# The largest number of ``?`` placeholders to use in a single statement, well
+# below SQLite's default limit of 999.
+SQLITE_MAX_VARIABLES = 500
+
+
+class BaseQueue:
+    """
+    Holds the changes recorded by the ``QueuedSignalProcessor`` until the
+    ``process_index_queue`` management command gets to them.
+
+    A change is an ``(action, model, pk, identifier, using)`` tuple, where
+    ``action`` is either ``"update"`` or ``"delete"`` and ``model`` is the
+    ``app_label.model_name`` of the changed object.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+
+    def push(self, changes):
+        """
+        Adds a collection of changes to the end of the queue.
+
+        This method MUST be implemented by each queue.
+        """
+        raise NotImplementedError
+
+    def peek(self, count):
+        """
+        Returns up to ``count`` ``(item_id, change)`` tuples from the front of
+        the queue, oldest first, without removing them.
+
+        This method MUST be implemented by each queue.
+        """
+        raise NotImplementedError
+
+    def delete(self, item_ids):
+        """
+        Removes the given items once they have been processed.
+
+        This method MUST be implemented by each queue.
+        """
+        raise NotImplementedError
+
+    def count(self):
+        """
+        Returns the number of items waiting in the queue.
+
+        This method MUST be implemented by each queue.
+        """
+        raise NotImplementedError
+
+
+class SQLiteQueue(BaseQueue):
+    """
+    A queue kept in a SQLite database file at ``PATH``, so producers &
+    consumers on the same machine need nothing beyond the standard library.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+
+        if not options.get("PATH"):
+            raise ImproperlyConfigured(
+                "You must specify a 'PATH' in your HAYSTACK_QUEUE settings."
+            )
+
+        self.path = options["PATH"]
+        self.timeout = options.get("TIMEOUT", 30)
+        self.setup_complete = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+
+        if not self.setup_complete:
+            # WAL lets the consumer read while web processes keep writing.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS haystack_queue ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "action TEXT NOT NULL, "
+                "model TEXT NOT NULL, "
+                "pk TEXT NOT NULL, "
+                "identifier TEXT NOT NULL, "
+                "connection_alias TEXT NOT NULL)"
+            )
+            self.setup_complete = True
+
+        return closing(connection)
+
+    def push(self, changes):
+        with self._connect() as connection, connection:
+            connection.executemany(
+                "INSERT INTO haystack_queue "
+                "(action, model, pk, identifier, connection_alias) "
+                "VALUES (?, ?, ?, ?, ?)",
+                changes,
+            )
+
+    def peek(self, count):
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id, action, model, pk, identifier, connection_alias "
+                "FROM haystack_queue ORDER BY id LIMIT ?",
+                (count,),
+            ).fetchall()
+
+        return [(row[0], tuple(row[1:])) for row in rows]
+
+    def delete(self, item_ids):
+        item_ids = list(item_ids)
+
+        with self._connect() as connection, connection:
+            for start in range(0, len(item_ids), SQLITE_MAX_VARIABLES):
+                chunk = item_ids[start : start + SQLITE_MAX_VARIABLES]
+                connection.execute(
+                    "DELETE FROM haystack_queue WHERE id IN (%s)"
+                    % ", ".join("?" * len(chunk)),
+                    chunk,
+                )
+
+    def count(self):
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM haystack_queue"
+            ).fetchone()
+
+        return count
+
+
+def get_queue():
+    """
+    Returns an instance of the queue configured by the ``HAYSTACK_QUEUE``
+    setting.
+    """
+    options = dict(getattr(settings, "HAYSTACK_QUEUE", {}))
+    queue_class = loading.import_class(
+        options.pop("ENGINE", "haystack.queues.SQLiteQueue")
+    )
+    return queue_class(**options)
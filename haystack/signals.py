@@ -1,6 +1,68 @@
-from django.db import models
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections as db_connections
+from django.db import models, transaction
+from django.dispatch import Signal
 
 from haystack.exceptions import NotHandled
+from haystack.utils import get_identifier, get_model_ct
+
+# Sent with the ``unified_index`` once a ``UnifiedIndex`` has (re)built its
+# collection of indexes.
+indexes_built = Signal()
+
+
+def index_changes(connections, changes, db_alias=None):
+    """
+    Sends a collection of ``(using, model, pk, action, identifier)`` changes,
+    where ``action`` is either ``"update"`` or ``"delete"``, to the backends
+    with one bulk update & one bulk delete per model & backend.
+
+    Objects to update are reloaded from the ``db_alias`` database (or wherever
+    the database routers send reads). Those which no longer exist are removed
+    from the index instead.
+    """
+    batches = {}
+
+    for using, model, pk, action, identifier in changes:
+        batch = batches.setdefault((using, model), {"update": {}, "delete": []})
+
+        if action == "update":
+            batch["update"][pk] = identifier
+        else:
+            batch["delete"].append(identifier)
+
+    for (using, model), batch in batches.items():
+        try:
+            index = connections[using].get_unified_index().get_index(model)
+        except NotHandled:
+            continue
+
+        backend = connections[using].get_backend()
+        to_remove = batch["delete"]
+
+        if batch["update"]:
+            objs = model._base_manager.db_manager(db_alias).filter(
+                pk__in=batch["update"].keys()
+            )
+            to_update = []
+
+            for obj in objs:
+                batch["update"].pop(obj.pk)
+
+                if index.should_update(obj):
+                    to_update.append(obj)
+
+            if to_update:
+                backend.update(index, to_update)
+
+            # Whatever is left is gone from the database.
+            to_remove.extend(batch["update"].values())
+
+        if to_remove:
+            backend.remove_many(to_remove)
 
 
 class BaseSignalProcessor:
@@ -71,18 +133,176 @@ class RealtimeSignalProcessor(BaseSignalProcessor):
     """
     Allows for observing when saves/deletes fire & automatically updates the
     search engine appropriately.
+
+    Only the models handled by one of the connections are listened to, so
+    saving anything else costs nothing. Models are added as indexes get
+    (re)built.
     """
 
     def setup(self):
-        # Naive (listen to all model saves).
-        models.signals.post_save.connect(self.handle_save)
-        models.signals.post_delete.connect(self.handle_delete)
-        # Efficient would be going through all backends & collecting all models
-        # being used, then hooking up signals only for those.
+        self.connected_models = set()
+        indexes_built.connect(self.handle_indexes_built)
+
+        for connection in self.connections.all():
+            self.connect_models(connection.get_unified_index().get_indexed_models())
 
     def teardown(self):
-        # Naive (listen to all model saves).
-        models.signals.post_save.disconnect(self.handle_save)
-        models.signals.post_delete.disconnect(self.handle_delete)
-        # Efficient would be going through all backends & collecting all models
-        # being used, then disconnecting signals only for those.
+        indexes_built.disconnect(self.handle_indexes_built)
+
+        for model in self.connected_models:
+            models.signals.post_save.disconnect(self.handle_save, sender=model)
+            models.signals.post_delete.disconnect(self.handle_delete, sender=model)
+
+        self.connected_models = set()
+
+    def connect_models(self, indexed_models):
+        for model in indexed_models:
+            if model in self.connected_models:
+                continue
+
+            models.signals.post_save.connect(self.handle_save, sender=model)
+            models.signals.post_delete.connect(self.handle_delete, sender=model)
+            self.connected_models.add(model)
+
+    def handle_indexes_built(self, sender, unified_index, **kwargs):
+        self.connect_models(unified_index.get_indexed_models())
+
+
+class BufferedSignalProcessor(RealtimeSignalProcessor):
+    """
+    Like the ``RealtimeSignalProcessor``, but collects the saves & deletes made
+    during a transaction and sends them to the backends in bulk once it
+    commits.
+
+    Repeated saves of the same object are only indexed once, and the last of
+    a save & a delete wins. Saved objects are reloaded from the database when
+    the buffer is flushed, and changes recorded in a transaction that gets
+    rolled back are dropped. The buffer is flushed early once it holds
+    ``HAYSTACK_SIGNAL_BUFFER_SIZE`` objects.
+
+    Outside of a transaction, changes are sent right away.
+    """
+
+    def __init__(self, connections, connection_router):
+        self.buffer_size = getattr(settings, "HAYSTACK_SIGNAL_BUFFER_SIZE", 1000)
+        self._local = threading.local()
+        super().__init__(connections, connection_router)
+
+    def _get_buffer(self, db_alias):
+        if not hasattr(self._local, "buffers"):
+            self._local.buffers = {}
+
+        return self._local.buffers.setdefault(db_alias, {"items": {}, "callback": None})
+
+    def _is_pending(self, connection, callback):
+        return any(
+            hook[1] is callback for hook in getattr(connection, "run_on_commit", [])
+        )
+
+    def buffer(self, action, sender, instance):
+        """
+        Records ``action`` (``"update"`` or ``"delete"``) for ``instance`` and
+        makes sure the buffer gets flushed when the transaction commits.
+        """
+        using_backends = [
+            using
+            for using in self.connection_router.for_write(instance=instance)
+            if sender in self.connections[using].get_unified_index().get_indexes()
+        ]
+
+        if not using_backends:
+            return
+
+        db_alias = instance._state.db or DEFAULT_DB_ALIAS
+        connection = db_connections[db_alias]
+        buffer = self._get_buffer(db_alias)
+
+        if buffer["callback"] is not None and not self._is_pending(
+            connection, buffer["callback"]
+        ):
+            # Whatever is left over was recorded in a transaction which got
+            # rolled back, taking the callback with it.
+            buffer["items"].clear()
+            buffer["callback"] = None
+
+        # Deleted instances lose their primary key once the signals have
+        # fired, so everything needed later on is worked out now.
+        buffer["items"][(sender, instance.pk)] = (
+            action,
+            get_identifier(instance),
+            using_backends,
+        )
+
+        if not connection.in_atomic_block or len(buffer["items"]) >= self.buffer_size:
+            self.flush(db_alias)
+        elif buffer["callback"] is None:
+
+            def callback():
+                self.flush(db_alias)
+
+            buffer["callback"] = callback
+            connection.on_commit(callback)
+
+    def flush(self, db_alias=DEFAULT_DB_ALIAS):
+        """
+        Sends the buffered changes for the ``db_alias`` database to the
+        backends.
+        """
+        buffer = self._get_buffer(db_alias)
+        items, buffer["items"] = buffer["items"], {}
+
+        index_changes(
+            self.connections,
+            [
+                (using, model, pk, action, identifier)
+                for (model, pk), (action, identifier, using_backends) in items.items()
+                for using in using_backends
+            ],
+            db_alias=db_alias,
+        )
+
+    def handle_save(self, sender, instance, **kwargs):
+        self.buffer("update", sender, instance)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        self.buffer("delete", sender, instance)
+
+
+class QueuedSignalProcessor(RealtimeSignalProcessor):
+    """
+    Like the ``RealtimeSignalProcessor``, but only records which objects
+    changed in the queue configured by ``HAYSTACK_QUEUE``, leaving the work of
+    updating the search index to the ``process_index_queue`` management
+    command.
+
+    Changes are queued once the surrounding transaction commits.
+    """
+
+    def __init__(self, connections, connection_router):
+        from haystack.queues import get_queue
+
+        self.queue = get_queue()
+        super().__init__(connections, connection_router)
+
+    def enqueue(self, action, sender, instance):
+        changes = [
+            (
+                action,
+                get_model_ct(sender),
+                str(instance.pk),
+                get_identifier(instance),
+                using,
+            )
+            for using in self.connection_router.for_write(instance=instance)
+            if sender in self.connections[using].get_unified_index().get_indexes()
+        ]
+
+        if changes:
+            db_alias = instance._state.db or DEFAULT_DB_ALIAS
+            transaction.on_commit(lambda: self.queue.push(changes), using=db_alias)
+
+    def handle_save(self, sender, instance, **kwargs):
+        self.enqueue("update", sender, instance)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        self.enqueue("delete", sender, instance)
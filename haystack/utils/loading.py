@@ -257,6 +257,10 @@ class UnifiedIndex:
 
         self._built = True
 
+        from haystack.signals import indexes_built
+
+        indexes_built.send(sender=self.__class__, unified_index=self)
+
     def collect_fields(self, index):
         for fieldname, field_object in index.fields.items():
             if field_object.document is True:
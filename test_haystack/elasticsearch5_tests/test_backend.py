@@ -869,7 +869,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
         sqs = self.sqs.all()
         results = sorted([int(result.pk) for result in sqs])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_slice(self):
         reset_search_queries()
@@ -953,7 +953,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
                 20,
             },
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_fill_cache(self):
         reset_search_queries()
@@ -979,7 +979,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
         results = self.sqs.all()
         fire_the_iterator_and_fill_cache = [result for result in results]
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test___and__(self):
         sqs1 = self.sqs.filter(content="foo")
@@ -1131,7 +1131,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
                 20,
             },
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_related_slice(self):
         reset_search_queries()
@@ -1164,7 +1164,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
         self.assertEqual(len(connections["elasticsearch"].queries), 0)
         results = sorted([int(result.pk) for result in results._manual_iter()])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_related_fill_cache(self):
         reset_search_queries()
@@ -1190,7 +1190,7 @@ class LiveElasticsearch5SearchQuerySetTestCase(TestCase):
         results = self.rsqs.all()
         fire_the_iterator_and_fill_cache = [result for result in results]
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_quotes_regression(self):
         sqs = self.sqs.auto_query("44°48'40''N 20°28'32''E")
@@ -1,11 +1,14 @@
+import asyncio
 import datetime
 import logging as std_logging
 import operator
 import pickle
 import unittest
 from decimal import Decimal
+from unittest.mock import patch
 
 import elasticsearch
+from asgiref.sync import sync_to_async
 from django.apps import apps
 from django.conf import settings
 from django.test import TestCase
@@ -413,6 +416,119 @@ class Elasticsearch7SearchBackendTestCase(TestCase):
             ],
         )
 
+    def test_parallel_update(self):
+        self.sb.parallel_update(self.smmi, self.sample_objs, threads=2, chunk_size=2)
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+    def get_index_settings(self):
+        index_settings = self.raw_es.indices.get_settings(index=self.sb.index_name)
+        return index_settings[self.sb.index_name]["settings"]["index"]
+
+    def test_bulk_session(self):
+        # The live index's settings are left alone unless asked for.
+        with self.sb.bulk_session():
+            self.sb.update(self.smmi, self.sample_objs)
+            self.assertNotIn("refresh_interval", self.get_index_settings())
+
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+        self.sb.bulk_index_settings = True
+        self.addCleanup(setattr, self.sb, "bulk_index_settings", False)
+
+        with self.sb.bulk_session():
+            current = self.get_index_settings()
+            self.assertEqual(current["refresh_interval"], "-1")
+            self.assertEqual(current["number_of_replicas"], "0")
+
+        self.assertNotIn("refresh_interval", self.get_index_settings())
+
+        # The settings left by another (or a killed) session aren't kept.
+        self.raw_es.indices.put_settings(
+            index=self.sb.index_name, body={"index": {"refresh_interval": "-1"}}
+        )
+
+        with self.sb.bulk_session():
+            pass
+
+        self.assertNotIn("refresh_interval", self.get_index_settings())
+
+    def test_bulk_session_alias(self):
+        with self.sb.swap_index() as new_index_name:
+            self.sb.update(self.smmi, self.sample_objs)
+
+        # ``INDEX_NAME`` is now an alias, so the settings belong to the index
+        # it points at.
+        self.sb.bulk_index_settings = True
+        self.addCleanup(setattr, self.sb, "bulk_index_settings", False)
+
+        with self.sb.bulk_session():
+            index_settings = self.raw_es.indices.get_settings(index=new_index_name)
+            current = index_settings[new_index_name]["settings"]["index"]
+            self.assertEqual(current["refresh_interval"], "-1")
+            self.assertEqual(current["number_of_replicas"], "0")
+
+        index_settings = self.raw_es.indices.get_settings(index=new_index_name)
+        self.assertNotIn(
+            "refresh_interval", index_settings[new_index_name]["settings"]["index"]
+        )
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+    def test_swap_index(self):
+        index_name = settings.HAYSTACK_CONNECTIONS["elasticsearch"]["INDEX_NAME"]
+        self.sb.update(self.smmi, self.sample_objs)
+
+        with self.sb.swap_index() as new_index_name:
+            self.sb.update(self.smmi, self.sample_objs[:2])
+            # Searches elsewhere still hit the old index.
+            self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+        self.assertEqual(self.sb.get_alias_indices(), [new_index_name])
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 2)
+        self.assertEqual(self.sb.index_name, index_name)
+
+        # Swapping again drops the previous index, as does a failure.
+        with self.assertRaises(ValueError):
+            with self.sb.swap_index() as failed_index_name:
+                raise ValueError
+
+        self.assertFalse(self.raw_es.indices.exists(index=failed_index_name))
+        self.assertEqual(self.sb.get_alias_indices(), [new_index_name])
+
+        with self.sb.swap_index() as newer_index_name:
+            self.sb.update(self.smmi, self.sample_objs)
+
+        self.assertEqual(self.sb.get_alias_indices(), [newer_index_name])
+        self.assertFalse(self.raw_es.indices.exists(index=new_index_name))
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+        # Clearing deletes the indices behind the alias.
+        self.sb.clear()
+        self.assertFalse(self.raw_es.indices.exists(index=newer_index_name))
+
+    def test_remove_many(self):
+        self.sb.update(self.smmi, self.sample_objs)
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
+
+        self.sb.silently_fail = False
+        self.sb.remove_many(
+            [self.sample_objs[0], "core.mockmodel.2", "core.mockmodel.421"]
+        )
+        self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 1)
+
+    def test_scan_ids(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        batches = list(self.sb.scan_ids(MockModel, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(
+            sorted(ids for batch in batches for ids in batch),
+            [
+                ("1", "core.mockmodel.1"),
+                ("2", "core.mockmodel.2"),
+                ("3", "core.mockmodel.3"),
+            ],
+        )
+
     def test_remove_succeeds_on_404(self):
         self.sb.silently_fail = False
         self.sb.remove("core.mockmodel.421")
@@ -460,6 +576,70 @@ class Elasticsearch7SearchBackendTestCase(TestCase):
             0,
         )
 
+    async def test_asearch(self):
+        await sync_to_async(self.sb.update)(self.smmi, self.sample_objs)
+
+        self.assertEqual(await self.sb.asearch(""), {"hits": 0, "results": []})
+        results = await self.sb.asearch("*:*")
+        self.assertEqual(results["hits"], 3)
+        self.assertEqual({result.pk for result in results["results"]}, {"1", "2", "3"})
+
+        sqs = SearchQuerySet("elasticsearch").filter(name="daniel1")
+        self.assertEqual(await sqs.acount(), 1)
+        self.assertEqual([result.pk async for result in sqs], ["1"])
+
+    def test_async_conn_per_loop(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        async def search():
+            results = await self.sb.asearch("*:*")
+            return results["hits"], self.sb.async_conn
+
+        # Each ``asyncio.run`` gets (& then closes) a loop of its own.
+        hits, first_conn = asyncio.run(search())
+        self.assertEqual(hits, 3)
+
+        with patch.object(first_conn, "close", wraps=first_conn.close) as close:
+            hits, second_conn = asyncio.run(search())
+
+        self.assertEqual(hits, 3)
+        self.assertIsNot(second_conn, first_conn)
+        close.assert_called_once_with()
+
+        asyncio.run(self.sb.close_async_conn())
+        self.assertIsNone(self.sb.async_conn)
+
+    def test_multi_search(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        results = self.sb.multi_search(
+            [("*:*", {}), ("", {}), ("name:daniel1", {"end_offset": 1})]
+        )
+        self.assertEqual([result["hits"] for result in results], [3, 0, 1])
+        self.assertEqual([result.pk for result in results[2]["results"]], ["1"])
+
+    def test_stream(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        batches = list(self.sb.stream("*:*", batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(
+            sorted(result.pk for batch in batches for result in batch),
+            ["1", "2", "3"],
+        )
+        self.assertEqual(list(self.sb.stream("")), [])
+
+    def test_count(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        self.assertEqual(self.sb.count(""), 0)
+        self.assertEqual(self.sb.count("*:*"), 3)
+        self.assertEqual(
+            self.sb.count("Index", facets={"name": {}}, highlight=True, end_offset=1),
+            3,
+        )
+        self.assertEqual(self.sb.count("*:*", narrow_queries={"name:daniel1"}), 1)
+
     def test_search(self):
         self.sb.update(self.smmi, self.sample_objs)
         self.assertEqual(self.raw_search("*:*")["hits"]["total"]["value"], 3)
@@ -929,7 +1109,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
         sqs = self.sqs.all()
         results = sorted([int(result.pk) for result in sqs])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_slice(self):
         reset_search_queries()
@@ -1013,7 +1193,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
                 20,
             },
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_fill_cache(self):
         reset_search_queries()
@@ -1039,7 +1219,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
         results = self.sqs.all()
         fire_the_iterator_and_fill_cache = [result for result in results]
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test___and__(self):
         sqs1 = self.sqs.filter(content="foo")
@@ -1191,7 +1371,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
                 20,
             },
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_related_slice(self):
         reset_search_queries()
@@ -1224,7 +1404,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
         self.assertEqual(len(connections["elasticsearch"].queries), 0)
         results = sorted([int(result.pk) for result in results._manual_iter()])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_related_fill_cache(self):
         reset_search_queries()
@@ -1250,7 +1430,7 @@ class LiveElasticsearch7SearchQuerySetTestCase(TestCase):
         results = self.rsqs.all()
         fire_the_iterator_and_fill_cache = [result for result in results]
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_quotes_regression(self):
         sqs = self.sqs.auto_query("44°48'40''N 20°28'32''E")
@@ -908,7 +908,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
         sqs = self.sqs.all()
         results = sorted([int(result.pk) for result in list(sqs)])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 4)
+        self.assertEqual(len(connections["elasticsearch"].queries), 3)
 
     def test_slice(self):
         reset_search_queries()
@@ -1005,7 +1005,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
                 ]
             ),
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_fill_cache(self):
         reset_search_queries()
@@ -1032,7 +1032,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
         fire_the_iterator_and_fill_cache = list(results)
         self.assertEqual(23, len(fire_the_iterator_and_fill_cache))
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 4)
+        self.assertEqual(len(connections["elasticsearch"].queries), 3)
 
     def test___and__(self):
         sqs1 = self.sqs.filter(content="foo")
@@ -1197,7 +1197,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
                 ]
             ),
         )
-        self.assertEqual(len(connections["elasticsearch"].queries), 4)
+        self.assertEqual(len(connections["elasticsearch"].queries), 3)
 
     def test_related_slice(self):
         reset_search_queries()
@@ -1230,7 +1230,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
         self.assertEqual(len(connections["elasticsearch"].queries), 0)
         results = sorted([int(result.pk) for result in results._manual_iter()])
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["elasticsearch"].queries), 3)
+        self.assertEqual(len(connections["elasticsearch"].queries), 2)
 
     def test_related_fill_cache(self):
         reset_search_queries()
@@ -1257,7 +1257,7 @@ class LiveElasticsearchSearchQuerySetTestCase(TestCase):
         fire_the_iterator_and_fill_cache = list(results)
         self.assertEqual(23, len(fire_the_iterator_and_fill_cache))
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["elasticsearch"].queries), 4)
+        self.assertEqual(len(connections["elasticsearch"].queries), 3)
 
     def test_quotes_regression(self):
         sqs = self.sqs.auto_query("44°48'40''N 20°28'32''E")
@@ -337,6 +337,38 @@ class SolrSearchBackendTestCase(TestCase):
             ],
         )
 
+    def test_parallel_update(self):
+        self.sb.parallel_update(self.smmi, self.sample_objs, threads=2, chunk_size=2)
+        self.assertEqual(self.raw_solr.search("*:*").hits, 3)
+
+    def test_bulk_session(self):
+        with self.sb.bulk_session():
+            self.sb.update(self.smmi, self.sample_objs)
+            self.assertEqual(self.raw_solr.search("*:*").hits, 0)
+
+        self.assertEqual(self.raw_solr.search("*:*").hits, 3)
+
+    def test_remove_many(self):
+        self.sb.update(self.smmi, self.sample_objs)
+        self.assertEqual(self.raw_solr.search("*:*").hits, 3)
+
+        self.sb.remove_many([self.sample_objs[0], "core.mockmodel.2"])
+        self.assertEqual(self.raw_solr.search("*:*").hits, 1)
+
+    def test_scan_ids(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        batches = list(self.sb.scan_ids(MockModel, batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(
+            sorted(ids for batch in batches for ids in batch),
+            [
+                ("1", "core.mockmodel.1"),
+                ("2", "core.mockmodel.2"),
+                ("3", "core.mockmodel.3"),
+            ],
+        )
+
     def test_clear(self):
         self.sb.update(self.smmi, self.sample_objs)
         self.assertEqual(self.raw_solr.search("*:*").hits, 3)
@@ -383,6 +415,46 @@ class SolrSearchBackendTestCase(TestCase):
         self.ui.build(indexes=[self.smmi])
         connections["solr"]._index = self.ui
 
+    def test_multi_search(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        results = self.sb.multi_search(
+            [("*:*", {}), ("", {}), ("name:daniel1", {"end_offset": 1})]
+        )
+        self.assertEqual([result["hits"] for result in results], [3, 0, 1])
+        self.assertEqual([result.pk for result in results[2]["results"]], ["1"])
+
+        # The searches run on other threads are still recorded on this one.
+        with self.settings(DEBUG=True):
+            reset_search_queries()
+            self.sb.multi_search([("*:*", {}), ("name:daniel1", {})])
+            self.assertEqual(
+                [query["query_string"] for query in connections["solr"].queries],
+                ["*:*", "name:daniel1"],
+            )
+
+    def test_stream(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        batches = list(self.sb.stream("*:*", batch_size=2))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertEqual(
+            sorted(result.pk for batch in batches for result in batch),
+            ["1", "2", "3"],
+        )
+        self.assertEqual(list(self.sb.stream("")), [])
+
+    def test_count(self):
+        self.sb.update(self.smmi, self.sample_objs)
+
+        self.assertEqual(self.sb.count(""), 0)
+        self.assertEqual(self.sb.count("*:*"), 3)
+        self.assertEqual(
+            self.sb.count("Index", facets={"name": {}}, highlight=True, end_offset=1),
+            3,
+        )
+        self.assertEqual(self.sb.count("*:*", narrow_queries={"name:daniel1"}), 1)
+
     def test_search(self):
         self.sb.update(self.smmi, self.sample_objs)
         self.assertEqual(self.raw_solr.search("*:*").hits, 3)
@@ -993,7 +1065,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         sqs = self.sqs.all()
         results = [int(result.pk) for result in iter(sqs)]
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["solr"].queries), 3)
+        self.assertEqual(len(connections["solr"].queries), 2)
 
     def test_slice(self):
         reset_search_queries()
@@ -1050,7 +1122,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         self.assertEqual(len(connections["solr"].queries), 0)
         results = [int(result.pk) for result in results._manual_iter()]
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["solr"].queries), 3)
+        self.assertEqual(len(connections["solr"].queries), 2)
 
     def test_fill_cache(self):
         reset_search_queries()
@@ -1077,7 +1149,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         fire_the_iterator_and_fill_cache = list(results)
         self.assertEqual(23, len(fire_the_iterator_and_fill_cache))
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["solr"].queries), 4)
+        self.assertEqual(len(connections["solr"].queries), 3)
 
     def test___and__(self):
         sqs1 = self.sqs.filter(content="foo")
@@ -1241,7 +1313,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         sqs = self.rsqs.all()
         results = [int(result.pk) for result in iter(sqs)]
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["solr"].queries), 3)
+        self.assertEqual(len(connections["solr"].queries), 2)
 
     def test_related_slice(self):
         reset_search_queries()
@@ -1271,7 +1343,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         self.assertEqual(len(connections["solr"].queries), 0)
         results = [int(result.pk) for result in results._manual_iter()]
         self.assertEqual(results, list(range(1, 24)))
-        self.assertEqual(len(connections["solr"].queries), 3)
+        self.assertEqual(len(connections["solr"].queries), 2)
 
     def test_related_fill_cache(self):
         reset_search_queries()
@@ -1298,7 +1370,7 @@ class LiveSolrSearchQuerySetTestCase(TestCase):
         fire_the_iterator_and_fill_cache = list(results)
         self.assertEqual(23, len(fire_the_iterator_and_fill_cache))
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["solr"].queries), 4)
+        self.assertEqual(len(connections["solr"].queries), 3)
 
     def test_quotes_regression(self):
         sqs = self.sqs.auto_query("44°48'40''N 20°28'32''E")
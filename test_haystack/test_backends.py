@@ -1,8 +1,11 @@
+import threading
 import warnings
+from unittest.mock import patch
 
 from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 
+from haystack.backends import BaseSearchBackend
 from haystack.utils import loading
 
 
@@ -73,3 +76,96 @@ class LoadBackendTestCase(TestCase):
                 str(e),
                 "The Python module 'haystack.backends.simple_backend' has no 'FooEngine' class.",
             )
+
+
+class RecordingSearchBackend(BaseSearchBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.sent = []
+        self.failures = 0
+
+    def update_documents(self, index, documents, commit=True):
+        with self.lock:
+            if self.failures:
+                self.failures -= 1
+                raise IOError("Simulated backend failure")
+
+            self.sent.append((list(documents), commit))
+
+
+class ParallelUpdateTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = RecordingSearchBackend("default", BATCH_SIZE=4)
+
+    def test_parallel_update(self):
+        self.backend.parallel_update(None, range(10), threads=2, chunk_size=3)
+
+        self.assertEqual(
+            sorted(doc for documents, commit in self.backend.sent for doc in documents),
+            list(range(10)),
+        )
+        self.assertEqual(len(self.backend.sent), 4)
+        # Only the last chunk commits, once all the others are in.
+        self.assertEqual(self.backend.sent[-1], ([9], True))
+        self.assertEqual(
+            [commit for documents, commit in self.backend.sent[:-1]], [False] * 3
+        )
+
+    def test_chunk_size_defaults_to_batch_size(self):
+        self.backend.parallel_update(None, range(10), commit=False)
+        self.assertEqual(
+            sorted(len(documents) for documents, commit in self.backend.sent),
+            [2, 4, 4],
+        )
+        self.assertFalse(any(commit for documents, commit in self.backend.sent))
+
+    @patch("haystack.backends.sleep")
+    def test_retries(self, sleep):
+        self.backend.failures = 1
+        self.backend.parallel_update(None, range(10), threads=2, chunk_size=5)
+        self.assertEqual(len(self.backend.sent), 2)
+        sleep.assert_called_once_with(2)
+
+        self.backend.failures = 3
+        with self.assertRaises(IOError):
+            self.backend.parallel_update(None, range(5), max_retries=3)
+
+    def test_nothing_to_send(self):
+        self.backend.parallel_update(None, [])
+        self.assertEqual(self.backend.sent, [])
+
+
+class BulkSessionTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = BaseSearchBackend("default")
+
+    def test_bulk_session(self):
+        self.assertTrue(self.backend.should_commit(True))
+        self.assertFalse(self.backend.should_commit(False))
+
+        with patch.object(self.backend, "begin_bulk_session") as begin:
+            with patch.object(self.backend, "end_bulk_session") as end:
+                with self.backend.bulk_session():
+                    self.assertFalse(self.backend.should_commit(True))
+
+                    with self.backend.bulk_session(commit=False):
+                        self.assertFalse(self.backend.should_commit(True))
+
+                    self.assertFalse(end.called)
+
+                begin.assert_called_once_with()
+                end.assert_called_once_with(commit=True)
+
+        self.assertTrue(self.backend.should_commit(True))
+
+    def test_bulk_session_error(self):
+        with patch.object(self.backend, "end_bulk_session") as end:
+            with self.assertRaises(IOError):
+                with self.backend.bulk_session(commit=False):
+                    raise IOError("Simulated backend failure")
+
+        end.assert_called_once_with(commit=False)
+        self.assertEqual(self.backend.bulk_sessions, 0)
@@ -1,9 +1,9 @@
 import datetime
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from django.template import TemplateDoesNotExist
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from haystack.fields import *
 from test_haystack.core.models import (
@@ -138,6 +138,15 @@ class SearchFieldTestCase(TestCase):
 
         self.assertEqual(None, result)
 
+    def test_split_model_attr_lookups(self):
+        field = SearchField(model_attr="tag__name")
+        lookups = field.split_model_attr_lookups()
+        self.assertEqual(lookups, ["tag", "name"])
+        self.assertIs(field.split_model_attr_lookups(), lookups)
+
+        field.model_attr = "author"
+        self.assertEqual(field.split_model_attr_lookups(), ["author"])
+
 
 class CharFieldTestCase(TestCase):
     def test_init(self):
@@ -609,6 +618,44 @@ class CharFieldWithTemplateTestCase(TestCase):
         template5.instance_name = "template"
         self.assertEqual(template5.prepare(mock), "BAR!\n")
 
+    def test_template_cache(self):
+        mock = MockModel()
+        mock.pk = 1
+        template = CharField(use_template=True)
+        template.instance_name = "template"
+
+        with patch("haystack.fields.loader.select_template") as select_template:
+            select_template.return_value.render.return_value = "Indexed!"
+            self.assertEqual(template.prepare(mock), "Indexed!")
+            self.assertEqual(template.prepare(mock), "Indexed!")
+
+        select_template.assert_called_once_with(
+            ["search/indexes/core/mockmodel_template.txt"]
+        )
+
+        # Template changes show up right away while developing.
+        with override_settings(DEBUG=True):
+            with patch("haystack.fields.loader.select_template") as select_template:
+                select_template.return_value.render.return_value = "Changed!"
+                self.assertEqual(template.prepare(mock), "Changed!")
+                self.assertEqual(template.prepare(mock), "Changed!")
+
+        self.assertEqual(select_template.call_count, 2)
+
+    def test_prepare_template_batch(self):
+        mocks = [MockModel(pk=pk) for pk in range(1, 4)]
+        template = CharField(use_template=True)
+        template.instance_name = "template"
+
+        self.assertEqual(
+            template.prepare_template_batch(mocks),
+            ["Indexed!\n1\n", "Indexed!\n2\n", "Indexed!\n3\n"],
+        )
+        self.assertEqual(
+            template.prepare_template_batch(mocks),
+            [template.prepare(mock) for mock in mocks],
+        )
+
 
 ##############################################################################
 # The following tests look like they don't do much, but it's important because
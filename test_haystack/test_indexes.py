@@ -2,11 +2,13 @@ import datetime
 import queue
 import time
 from threading import Thread
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from haystack import connections, indexes
 from haystack.exceptions import SearchFieldError
+from haystack.fields import rendered_templates
 from haystack.utils.loading import UnifiedIndex
 from test_haystack.core.models import (
     AFifthMockModel,
@@ -15,6 +17,7 @@ from test_haystack.core.models import (
     ManyToManyLeftSideModel,
     ManyToManyRightSideModel,
     MockModel,
+    MockTag,
 )
 
 
@@ -292,6 +295,72 @@ class SearchIndexTestCase(TestCase):
             ["author", "django_ct", "django_id", "extra", "id", "pub_date", "text"],
         )
 
+    def test_prepare_plan(self):
+        mock = MockModel()
+        mock.pk = 20
+        mock.author = "daniel20"
+        mock.pub_date = datetime.datetime(2009, 1, 31, 4, 19, 0)
+
+        self.cmi.full_prepare(mock)
+        plan = self.cmi._get_prepare_plan()
+
+        # Worked out once, then reused for every other object.
+        self.cmi.full_prepare(mock)
+        self.assertIs(self.cmi._get_prepare_plan(), plan)
+
+        model_ct, field_steps, cleanup_steps = plan
+        self.assertEqual(model_ct, "core.mockmodel")
+        self.assertEqual(len(field_steps), len(self.cmi.fields))
+        self.assertEqual(len(cleanup_steps), len(self.cmi.fields))
+        self.assertEqual(
+            sorted(
+                index_fieldname
+                for index_fieldname, _, prepare_method in field_steps
+                if prepare_method is not None
+            ),
+            ["author"],
+        )
+
+    def test_prerender_templates(self):
+        mocks = [MockModel(pk=pk, author="daniel%s" % pk) for pk in range(1, 4)]
+
+        for mock in mocks:
+            mock.pub_date = datetime.datetime(2009, 1, 31, 4, 19, 0)
+
+        expected = [dict(self.mi.full_prepare(mock)) for mock in mocks]
+
+        with self.mi.prerender_templates(mocks):
+            with patch.object(
+                indexes.CharField, "get_template", side_effect=AssertionError
+            ):
+                self.assertEqual(
+                    [dict(self.mi.full_prepare(mock)) for mock in mocks], expected
+                )
+
+        self.assertEqual(rendered_templates.rendered, {})
+
+    def test_prerender_templates_per_thread(self):
+        mock = MockModel(pk=1, author="daniel1")
+        mock.pub_date = datetime.datetime(2009, 1, 31, 4, 19, 0)
+        other_threads = []
+
+        def prepare():
+            other_threads.append(dict(rendered_templates.rendered))
+
+        with self.mi.prerender_templates([mock]):
+            self.assertEqual(len(rendered_templates.rendered), 2)
+
+            thread = Thread(target=prepare)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(other_threads, [{}])
+
+        # Objects are told apart by their identifiers, which unsaved ones
+        # don't have.
+        with self.mi.prerender_templates([MockModel(author="daniel2")]):
+            self.assertEqual(rendered_templates.rendered, {})
+
     def test_custom_prepare(self):
         mock = MockModel()
         mock.pk = 20
@@ -876,6 +945,80 @@ class ModelWithManyToManyFieldAndAttributeLookupSearchIndexTestCase(TestCase):
         )
 
 
+class RelatedLookupsMockSearchIndex(indexes.SearchIndex, indexes.Indexable):
+    text = indexes.CharField(document=True, use_template=True)
+    tag = indexes.CharField(model_attr="tag")
+    tag_name = indexes.CharField(model_attr="tag__name")
+    author = indexes.CharField(model_attr="author")
+    author_upper = indexes.CharField(model_attr="author__upper")
+    greeting = indexes.CharField()
+
+    def get_model(self):
+        return MockModel
+
+    def prepare_greeting(self, obj):
+        return obj.hello()
+
+
+class RelatedLookupsTestCase(TestCase):
+    def test_get_related_lookups(self):
+        select_related, prefetch_related, unoptimized = (
+            RelatedLookupsMockSearchIndex().get_related_lookups()
+        )
+        self.assertEqual(select_related, ["tag"])
+        self.assertEqual(prefetch_related, [])
+        self.assertEqual(
+            unoptimized,
+            {
+                "text": "rendered from a template",
+                "author_upper": "'author' isn't a relation on 'core.MockModel'",
+                "greeting": "prepared by 'prepare_greeting'",
+            },
+        )
+
+        select_related, prefetch_related, unoptimized = (
+            ModelWithManyToManyFieldAndAttributeLookupSearchIndex().get_related_lookups()
+        )
+        self.assertEqual(select_related, [])
+        self.assertEqual(prefetch_related, ["related_models"])
+        self.assertEqual(unoptimized, {})
+
+    def test_build_queryset(self):
+        index = ModelWithManyToManyFieldAndAttributeLookupSearchIndex()
+
+        for i in range(3):
+            left_model = ManyToManyLeftSideModel.objects.create()
+            left_model.related_models.add(
+                ManyToManyRightSideModel.objects.create(name="Right side %d" % i)
+            )
+
+        self.assertEqual(index.build_queryset()._prefetch_related_lookups, ())
+
+        with override_settings(HAYSTACK_OPTIMIZE_QUERYSETS=True):
+            qs = index.build_queryset()
+
+        self.assertEqual(qs._prefetch_related_lookups, ("related_models",))
+
+        with self.assertNumQueries(2):
+            results = [index.full_prepare(obj) for obj in qs]
+
+        self.assertEqual(
+            [result["related_models"] for result in results],
+            [["Right side 0"], ["Right side 1"], ["Right side 2"]],
+        )
+
+        tag = MockTag.objects.create(name="primary")
+        MockModel.objects.create(author="daniel1", tag=tag)
+
+        with override_settings(HAYSTACK_OPTIMIZE_QUERYSETS=True):
+            qs = RelatedLookupsMockSearchIndex().build_queryset()
+
+        self.assertEqual(qs.query.select_related, {"tag": {}})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(qs[0].tag.name, "primary")
+
+
 class PolymorphicModelTestCase(TestCase):
     def test_prepare_with_polymorphic(self):
         index = PolymorphicModelSearchIndex()
@@ -2,8 +2,11 @@ from unittest.mock import call, patch
 
 from django.conf import settings
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 
+from haystack import connections
+
 __all__ = ["CoreManagementCommandsTestCase"]
 
 
@@ -26,6 +29,20 @@ class CoreManagementCommandsTestCase(TestCase):
             "update_index should have been restricted to the index specified with --using",
         )
 
+    @patch(
+        "haystack.management.commands.update_index.haystack_get_models",
+        return_value=[],
+    )
+    def test_update_index_without_indexed_models(self, m):
+        """update_index doesn't start a bulk session for a label with no indexes"""
+        backend = connections["default"].get_backend()
+
+        with patch.object(backend, "bulk_session") as bulk_session:
+            call_command("update_index", "core", verbosity=0, using=["default"])
+
+        m.assert_called_once_with("core")
+        self.assertFalse(bulk_session.called)
+
     @patch("haystack.loading.ConnectionHandler.__getitem__")
     def test_clear_index_default_using(self, m):
         """clear_index uses all keys when --using is not present"""
@@ -116,3 +133,32 @@ class CoreManagementCommandsTestCase(TestCase):
 
         self.assertIn("interactive", kwargs)
         self.assertIs(kwargs["interactive"], False)
+
+    @patch("haystack.management.commands.rebuild_index.connections")
+    @patch("haystack.management.commands.clear_index.Command.handle", return_value="")
+    @patch("haystack.management.commands.update_index.Command.handle", return_value="")
+    def test_rebuild_index_swap(self, update_mock, clear_mock, connections):
+        swap_index = connections["eng"].get_backend.return_value.swap_index
+
+        call_command("rebuild_index", interactive=False, swap=True, using=["eng"])
+
+        self.assertFalse(clear_mock.called)
+        self.assertEqual(update_mock.call_count, 1)
+        self.assertNotIn("swap", update_mock.call_args[1])
+        swap_index.assert_called_once_with()
+        self.assertEqual(swap_index.return_value.__enter__.call_count, 1)
+        self.assertEqual(swap_index.return_value.__exit__.call_count, 1)
+
+    @patch("haystack.management.commands.clear_index.Command.handle", return_value="")
+    @patch("haystack.management.commands.update_index.Command.handle", return_value="")
+    def test_rebuild_index_swap_unsupported(self, update_mock, clear_mock):
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_index", interactive=False, swap=True, using=["default"]
+            )
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_index", interactive=False, swap=True, workers=2)
+
+        self.assertFalse(clear_mock.called)
+        self.assertFalse(update_mock.called)
@@ -11,8 +11,11 @@ from haystack.models import SearchResult
 from haystack.query import (
     EmptySearchQuerySet,
     SearchQuerySet,
+    SparseResultCache,
     ValuesListSearchQuerySet,
     ValuesSearchQuerySet,
+    grow_chunk_size,
+    multi_search,
 )
 from haystack.utils.loading import UnifiedIndex
 from test_haystack.core.models import (
@@ -411,6 +414,47 @@ class SimpleMockUUIDModelIndex(indexes.SearchIndex, indexes.Indexable):
         return UUIDMockModel
 
 
+class SparseResultCacheTestCase(TestCase):
+    def test_fill(self):
+        cache = SparseResultCache()
+        self.assertEqual(len(cache), 0)
+        self.assertFalse(cache.is_filled(0, 10))
+        self.assertEqual(cache.slice(0, 10), [])
+        self.assertRaises(IndexError, cache.get, 0)
+
+        cache.length = 100
+        cache.fill(50, list(range(50, 60)))
+        self.assertEqual(len(cache), 10)
+        self.assertTrue(cache.is_filled(50, 60))
+        self.assertTrue(cache.is_filled(52, 55))
+        self.assertFalse(cache.is_filled(45, 55))
+        self.assertEqual(cache.filled_to(0), 0)
+        self.assertEqual(cache.filled_to(55), 60)
+
+        # Ranges which touch are merged.
+        cache.fill(60, list(range(60, 70)))
+        cache.fill(40, list(range(40, 50)))
+        cache.fill(80, list(range(80, 90)))
+        self.assertEqual((cache.starts, cache.ends), ([40, 80], [70, 90]))
+        self.assertEqual(list(cache), list(range(40, 70)) + list(range(80, 90)))
+        self.assertEqual(cache.slice(68, 72), [68, 69, None, None])
+        self.assertEqual(cache.get(45), 45)
+        self.assertEqual(cache.get(75), None)
+        self.assertFalse(cache.is_full())
+
+        cache.truncate(65)
+        self.assertEqual(cache.length, 65)
+        self.assertEqual((cache.starts, cache.ends), ([40], [65]))
+        self.assertEqual(len(cache), 25)
+        self.assertEqual(cache.slice(60, None), [60, 61, 62, 63, 64])
+        self.assertTrue(cache.is_filled(60, 100))
+        self.assertRaises(IndexError, cache.get, 65)
+
+        cache.fill(0, list(range(40)))
+        self.assertTrue(cache.is_full())
+        self.assertEqual(list(cache), list(range(65)))
+
+
 @override_settings(DEBUG=True)
 class SearchQuerySetTestCase(TestCase):
     fixtures = ["base_data.json", "bulk_data.json"]
@@ -460,7 +504,7 @@ class SearchQuerySetTestCase(TestCase):
         msqs = self.msqs.all()
         results = [int(res.pk) for res in iter(msqs)]
         self.assertEqual(results, [res.pk for res in MOCK_SEARCH_RESULTS[:23]])
-        self.assertEqual(len(connections["default"].queries), 3)
+        self.assertEqual(len(connections["default"].queries), 2)
 
     def test_slice(self):
         reset_search_queries()
@@ -478,6 +522,13 @@ class SearchQuerySetTestCase(TestCase):
         self.assertEqual(int(results[22].pk), MOCK_SEARCH_RESULTS[22].pk)
         self.assertEqual(len(connections["default"].queries), 1)
 
+        # Only the page that was asked for is kept.
+        self.assertEqual(len(results._result_cache), 1)
+        self.assertEqual(results._result_cache.length, 23)
+        self.assertEqual(int(results[21:23][0].pk), MOCK_SEARCH_RESULTS[21].pk)
+        self.assertEqual(len(connections["default"].queries), 2)
+        self.assertEqual(len(results._result_cache), 2)
+
     def test_manual_iter(self):
         results = self.msqs.all()
 
@@ -514,7 +565,7 @@ class SearchQuerySetTestCase(TestCase):
             ],
         )
 
-        self.assertEqual(len(connections["default"].queries), 3)
+        self.assertEqual(len(connections["default"].queries), 2)
 
         reset_search_queries()
         self.assertEqual(len(connections["default"].queries), 0)
@@ -551,6 +602,39 @@ class SearchQuerySetTestCase(TestCase):
 
         connections["default"]._index = old_ui
 
+    def test_iterator(self):
+        reset_search_queries()
+        msqs = self.msqs.all()
+        results = [int(res.pk) for res in msqs.iterator()]
+        self.assertEqual(results, [res.pk for res in MOCK_SEARCH_RESULTS[:23]])
+        self.assertEqual(len(connections["default"].queries), 2)
+
+        # Nothing is kept, on the queryset or the clone iterated over.
+        self.assertEqual(len(msqs._result_cache), 0)
+        self.assertFalse(msqs.query.has_run())
+
+        reset_search_queries()
+        results = [int(res.pk) for res in msqs.iterator(chunk_size=5)]
+        self.assertEqual(results, [res.pk for res in MOCK_SEARCH_RESULTS[:23]])
+        self.assertEqual(len(connections["default"].queries), 5)
+
+    def test_stream(self):
+        reset_search_queries()
+        msqs = self.msqs.all()
+        results = [int(res.pk) for res in msqs.stream(batch_size=10)]
+        self.assertEqual(results, [res.pk for res in MOCK_SEARCH_RESULTS[:23]])
+        self.assertEqual(len(connections["default"].queries), 3)
+        self.assertEqual(len(msqs._result_cache), 0)
+
+        values = list(self.msqs.values_list("pk", flat=True).stream())
+        self.assertEqual(values[:2], ["1", "2"])
+
+    def test_grow_chunk_size(self):
+        self.assertEqual(grow_chunk_size(10), 20)
+        self.assertEqual(grow_chunk_size(800), 1000)
+        self.assertEqual(grow_chunk_size(1000), 1000)
+        self.assertEqual(grow_chunk_size(5000), 5000)
+
     def test_cache_is_full(self):
         reset_search_queries()
         self.assertEqual(len(connections["default"].queries), 0)
@@ -559,7 +643,7 @@ class SearchQuerySetTestCase(TestCase):
         fire_the_iterator_and_fill_cache = list(results)
         self.assertEqual(23, len(fire_the_iterator_and_fill_cache))
         self.assertEqual(results._cache_is_full(), True)
-        self.assertEqual(len(connections["default"].queries), 4)
+        self.assertEqual(len(connections["default"].queries), 3)
 
     def test_all(self):
         sqs = self.msqs.all()
@@ -788,9 +872,150 @@ class SearchQuerySetTestCase(TestCase):
     def test_count(self):
         self.assertEqual(self.msqs.count(), 23)
 
+        # Counting asks for the count alone, leaving the results unfetched.
+        reset_search_queries()
+        sqs = self.msqs.order_by("pub_date").facet("foo").highlight()
+        self.assertEqual(sqs.count(), 23)
+        self.assertEqual(len(connections["default"].queries), 1)
+        self.assertEqual(
+            connections["default"].queries[0]["additional_kwargs"],
+            {"end_offset": 1},
+        )
+        self.assertFalse(sqs.query.has_run())
+        self.assertEqual(len(sqs._result_cache), 0)
+
+        self.assertEqual(len(sqs), 23)
+        self.assertEqual(len(connections["default"].queries), 1)
+        self.assertEqual(len(sqs[:5]), 5)
+        self.assertEqual(len(connections["default"].queries), 2)
+
+        # Nothing's fetched when there's nothing to fetch.
+        sqs = self.msqs.filter(content="foo")
+        sqs.query._hit_count = 0
+        self.assertEqual(sqs.count(), 0)
+        self.assertEqual(list(sqs), [])
+        self.assertEqual(len(connections["default"].queries), 2)
+
     def test_facet_counts(self):
         self.assertEqual(self.msqs.facet_counts(), {})
 
+    def test_multi_search(self):
+        mock = MockModel()
+        mock.id = 1
+
+        sqs = self.msqs.all()
+        values_sqs = self.msqs.values("pk")
+        mlt_sqs = self.msqs.more_like_this(mock)
+
+        reset_search_queries()
+        multi_search([sqs, values_sqs, mlt_sqs, EmptySearchQuerySet()], end=5)
+        self.assertEqual(len(connections["default"].queries), 3)
+
+        self.assertEqual(len(sqs), 23)
+        self.assertEqual(
+            [int(res.pk) for res in sqs[:5]],
+            [res.pk for res in MOCK_SEARCH_RESULTS[:5]],
+        )
+        self.assertEqual(values_sqs[0], {"pk": "1"})
+        self.assertEqual(len(mlt_sqs), 23)
+        self.assertEqual(len(connections["default"].queries), 3)
+
+    def test_cache(self):
+        backend = connections["default"].get_backend()
+        backend.result_cache = "default"
+        self.addCleanup(setattr, backend, "result_cache", None)
+        backend.bump_generation()
+        backend.result_cache_hits = backend.result_cache_misses = 0
+
+        self.assertEqual(len(self.msqs.cache(60)), 23)
+        self.assertEqual(len(self.msqs.cache(60)), 23)
+        self.assertEqual(len(connections["default"].queries), 1)
+        self.assertEqual(
+            (backend.result_cache_hits, backend.result_cache_misses), (1, 1)
+        )
+
+        # Sets are keyed on their contents, not the order they iterate in.
+        sqs = self.msqs.cache(60).models(MockModel, AnotherMockModel)
+        self.assertEqual(sqs.count(), 23)
+        self.assertEqual(
+            backend.get_result_cache_key(
+                "*", {"models": {MockModel, AnotherMockModel}}
+            ),
+            backend.get_result_cache_key(
+                "*", {"models": {AnotherMockModel, MockModel}}
+            ),
+        )
+
+        # Querysets which don't ask for caching (or turn it off) aren't cached.
+        self.assertEqual(len(self.msqs.all()), 23)
+        self.assertEqual(len(self.msqs.cache(0)), 23)
+        self.assertEqual(len(connections["default"].queries), 4)
+
+        # Nor are they once the index has been written to.
+        backend.bump_generation()
+        self.assertEqual(len(self.msqs.cache(60)), 23)
+        self.assertEqual(len(connections["default"].queries), 5)
+        self.assertEqual(
+            (backend.result_cache_hits, backend.result_cache_misses), (1, 3)
+        )
+
+        # The connection can cache everything by default.
+        backend.result_cache_timeout = 60
+        self.addCleanup(setattr, backend, "result_cache_timeout", 0)
+        self.assertEqual(len(self.msqs.all()), 23)
+        self.assertEqual(len(connections["default"].queries), 5)
+
+    def test_multi_search_cache(self):
+        backend = connections["default"].get_backend()
+        backend.result_cache = "default"
+        self.addCleanup(setattr, backend, "result_cache", None)
+        backend.bump_generation()
+        backend.result_cache_hits = backend.result_cache_misses = 0
+        reset_search_queries()
+
+        multi_search([self.msqs.cache(60), self.msqs.filter(content="foo")], end=5)
+        self.assertEqual(len(connections["default"].queries), 2)
+        self.assertEqual(
+            (backend.result_cache_hits, backend.result_cache_misses), (0, 1)
+        )
+
+        # Only the search which wasn't cached is sent again.
+        cached_sqs = self.msqs.cache(60)
+        multi_search([cached_sqs, self.msqs.filter(content="foo")], end=5)
+        self.assertEqual(len(connections["default"].queries), 3)
+        self.assertEqual(
+            (backend.result_cache_hits, backend.result_cache_misses), (1, 1)
+        )
+        self.assertEqual(
+            [int(res.pk) for res in cached_sqs[:5]],
+            [res.pk for res in MOCK_SEARCH_RESULTS[:5]],
+        )
+        self.assertEqual(len(connections["default"].queries), 3)
+
+    async def test_async(self):
+        self.assertEqual(await self.msqs.all().acount(), 23)
+        self.assertEqual(await self.msqs.afacet_counts(), {})
+
+        results = [int(res.pk) async for res in self.msqs.all()]
+        self.assertEqual(results, [res.pk for res in MOCK_SEARCH_RESULTS[:23]])
+
+        results = await self.msqs.all().aget_results(1, 11)
+        self.assertEqual(
+            [int(res.pk) for res in results],
+            [res.pk for res in MOCK_SEARCH_RESULTS[1:11]],
+        )
+
+        backend = connections["default"].get_backend()
+        self.assertEqual((await backend.asearch("*"))["hits"], 23)
+
+    async def test_async_load_all(self):
+        results = [res async for res in self.msqs.all().load_all()]
+        self.assertEqual(len(results), 23)
+        self.assertTrue(all(isinstance(res._object, MockModel) for res in results))
+
+        values = [res async for res in self.msqs.values("pk")]
+        self.assertEqual(values[0], {"pk": "1"})
+
     def test_best_match(self):
         self.assertTrue(isinstance(self.msqs.best_match(), SearchResult))
 
@@ -894,7 +1119,7 @@ class SearchQuerySetTestCase(TestCase):
         clone = results._clone()
         self.assertTrue(isinstance(clone, SearchQuerySet))
         self.assertEqual(str(clone.query), str(results.query))
-        self.assertEqual(clone._result_cache, [])
+        self.assertEqual(len(clone._result_cache), 0)
         self.assertEqual(clone._result_count, None)
         self.assertEqual(clone._cache_full, False)
         self.assertEqual(clone._using, results._using)
@@ -1012,6 +1237,12 @@ class EmptySearchQuerySetTestCase(TestCase):
         self.assertEqual(self.esqs.count(), 0)
         self.assertEqual(len(self.esqs.all()), 0)
 
+    async def test_async(self):
+        self.assertEqual(await self.esqs.acount(), 0)
+        self.assertEqual([res async for res in self.esqs], [])
+        self.assertEqual(await self.esqs.aget_results(0, 10), [])
+        self.assertEqual(await self.esqs.afacet_counts(), {})
+
     def test_filter(self):
         sqs = self.esqs.filter(content="foo")
         self.assertTrue(isinstance(sqs, EmptySearchQuerySet))
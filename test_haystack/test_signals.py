@@ -0,0 +1,257 @@
+import os
+from tempfile import mkdtemp
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import models, transaction
+from django.test import TestCase, override_settings
+
+from haystack import connections, indexes
+from haystack.queues import SQLiteQueue
+from haystack.signals import (
+    BufferedSignalProcessor,
+    QueuedSignalProcessor,
+    RealtimeSignalProcessor,
+)
+from haystack.utils.loading import UnifiedIndex
+
+from .core.models import AnotherMockModel, MockModel, MockTag
+from .mocks import MockSearchBackend
+
+
+class BufferedMockSearchIndex(indexes.SearchIndex, indexes.Indexable):
+    text = indexes.CharField(document=True, model_attr="author")
+
+    def get_model(self):
+        return MockModel
+
+
+class DefaultRouter:
+    def for_write(self, **hints):
+        return ["default"]
+
+
+class SignalProcessorTestCase(TestCase):
+    processor_class = None
+
+    def setUp(self):
+        super().setUp()
+        self.old_ui = connections["default"].get_unified_index()
+        self.ui = UnifiedIndex()
+        self.bmsi = BufferedMockSearchIndex()
+        self.ui.build(indexes=[self.bmsi])
+        connections["default"]._index = self.ui
+
+        self.tag = MockTag.objects.create(name="primary")
+        self.obj_1 = MockModel.objects.create(author="daniel1", tag=self.tag)
+        self.obj_2 = MockModel.objects.create(author="daniel2", tag=self.tag)
+
+        update_patcher = patch.object(MockSearchBackend, "update")
+        remove_patcher = patch.object(MockSearchBackend, "remove_many")
+        self.update = update_patcher.start()
+        self.remove_many = remove_patcher.start()
+        self.addCleanup(update_patcher.stop)
+        self.addCleanup(remove_patcher.stop)
+
+        self.processor = self.processor_class(connections, DefaultRouter())
+        self.addCleanup(self.processor.teardown)
+
+    def tearDown(self):
+        connections["default"]._index = self.old_ui
+        super().tearDown()
+
+
+class AnotherMockSearchIndex(indexes.SearchIndex, indexes.Indexable):
+    text = indexes.CharField(document=True, model_attr="author")
+
+    def get_model(self):
+        return AnotherMockModel
+
+
+class RealtimeSignalProcessorTestCase(SignalProcessorTestCase):
+    processor_class = RealtimeSignalProcessor
+
+    def test_connects_indexed_models_only(self):
+        self.assertTrue(models.signals.post_save.has_listeners(MockModel))
+        self.assertTrue(models.signals.post_delete.has_listeners(MockModel))
+        self.assertFalse(models.signals.post_save.has_listeners(AnotherMockModel))
+        self.assertFalse(models.signals.post_delete.has_listeners(AnotherMockModel))
+
+        AnotherMockModel.objects.create(author="not indexed")
+        self.assertFalse(self.update.called)
+
+        self.obj_1.save()
+        self.assertEqual(self.update.call_count, 1)
+
+    def test_refreshes_on_rebuild(self):
+        self.ui.build(indexes=[self.bmsi, AnotherMockSearchIndex()])
+        self.assertTrue(models.signals.post_save.has_listeners(AnotherMockModel))
+
+        AnotherMockModel.objects.create(author="now indexed")
+        self.assertEqual(self.update.call_count, 1)
+
+    def test_teardown(self):
+        self.processor.teardown()
+        self.assertFalse(models.signals.post_save.has_listeners(MockModel))
+        self.assertFalse(models.signals.post_delete.has_listeners(MockModel))
+
+        self.ui.build(indexes=[self.bmsi, AnotherMockSearchIndex()])
+        self.assertFalse(models.signals.post_save.has_listeners(AnotherMockModel))
+
+
+class BufferedSignalProcessorTestCase(SignalProcessorTestCase):
+    processor_class = BufferedSignalProcessor
+
+    def test_flushes_on_commit(self):
+        obj_2_pk = self.obj_2.pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.obj_1.author = "daniel1 again"
+            self.obj_1.save()
+            self.obj_1.save()
+            self.obj_2.save()
+            self.obj_2.delete()
+            AnotherMockModel.objects.create(author="not indexed")
+
+            self.assertFalse(self.update.called)
+            self.assertFalse(self.remove_many.called)
+
+        self.assertEqual(self.update.call_count, 1)
+        index, objs = self.update.call_args[0]
+        self.assertIs(index, self.bmsi)
+        self.assertEqual([obj.author for obj in objs], ["daniel1 again"])
+        self.remove_many.assert_called_once_with(["core.mockmodel.%s" % obj_2_pk])
+
+    def test_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.obj_1.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(callbacks, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.obj_2.save()
+
+        self.assertEqual(self.update.call_count, 1)
+        self.assertEqual(list(self.update.call_args[0][1]), [self.obj_2])
+
+    @override_settings(HAYSTACK_SIGNAL_BUFFER_SIZE=2)
+    def test_buffer_size(self):
+        self.processor.teardown()
+        self.processor = BufferedSignalProcessor(connections, DefaultRouter())
+        self.addCleanup(self.processor.teardown)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.obj_1.save()
+            self.assertFalse(self.update.called)
+
+            self.obj_2.save()
+            self.assertEqual(self.update.call_count, 1)
+            self.assertEqual(len(self.update.call_args[0][1]), 2)
+
+        self.assertEqual(self.update.call_count, 1)
+
+
+class SQLiteQueueTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.queue = SQLiteQueue(PATH=os.path.join(mkdtemp(), "queue.sqlite3"))
+
+    def test_push_peek_delete(self):
+        self.assertEqual(self.queue.count(), 0)
+        self.assertEqual(self.queue.peek(10), [])
+
+        self.queue.push(
+            [
+                ("update", "core.mockmodel", "1", "core.mockmodel.1", "default"),
+                ("delete", "core.mockmodel", "2", "core.mockmodel.2", "default"),
+                ("update", "core.mockmodel", "3", "core.mockmodel.3", "default"),
+            ]
+        )
+        self.assertEqual(self.queue.count(), 3)
+
+        items = self.queue.peek(2)
+        self.assertEqual(
+            [change for item_id, change in items],
+            [
+                ("update", "core.mockmodel", "1", "core.mockmodel.1", "default"),
+                ("delete", "core.mockmodel", "2", "core.mockmodel.2", "default"),
+            ],
+        )
+        self.assertEqual(self.queue.count(), 3)
+
+        self.queue.delete(item_id for item_id, change in items)
+        self.assertEqual(self.queue.count(), 1)
+        self.assertEqual(self.queue.peek(10)[0][1][2], "3")
+
+
+class QueuedSignalProcessorTestCase(SignalProcessorTestCase):
+    processor_class = QueuedSignalProcessor
+
+    def setUp(self):
+        queue_path = os.path.join(mkdtemp(), "queue.sqlite3")
+        settings_override = override_settings(HAYSTACK_QUEUE={"PATH": queue_path})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        super().setUp()
+
+    def test_flushes_on_commit(self):
+        obj_2_pk = self.obj_2.pk
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.obj_1.author = "daniel1 again"
+            self.obj_1.save()
+            self.obj_1.save()
+            self.obj_2.save()
+            self.obj_2.delete()
+            AnotherMockModel.objects.create(author="not indexed")
+
+            self.assertEqual(self.processor.queue.count(), 0)
+
+        self.assertEqual(self.processor.queue.count(), 4)
+        self.assertFalse(self.update.called)
+        self.assertFalse(self.remove_many.called)
+
+        call_command("process_index_queue", verbosity=0, batchsize=3)
+
+        # The first batch has both saves of ``obj_1`` and a save of ``obj_2``,
+        # which is gone by then. The second batch has the delete of ``obj_2``.
+        self.assertEqual(self.processor.queue.count(), 0)
+        self.assertEqual(self.update.call_count, 1)
+        self.assertEqual(
+            [obj.author for obj in self.update.call_args[0][1]], ["daniel1 again"]
+        )
+        self.assertEqual(
+            self.remove_many.call_args_list,
+            [((["core.mockmodel.%s" % obj_2_pk],),)] * 2,
+        )
+
+    def test_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.obj_1.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(self.processor.queue.count(), 0)
+
+    def test_unknown_model(self):
+        self.processor.queue.push(
+            [
+                ("update", "core.gonemodel", "1", "core.gonemodel.1", "default"),
+                ("delete", "core.mockmodel", "2", "core.mockmodel.2", "default"),
+            ]
+        )
+
+        with self.assertLogs("haystack", level="WARNING") as logs:
+            call_command("process_index_queue", verbosity=0)
+
+        self.assertIn("core.gonemodel", logs.output[0])
+        self.assertEqual(self.processor.queue.count(), 0)
+        self.remove_many.assert_called_once_with(["core.mockmodel.2"])
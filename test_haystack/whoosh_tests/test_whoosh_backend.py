@@ -1,7 +1,10 @@
 import os
+import shutil
 import unittest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from tempfile import mkdtemp
+from unittest.mock import patch
 
 from django.conf import settings
 from django.test import TestCase
@@ -205,6 +208,107 @@ class WhooshSearchBackendTestCase(WhooshTestCase):
         self.sb.remove(self.sample_objs[0])
         self.assertEqual(self.sb.index.doc_count(), 22)
 
+    def test_parallel_update(self):
+        self.sb.parallel_update(self.wmmi, self.sample_objs, threads=2, chunk_size=2)
+        self.assertEqual(self.sb.index.doc_count(), 23)
+
+    def test_bulk_session(self):
+        self.sb.update(self.wmmi, self.sample_objs[:10])
+
+        with self.sb.bulk_session():
+            self.assertIsNone(self.sb.bulk_writer)
+            self.sb.update(self.wmmi, self.sample_objs[10:20])
+            writer = self.sb.bulk_writer
+            self.sb.update(self.wmmi, self.sample_objs[20:])
+            self.sb.remove(self.sample_objs[0])
+            self.sb.remove_many(["core.mockmodel.2"])
+
+            # The same writer is kept for the whole session & nothing is
+            # visible until it commits.
+            self.assertIs(self.sb.bulk_writer, writer)
+            self.assertEqual(len(self.whoosh_search("*")), 10)
+
+        self.assertIsNone(self.sb.bulk_writer)
+        self.assertEqual(self.sb.index.doc_count(), 21)
+        self.assertEqual(len(self.whoosh_search("*")), 21)
+
+        with self.sb.bulk_session():
+            self.sb.clear([MockModel])
+
+        self.assertEqual(self.sb.index.doc_count(), 0)
+
+    def test_bulk_session_clear_all(self):
+        self.sb.update(self.wmmi, self.sample_objs[:10])
+
+        with self.sb.bulk_session():
+            self.sb.update(self.wmmi, self.sample_objs[10:20])
+            writer = self.sb.bulk_writer
+            self.sb.clear()
+
+            # The writer is dropped along with the index & a new one is used
+            # for the rest of the session.
+            self.assertIsNone(self.sb.bulk_writer)
+            self.assertTrue(writer.is_closed)
+            self.sb.update(self.wmmi, self.sample_objs[20:])
+
+        self.assertEqual(self.sb.index.doc_count(), 3)
+        self.assertEqual(len(self.whoosh_search("*")), 3)
+
+    def test_bulk_session_remove_error(self):
+        self.sb.update(self.wmmi, self.sample_objs)
+
+        with self.sb.bulk_session():
+            writer = self.sb.get_bulk_writer()
+
+            with patch.object(writer, "delete_by_term", side_effect=IOError):
+                # Silently failing is the default here.
+                self.sb.remove(self.sample_objs[0])
+
+                self.sb.silently_fail = False
+                self.addCleanup(setattr, self.sb, "silently_fail", True)
+
+                with self.assertRaises(IOError):
+                    self.sb.remove(self.sample_objs[0])
+
+        self.assertEqual(self.sb.index.doc_count(), 23)
+
+    def test_bulk_session_procs(self):
+        sb = connections["whoosh"].backend(
+            "whoosh", PATH=self.sb.path, BULK_PROCS=2, BULK_MULTISEGMENT=True
+        )
+
+        with sb.bulk_session():
+            sb.update(self.wmmi, self.sample_objs)
+            self.assertEqual(sb.bulk_writer.procs, 2)
+
+        self.assertEqual(sb.index.doc_count(), 23)
+
+    def test_remove_many(self):
+        self.sb.update(self.wmmi, self.sample_objs)
+        self.assertEqual(self.sb.index.doc_count(), 23)
+
+        self.sb.remove_many(
+            [self.sample_objs[0], "core.mockmodel.2", "core.mockmodel.999"]
+        )
+        self.assertEqual(self.sb.index.doc_count(), 21)
+
+        self.sb.remove_many([])
+        self.assertEqual(self.sb.index.doc_count(), 21)
+
+    def test_scan_ids(self):
+        self.sb.update(self.wmmi, self.sample_objs)
+
+        batches = list(self.sb.scan_ids(MockModel, batch_size=10))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 3])
+        self.assertEqual(
+            sorted(ids for batch in batches for ids in batch),
+            sorted(
+                (str(obj.pk), "core.mockmodel.%s" % obj.pk) for obj in self.sample_objs
+            ),
+        )
+
+        self.assertEqual(list(self.sb.scan_ids(AnotherMockModel)), [])
+
     def test_clear(self):
         self.sb.update(self.wmmi, self.sample_objs)
         self.assertEqual(self.sb.index.doc_count(), 23)
@@ -228,6 +332,42 @@ class WhooshSearchBackendTestCase(WhooshTestCase):
         self.sb.clear([AnotherMockModel, MockModel])
         self.assertEqual(self.raw_whoosh.doc_count(), 0)
 
+    def test_searcher_reuse(self):
+        self.sb.update(self.wmmi, self.sample_objs[:10])
+        self.assertEqual(self.sb.search("*")["hits"], 10)
+        searcher = self.sb.searcher
+
+        self.assertEqual(
+            self.sb.search("*", narrow_queries={"name:daniel1"})["hits"], 5
+        )
+        self.assertIs(self.sb.searcher, searcher)
+        self.assertEqual(len(self.sb.narrow_cache), 2)
+
+        # Writing moves the index on to a new generation, so the searcher is
+        # refreshed & the narrows are matched again.
+        self.sb.update(self.wmmi, self.sample_objs[10:])
+        self.assertEqual(self.sb.search("*")["hits"], 23)
+        self.assertIsNot(self.sb.searcher, searcher)
+        self.assertEqual(len(self.sb.narrow_cache), 1)
+
+        self.assertEqual(
+            self.sb.search("*", narrow_queries={"name:daniel1"})["hits"], 7
+        )
+
+        # Setting up again closes the searcher (& its reader) for good.
+        searcher = self.sb.searcher
+        self.sb.setup()
+        self.assertTrue(searcher.is_closed)
+        self.assertIsNone(self.sb.searcher)
+        self.assertEqual(self.sb.narrow_cache, {})
+
+        # Spelling suggestions read through the same searcher.
+        self.sb.create_spelling_suggestion("indexd")
+        searcher = self.sb.searcher
+        self.assertIsNotNone(searcher)
+        self.sb.create_spelling_suggestion("indexd")
+        self.assertIs(self.sb.searcher, searcher)
+
     def test_search(self):
         self.sb.update(self.wmmi, self.sample_objs)
         self.assertEqual(len(self.whoosh_search("*")), 23)
@@ -788,6 +928,104 @@ class WhooshSearchBackendTestCase(WhooshTestCase):
 
         os.chmod(settings.HAYSTACK_CONNECTIONS["whoosh"]["PATH"], 0o755)
 
+    def test_read_only(self):
+        path = mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        read_only_sb = connections["whoosh"].backend(
+            "whoosh", PATH=path, READ_ONLY=True
+        )
+
+        # There's nothing to open yet & it won't create an index itself.
+        self.assertRaises(IOError, read_only_sb.setup)
+
+        connections["whoosh"].backend("whoosh", PATH=path).update(
+            self.wmmi, self.sample_objs
+        )
+        os.chmod(path, 0o500)
+        self.addCleanup(os.chmod, path, 0o755)
+
+        read_only_sb.setup()
+        self.assertTrue(read_only_sb.storage.readonly)
+        self.assertEqual(read_only_sb.search("*")["hits"], 23)
+
+        for write in (
+            lambda: read_only_sb.update(self.wmmi, self.sample_objs),
+            lambda: read_only_sb.remove("core.mockmodel.1"),
+            lambda: read_only_sb.remove_many(["core.mockmodel.1"]),
+            lambda: read_only_sb.clear(),
+            lambda: read_only_sb.optimize(),
+        ):
+            self.assertRaises(SearchBackendError, write)
+
+        self.assertEqual(read_only_sb.search("*")["hits"], 23)
+
+    def test_result_cache(self):
+        self.sb.result_cache = "default"
+        self.addCleanup(setattr, self.sb, "result_cache", None)
+        self.sb.update(self.wmmi, self.sample_objs)
+
+        self.assertEqual(self.sb.cached_search("*", 60)["hits"], 23)
+        self.assertEqual(self.sb.cached_search("*", 60)["hits"], 23)
+        self.assertEqual(self.sb.result_cache_hits, 1)
+
+        # Writes move on to a new generation, as does the end of a session.
+        self.sb.remove(self.sample_objs[0])
+        self.assertEqual(self.sb.cached_search("*", 60)["hits"], 22)
+
+        with self.sb.bulk_session():
+            self.sb.remove_many(self.sample_objs[1:3])
+
+        self.assertEqual(self.sb.cached_search("*", 60)["hits"], 20)
+        self.assertEqual(self.sb.result_cache_hits, 1)
+
+    def test_stream(self):
+        self.sb.update(self.wmmi, self.sample_objs)
+
+        batches = list(self.sb.stream("*", batch_size=10, sort_by=["-pub_date"]))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 3])
+        self.assertEqual(
+            [result.pk for batch in batches for result in batch],
+            [
+                result.pk
+                for result in self.sb.search("*", sort_by=["-pub_date"])["results"]
+            ],
+        )
+
+        batches = list(self.sb.stream("Indexed!", narrow_queries={"name:daniel1"}))
+        self.assertEqual(
+            sorted(result.pk for batch in batches for result in batch),
+            sorted(
+                result.pk
+                for result in self.sb.search(
+                    "Indexed!", narrow_queries={"name:daniel1"}
+                )["results"]
+            ),
+        )
+        self.assertEqual(list(self.sb.stream("")), [])
+
+    def test_count(self):
+        self.assertEqual(self.sb.count("*"), 0)
+        self.sb.update(self.wmmi, self.sample_objs)
+
+        self.assertEqual(self.sb.count(""), 0)
+        self.assertEqual(self.sb.count("*"), 23)
+        self.assertEqual(self.sb.count("*", limit_to_registered_models=False), 23)
+        self.assertEqual(
+            self.sb.count("Indexed!", narrow_queries={"name:daniel1"}),
+            self.sb.search("Indexed!", narrow_queries={"name:daniel1"})["hits"],
+        )
+        # Facets, highlighting & offsets don't change the count.
+        self.assertEqual(
+            self.sb.count(
+                "Indexed!",
+                facets={"name": {}},
+                highlight=True,
+                start_offset=5,
+                end_offset=10,
+            ),
+            23,
+        )
+
     def test_slicing(self):
         self.sb.update(self.wmmi, self.sample_objs)
 
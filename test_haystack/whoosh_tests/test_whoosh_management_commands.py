@@ -13,6 +13,8 @@ from django.test import TestCase
 from whoosh.qparser import QueryParser
 
 from haystack import connections, constants, indexes
+from haystack.backends.whoosh_backend import WhooshSearchBackend
+from haystack.management.commands.update_index import UpdateJournal, get_pk_ranges
 from haystack.utils.loading import UnifiedIndex
 
 from ..core.models import MockModel
@@ -109,3 +111,117 @@ class ManagementCommandTestCase(WhooshTestCase):
 
         call_command("update_index", verbosity=2, workers=2, batchsize=5)
         self.verify_indexed_documents()
+
+    def test_pipeline(self):
+        call_command("clear_index", interactive=False, verbosity=0)
+        self.verify_indexed_document_count(0)
+
+        call_command("update_index", verbosity=2, pipeline=True, batchsize=5)
+        self.verify_indexed_documents()
+
+        with self.assertRaises(CommandError):
+            call_command("update_index", verbosity=0, pipeline=True, workers=2)
+
+    def test_prepare_workers(self):
+        call_command("clear_index", interactive=False, verbosity=0)
+        self.verify_indexed_document_count(0)
+
+        call_command("update_index", verbosity=0, prepare_workers=2, batchsize=5)
+        self.verify_indexed_documents()
+
+        with self.assertRaises(CommandError):
+            call_command("update_index", verbosity=0, prepare_workers=2, workers=2)
+
+    def test_resume(self):
+        call_command("clear_index", interactive=False, verbosity=0)
+        journal_path = os.path.join(mkdtemp(), "update_index.journal")
+        real_update = WhooshSearchBackend.update
+        calls = []
+        committed = []
+        failing = True
+
+        def flaky_update(backend, index, iterable, commit=True):
+            calls.append(len(iterable))
+            if len(calls) == 3 and failing:
+                # Everything the journal has recorded must already be on disk,
+                # in case the process is killed here instead.
+                committed.append(backend.index.refresh().doc_count())
+                raise IOError("Simulated backend failure")
+            return real_update(backend, index, iterable, commit=commit)
+
+        with patch.object(WhooshSearchBackend, "update", flaky_update):
+            with self.assertRaises(IOError):
+                call_command(
+                    "update_index",
+                    verbosity=0,
+                    batchsize=5,
+                    max_retries=1,
+                    resume=True,
+                    journal=journal_path,
+                )
+
+        self.assertEqual(committed, [10])
+        self.verify_indexed_document_count(10)
+        journal = UpdateJournal(journal_path)
+        self.assertEqual(len(journal.completed(MockModel, "whoosh")), 2)
+
+        calls.clear()
+        failing = False
+        with patch.object(WhooshSearchBackend, "update", flaky_update):
+            call_command(
+                "update_index",
+                verbosity=0,
+                batchsize=5,
+                resume=True,
+                journal=journal_path,
+            )
+
+        # Only the three batches which weren't recorded are indexed again:
+        self.assertEqual(calls, [5, 5, 3])
+        self.verify_indexed_documents()
+        self.assertFalse(os.path.exists(journal_path))
+
+    def test_resume_other_window(self):
+        call_command("clear_index", interactive=False, verbosity=0)
+        journal_path = os.path.join(mkdtemp(), "update_index.journal")
+        pks = list(MockModel.objects.order_by("pk").values_list("pk", flat=True))
+        UpdateJournal(journal_path).record(MockModel, "whoosh", pks[0], pks[9])
+
+        # The range was recorded without a date window, so it isn't skipped
+        # when resuming with one.
+        call_command(
+            "update_index",
+            verbosity=0,
+            batchsize=5,
+            resume=True,
+            journal=journal_path,
+            start_date="2000-01-01",
+        )
+
+        self.verify_indexed_documents()
+        self.assertEqual(
+            UpdateJournal(journal_path).completed(MockModel, "whoosh"),
+            [(pks[0], pks[9])],
+        )
+        self.assertEqual(
+            UpdateJournal(journal_path, window="start=2000-01-01").completed(
+                MockModel, "whoosh"
+            ),
+            [],
+        )
+
+    def test_pk_ranges(self):
+        pks = list(MockModel.objects.order_by("pk").values_list("pk", flat=True))
+        pk_ranges = get_pk_ranges(MockModel.objects.all(), 5)
+
+        self.assertEqual(len(pk_ranges), 5)
+        self.assertEqual(pk_ranges[0], (0, 5, pks[0], pks[4]))
+        self.assertEqual(pk_ranges[-1], (20, 23, pks[20], pks[22]))
+
+        covered = []
+        for start, end, pk_low, pk_high in pk_ranges:
+            batch = MockModel.objects.filter(pk__gte=pk_low, pk__lte=pk_high)
+            self.assertEqual(batch.count(), end - start)
+            covered.extend(batch.order_by("pk").values_list("pk", flat=True))
+
+        self.assertEqual(covered, pks)